@@ -14,8 +14,15 @@ class Controller(AbstractController):
     """
     Controller for Pendu game.
     """
-    def __init__(self, orchestrator, context, view):
-        super().__init__(orchestrator, Model(), view)
+    __slots__ = ()
+
+    def __init__(self, orchestrator, context, view, model=None, **settings):
+        """
+        @param  model       Optional. Model of a restored game.
+        @param  settings    Optional. Word settings forwarded to a new Model.
+        @raise  ValueError  if no word matches the settings.
+        """
+        super().__init__(orchestrator, model if model is not None else Model(**settings), view)
         assert not self.model.is_over()
 
     # Lifecycle
@@ -37,7 +44,7 @@ class Controller(AbstractController):
             except TimeoutError:
                 logger.warning("Player did not answer before timeout.") # should never appear in case of no timeout.
             except asyncio.exceptions.CancelledError:
-                logger.error("Ctrl+C catched.")
+                logger.warning("Game loop cancelled.")
                 raise
             except:
                 logger.exception("Call to player failed.")
@@ -54,6 +61,8 @@ class Callback(AbstractCallback):
     """
     Callback object for Pendu game.
     """
+    __slots__ = ("word_list", "lifes", "errors", "previous_try", "letter")
+
     def __init__(self, word_list, lifes, errors, previous_try):
         super().__init__()
         # inputs
@@ -74,3 +83,4 @@ class Callback(AbstractCallback):
         The view must call this method to play a move.
         """
         self.letter = letter
+        self.notify()
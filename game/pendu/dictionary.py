@@ -0,0 +1,96 @@
+"""
+This module define the word dictionary used by Pendu game.
+The word list file is memory-mapped and indexed once by line offsets, so that
+picking a word neither reads nor allocates the whole file.
+"""
+from utils import tools
+import logging
+logger = logging.getLogger(__name__)
+
+import mmap
+from array import array
+from random import randrange
+from utils.tools import Constant
+
+
+class Dictionary:
+    """
+    Read-only list of words, one word per line in a text file.
+    Empty lines are ignored.
+
+    The index is built once per file. Use `Dictionary.get(path)` to share the
+    same instance between all games.
+    """
+    instances = dict()  # map file path to its Dictionary
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as file:
+            try:
+                self.data = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                # an empty file cannot be mapped
+                self.data = b""
+        # start and end offsets of each word in the file
+        self.starts = array('Q')
+        self.ends = array('Q')
+        self.build_index()
+        logger.debug("Dictionary '%s' indexed: %s words.", path, len(self))
+
+    @staticmethod
+    def get(path=Constant.PENDU_DATABASE_FILE):
+        """
+        Return the shared Dictionary of the provided file.
+        The file is indexed on first call only.
+        """
+        if path not in Dictionary.instances:
+            Dictionary.instances[path] = Dictionary(path)
+        return Dictionary.instances[path]
+
+    def build_index(self):
+        """
+        Scan the file once to store the offsets of every non empty line.
+        """
+        data = self.data
+        size = len(data)
+        start = 0
+        while start < size:
+            end = data.find(b"\n", start)
+            if end < 0:
+                end = size
+            next_start = end + 1
+            while end > start and data[end - 1] in b"\r \t":
+                end -= 1
+            if end > start:
+                self.starts.append(start)
+                self.ends.append(end)
+            start = next_start
+
+    def close(self):
+        """
+        Unmap the file. The dictionary must not be used anymore.
+        """
+        if isinstance(self.data, mmap.mmap):
+            self.data.close()
+
+    # Getters
+
+    def __len__(self):
+        return len(self.starts)
+
+    def __getitem__(self, index):
+        """
+        Return the word at the provided index, in lowercase.
+        """
+        return self.data[self.starts[index]:self.ends[index]].decode().lower()
+
+    def random_index(self):
+        return randrange(len(self.starts))
+
+    def random_word(self):
+        """
+        Return a random word of the dictionary, in lowercase.
+
+        @raise  ValueError  if the dictionary is empty.
+        """
+        return self[self.random_index()]
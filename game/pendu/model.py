@@ -7,49 +7,92 @@ from utils import tools
 import logging
 logger = logging.getLogger(__name__)
 
-from random import randint
+import struct
+from string import ascii_lowercase
+from game.pendu.wordbank import WordBank
 from utils.tools import Constant
 
 
+# bit of each letter in letter masks
+LETTER_BITS = {letter: 1 << index for index, letter in enumerate(ascii_lowercase)}
+# word length, lifes, tried letters mask, errors size; followed by word, letters and errors
+DUMP_HEADER = struct.Struct("<BbIB")
+
+
 class Model:
     """
     Represent the data model of Pendu game.
+    The state is kept compact to host many concurrent games: letters seen by
+    the user are stored in a bytearray and letters are tracked with bit masks.
+    The secret word must be made of lowercase ascii letters.
     """
-    def __init__(self):
-        self.secret_word = self.pick_random_word()
+    __slots__ = ("secret_word", "letters", "letter_mask", "tried_mask", "hidden", "lifes", "errors")
+
+    def __init__(self, difficulty=None, min_len=Constant.PENDU_MIN_WORD_LENGTH, max_len=None):
+        self.secret_word = self.pick_random_word(difficulty, min_len, max_len)
         self.restart()
 
     def restart(self):
         """
         Initialise the game instance from the internal secret_word data member.
         """
-        # list of letters, seen from the user; '_' for hiden letter
-        self.letters = ['_' for _ in range(len(self.secret_word))]
-        self.letters[0] = self.secret_word[0]
+        # letters seen from the user; '_' for hiden letter
+        self.letters = bytearray(b'_' * len(self.secret_word))
+        self.letters[0] = ord(self.secret_word[0])
+        # mask of letters at hiden positions in secret_word
+        self.letter_mask = 0
+        for secret_letter in self.secret_word[1:]:
+            self.letter_mask |= LETTER_BITS[secret_letter]
+        # mask of tried letters
+        self.tried_mask = 0
+        # count of hiden letters. Win when reach zero
+        self.hidden = len(self.secret_word) - 1
         # remaining tries. Lose when reach zero
         self.lifes = Constant.PENDU_NB_MAX_ERRORS
-        # list of unsuccessful tries
-        self.errors = []
+        # unsuccessful tries, in order
+        self.errors = ""
 
-    def pick_random_word(self):
+    def dump(self):
         """
-        Return a random word from french dictionary.
-        The word must be at least 3 letters long. Random selection is repeated
-        if the word is too short, but the last tentative will be returned even
-        if it is still too short.
+        Return the state of the game as compact bytes, to be restored with `Model.load`.
+        """
+        errors = self.errors.encode()
+        return DUMP_HEADER.pack(len(self.secret_word), self.lifes, self.tried_mask, len(errors)) \
+                + self.secret_word.encode() + self.letters + errors
+
+    @staticmethod
+    def load(data):
+        """
+        Return a Model restored from bytes provided by `dump`.
+        """
+        word_size, lifes, tried_mask, errors_size = DUMP_HEADER.unpack_from(data)
+        offset = DUMP_HEADER.size
+        model = Model.__new__(Model)
+        model.secret_word = bytes(data[offset:offset + word_size]).decode()
+        model.restart()
+        offset += word_size
+        model.letters[:] = data[offset:offset + word_size]
+        offset += word_size
+        model.errors = bytes(data[offset:offset + errors_size]).decode()
+        model.lifes = lifes
+        model.tried_mask = tried_mask
+        model.hidden = model.letters.count(b'_')
+        return model
+
+    def pick_random_word(self, difficulty=None, min_len=Constant.PENDU_MIN_WORD_LENGTH, max_len=None):
+        """
+        Return a random word from french dictionary, matching the settings.
+
+        @param  difficulty  Optional. Difficulty of the word. Any if None.
+        @param  min_len     Minimal length of the word.
+        @param  max_len     Optional. Maximal length of the word.
+        @raise  ValueError  if no word matches the settings.
 
         @return     French word in lowercase
         """
-        with open(Constant.PENDU_DATABASE_FILE) as file:
-            lines = file.readlines()
-            retry = 10
-            word = ""
-            while len(word) < 3 and retry >= 0:
-                index = randint(0, len(lines) - 1)
-                word = lines[index].strip()
-                retry -= 1
-                logger.log(Constant.VERBOSE, "The secret word is '%s'", word)
-            return word.lower()
+        word = WordBank.get(Constant.PENDU_DATABASE_FILE).pick(min_len, max_len, difficulty)
+        logger.log(Constant.VERBOSE, "The secret word is '%s'", word)
+        return word
 
     # Getters
 
@@ -63,23 +106,23 @@ class Model:
         """
         True if the game is done.
         """
-        return self.lost() or '_' not in self.letters
+        return self.lost() or self.hidden == 0
 
     def get_word_list(self):
-        return self.letters.copy()
+        return list(self.letters.decode())
 
     def get_lifes(self):
         return self.lifes
 
     def get_errors(self):
-        return self.errors.copy()
+        return list(self.errors)
 
     def __str__(self):
         """
         Word seen by the user.
         For example : "test" -> "t _ _ _"
         """
-        return ' '.join(self.letters)
+        return ' '.join(self.letters.decode())
 
     # play
 
@@ -92,13 +135,18 @@ class Model:
 
         @return     True if a new letter was discovered. False otherwise.
         """
-        win = False
         test_letter = test_letter.lower()
-        for secret_index, secret_letter in enumerate(self.secret_word):
-            if secret_letter == test_letter and self.letters[secret_index] == '_':
-                win = True
-                self.letters[secret_index] = secret_letter
-        if not win:
+        bit = LETTER_BITS.get(test_letter, 0)
+        found = bit & self.letter_mask & ~self.tried_mask
+        self.tried_mask |= bit
+        if not found:
             self.lifes -= 1
-            self.errors.append(test_letter)
-        return win
+            self.errors += test_letter
+            return False
+        letter_code = ord(test_letter)
+        secret_index = self.secret_word.find(test_letter, 1)
+        while secret_index >= 0:
+            self.letters[secret_index] = letter_code
+            self.hidden -= 1
+            secret_index = self.secret_word.find(test_letter, secret_index + 1)
+        return True
@@ -0,0 +1,42 @@
+"""
+Entry point of the pendu game, loaded on first use by the game registry.
+"""
+from utils import tools
+import logging
+logger = logging.getLogger(__name__)
+
+from game.pendu.controller import Controller
+from game.pendu.dictionary import Dictionary
+from game.pendu.model import Model
+from game.pendu.view import View
+from game.pendu.wordbank import WordBank, Difficulty
+from utils.language import MessageNLS
+from utils.language_resources.MessageLiterals import MessageLiterals
+from utils.tools import Constant
+
+
+def setup():
+    WordBank.get(Constant.PENDU_DATABASE_FILE) # index words before the first game
+
+def teardown():
+    WordBank.instances.clear()
+    for dictionary in Dictionary.instances.values():
+        dictionary.close()
+    Dictionary.instances.clear()
+
+async def create(orchestrator, ctx, view, difficulty=None, min_len=None, max_len=None, *ignored):
+    """
+    Arguments: optional difficulty (facile/easy, moyen/medium, difficile/hard),
+    minimal and maximal lengths of the word.
+    """
+    try:
+        settings = {"min_len": max(int(min_len) if min_len is not None else Constant.PENDU_MIN_WORD_LENGTH, Constant.PENDU_MIN_WORD_LENGTH),
+                "max_len": int(max_len) if max_len is not None else None}
+        if difficulty is not None:
+            settings["difficulty"] = Difficulty.parse(difficulty)
+            if settings["difficulty"] is None:
+                raise ValueError(f"Unknown difficulty '{difficulty}'.")
+        return Controller(orchestrator, ctx, view, **settings)
+    except ValueError:
+        await ctx.send(MessageNLS.get_message(MessageLiterals.PENDU_INVALID_SETTINGS))
+        return None
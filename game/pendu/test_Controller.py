@@ -2,9 +2,11 @@ from utils import tools
 import logging
 logger = logging.getLogger(__name__)
 
-import asyncio
+import asyncio, gc, tracemalloc
 from game.pendu.controller import Controller, Callback
+from game.pendu.model import Model
 from game.pendu.view import View
+from mvc.ui import ConsoleUI
 from test.archi import TestCase, DiscordOrchestratorForTest
 from test.interaction import ConsoleUIForTest, UIForTest
 from time import time
@@ -43,14 +45,14 @@ class TestAbstractController(TestCase):
         with self.assertRaises(TimeoutError):
             asyncio.run(cb.wait(timeout=2))
         t = time() - t
-        self.assertIncertitude(t, 2.05)
+        self.assertIncertitude(t, 2)
 
         cb.call()
         cb.end_call = True
         t = time()
         asyncio.run(cb.wait(timeout=2))
         t = time() - t
-        self.assertIncertitude(t, 0.05)
+        self.assertIncertitude(t, 0)
 
     def test_controller_user_timeout(self):
         view, cb = self.get_user_view(2), self.get_callback()
@@ -58,14 +60,14 @@ class TestAbstractController(TestCase):
         with self.assertRaises(TimeoutError):
             asyncio.run(Controller.call(view, cb, timeout=1))
         t = time() - t
-        self.assertIncertitude(t, 1.05)
+        self.assertIncertitude(t, 1)
 
     def test_controller_user_answer(self):
         view, cb = self.get_user_view(.5), self.get_callback()
         t = time()
         asyncio.run(Controller.call(view, cb, timeout=2))
         t = time() - t
-        self.assertIncertitude(t, 1.05) # timeout works by units of 1 sec
+        self.assertIncertitude(t, .5) # controller wakes up as soon as the view answers
 
         t = time()
         cb.letter = None # not answered
@@ -79,7 +81,7 @@ class TestAbstractController(TestCase):
         cb.letter = None # not answered
         asyncio.run(Controller.call(view, cb, timeout=2))
         t = time() - t
-        self.assertIncertitude(t, 5.25, .03) # timeout works by units of 1 sec
+        self.assertIncertitude(t, 2.5, .05)
 
     def test_controller_user_answer_but_no_return(self):
         view, cb = self.get_user_view(.5, no_return=True), self.get_callback()
@@ -87,7 +89,7 @@ class TestAbstractController(TestCase):
         with self.assertRaises(TimeoutError):
             asyncio.run(Controller.call(view, cb, timeout=2))
         t = time() - t
-        self.assertIncertitude(t, 2.05) # timeout works by units of 1 sec
+        self.assertIncertitude(t, 2)
 
 class TestController(TestCase):
     """
@@ -119,3 +121,29 @@ class TestController(TestCase):
         asyncio.run(game.loop())
         self.assertTrue(game.model.is_over())
         self.assertTrue(game.model.lost())
+
+class TestMemory(TestCase):
+    """
+    Memory benchmark of active games.
+    """
+    def test_bytes_per_game(self):
+        """
+        Measure the memory held by games waiting for a player answer.
+        """
+        nb_games = 10000
+        Model() # load word bank before measure
+        gc.collect()
+        tracemalloc.start()
+        try:
+            start = tracemalloc.get_traced_memory()[0]
+            games = []
+            for _ in range(nb_games):
+                view = View(ConsoleUI())
+                game = Controller(None, None, view)
+                view.callback = Callback(game.model.get_word_list(), game.model.get_lifes(), game.model.get_errors(), None)
+                games.append(game)
+            size = (tracemalloc.get_traced_memory()[0] - start) / nb_games
+        finally:
+            tracemalloc.stop()
+        logger.info("%.0f bytes per active game.", size)
+        self.assertLess(size, 1024)
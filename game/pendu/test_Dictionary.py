@@ -0,0 +1,43 @@
+from utils import tools
+import logging
+logger = logging.getLogger(__name__)
+
+import os, tempfile
+from game.pendu.dictionary import Dictionary
+from test.archi import TestCase
+from utils.tools import Constant
+
+
+class TestDictionary(TestCase):
+    def get_dictionary(self, content):
+        file = tempfile.NamedTemporaryFile("wb", suffix=".txt", delete=False)
+        file.write(content)
+        file.close()
+        self.addCleanup(os.remove, file.name)
+        return Dictionary(file.name)
+
+    def test_index(self):
+        """
+        Empty lines and line endings are ignored.
+        """
+        dictionary = self.get_dictionary(b"\nabc\r\nDefg\n\nhi")
+        self.assertEqual(3, len(dictionary))
+        self.assertEqual(["abc", "defg", "hi"], [dictionary[i] for i in range(len(dictionary))])
+        self.assertIn(dictionary.random_word(), ["abc", "defg", "hi"])
+
+    def test_empty(self):
+        dictionary = self.get_dictionary(b"")
+        self.assertEqual(0, len(dictionary))
+        with self.assertRaises(ValueError):
+            dictionary.random_word()
+
+    def test_database(self):
+        """
+        The game database is shared and every word is readable.
+        """
+        dictionary = Dictionary.get(Constant.PENDU_DATABASE_FILE)
+        self.assertIs(dictionary, Dictionary.get(Constant.PENDU_DATABASE_FILE))
+        self.assertGreater(len(dictionary), 0)
+        for _ in range(100):
+            word = dictionary.random_word()
+            self.assertTrue(word.isalpha(), word)
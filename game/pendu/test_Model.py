@@ -18,6 +18,46 @@ class TestModel(TestCase):
         logger.info(model)
         self.assertEqual("t _ _ _", str(model))
 
+    def test_play_letter(self):
+        """
+        Discover letters until the win, including the first letter elsewhere in the word.
+        """
+        model = Model()
+        model.secret_word = "test"
+        model.restart()
+        self.assertFalse(model.play_letter('a'))
+        self.assertEqual(['a'], model.get_errors())
+        self.assertTrue(model.play_letter('T'))
+        self.assertEqual("t _ _ t", str(model))
+        self.assertFalse(model.play_letter('t')) # already discovered
+        self.assertTrue(model.play_letter('e'))
+        self.assertFalse(model.is_over())
+        self.assertTrue(model.play_letter('s'))
+        self.assertTrue(model.is_over())
+        self.assertFalse(model.lost())
+        self.assertEqual(Constant.PENDU_NB_MAX_ERRORS - 2, model.get_lifes())
+
+    def test_dump(self):
+        """
+        A game restored from its dump continues the same way.
+        """
+        model = Model()
+        model.secret_word = "tester"
+        model.restart()
+        model.play_letter('e')
+        model.play_letter('x')
+        restored = Model.load(model.dump())
+        self.assertEqual(str(model), str(restored))
+        self.assertEqual(model.get_errors(), restored.get_errors())
+        self.assertEqual(model.get_lifes(), restored.get_lifes())
+        self.assertFalse(restored.play_letter('e'))
+        self.assertTrue(restored.play_letter('s'))
+        self.assertTrue(restored.play_letter('r'))
+        self.assertFalse(restored.is_over())
+        self.assertTrue(restored.play_letter('t'))
+        self.assertTrue(restored.is_over())
+        self.assertFalse(restored.lost())
+
     @TestCase.interactive()
     def test_play_interactive(self):
         """
@@ -5,6 +5,7 @@ logger = logging.getLogger(__name__)
 import time
 from game.pendu.view import PenduDrawing
 from test.archi import TestCase
+from utils.language import MessageNLS
 from utils.tools import Constant
 
 
@@ -29,3 +30,20 @@ class TestView(TestCase):
         for lifes in range(Constant.PENDU_NB_MAX_ERRORS, -1, -1):
             time.sleep(.5)
             logger.info("Lifes %s/%s: %s", lifes, Constant.PENDU_NB_MAX_ERRORS, str(PenduDrawing(['t', '_', '_', '_'], lifes, ['y', 'a'])))
+
+    def test_template_cache(self):
+        """
+        Drawings with the same errors count and word size share their template.
+        """
+        PenduDrawing.template.cache_clear()
+        a = str(PenduDrawing(['t', '_', '_', '_'], 5, ['a']))
+        b = str(PenduDrawing(['t', 'e', '_', 't'], 5, ['b']))
+        self.assertEqual(a.replace("t _ _ _", "t e _ t").replace("'a'", "'b'"), b)
+        self.assertEqual(1, PenduDrawing.template.cache_info().hits)
+        self.assertEqual(.5, PenduDrawing.hit_rate())
+
+        MessageNLS.set_language("fr")
+        c = str(PenduDrawing(['t', '_', '_', '_'], 5, ['a']))
+        MessageNLS.set_language("en")
+        self.assertNotEqual(a, c)
+        self.assertEqual(2, PenduDrawing.template.cache_info().misses)
@@ -0,0 +1,77 @@
+from utils import tools
+import logging
+logger = logging.getLogger(__name__)
+
+import os, tempfile
+from collections import Counter
+from game.pendu.dictionary import Dictionary
+from game.pendu.wordbank import WordBank, Difficulty
+from test.archi import TestCase
+from utils.tools import Constant
+
+
+class TestWordBank(TestCase):
+    def get_bank(self, words):
+        file = tempfile.NamedTemporaryFile("w", suffix=".txt", delete=False)
+        file.write("\n".join(words))
+        file.close()
+        self.addCleanup(os.remove, file.name)
+        return WordBank(Dictionary(file.name))
+
+    def test_lengths(self):
+        bank = self.get_bank(["a", "bb", "cc", "ddd", "eeee", "fffff"])
+        self.assertEqual(6, bank.count())
+        self.assertEqual(2, bank.count(2, 2))
+        self.assertEqual(3, bank.count(3))
+        self.assertEqual(0, bank.count(6))
+        self.assertEqual(0, bank.count(3, 2))
+        for _ in range(20):
+            self.assertIn(bank.pick(2, 3), ["bb", "cc", "ddd"])
+        self.assertEqual("fffff", bank.pick(5, 100))
+        with self.assertRaises(ValueError):
+            bank.pick(6)
+
+    def test_difficulties(self):
+        """
+        Words are split in terciles of difficulty, equal scores in the easier one.
+        """
+        words = ["abc", "abcabc", "aaa", "xyz", "zzzz", "bac", "cab", "ab", "ba"]
+        bank = self.get_bank(words)
+        self.assertEqual({Difficulty.EASY: 4, Difficulty.MEDIUM: 2, Difficulty.HARD: 3},
+                Counter(bank.get_difficulty(word) for word in words))
+        for _ in range(20):
+            self.assertIn(bank.pick(difficulty=Difficulty.EASY), ["abc", "abcabc", "bac", "cab", "ab", "ba"])
+            self.assertIn(bank.pick(difficulty=Difficulty.HARD), ["aaa", "xyz", "zzzz"])
+        with self.assertRaises(ValueError):
+            bank.pick(6, difficulty=Difficulty.HARD) # only "abcabc"
+
+    def test_deterministic(self):
+        """
+        A word always gets the same difficulty.
+        """
+        words = ["abc", "abcabc", "aaa", "xyz", "zzzz", "bac", "cab", "ab", "ba"]
+        bank = self.get_bank(words)
+        other = WordBank(Dictionary(bank.dictionary.path))
+        self.assertEqual(bank.buckets, other.buckets)
+        self.assertEqual(3, bank.count(difficulty=Difficulty.HARD))
+        self.assertEqual(2, bank.count(3, 3, Difficulty.HARD))
+
+    def test_parse(self):
+        self.assertIs(Difficulty.HARD, Difficulty.parse("Difficile"))
+        self.assertIs(Difficulty.EASY, Difficulty.parse("easy"))
+        self.assertIsNone(Difficulty.parse("5"))
+
+    def test_database(self):
+        """
+        Picked words always respect the settings, even for few matching words.
+        """
+        bank = WordBank.get(Constant.PENDU_DATABASE_FILE)
+        for difficulty in [None, *Difficulty]:
+            for _ in range(100):
+                self.assertGreaterEqual(len(bank.pick(Constant.PENDU_MIN_WORD_LENGTH, difficulty=difficulty)), Constant.PENDU_MIN_WORD_LENGTH)
+        for min_len, max_len, difficulty in [(3, 3, Difficulty.MEDIUM), (4, 4, Difficulty.EASY)]:
+            self.assertGreater(bank.count(min_len, max_len, difficulty), 0)
+            for _ in range(300):
+                word = bank.pick(min_len, max_len, difficulty)
+                self.assertEqual(min_len, len(word))
+                self.assertIs(difficulty, bank.get_difficulty(word))
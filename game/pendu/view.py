@@ -2,6 +2,7 @@ from utils import tools
 import logging
 logger = logging.getLogger(__name__)
 
+import functools
 from utils.tools import Constant
 from mvc.view import UserInteractView
 from utils.language import MessageNLS
@@ -12,6 +13,8 @@ class View(UserInteractView):
     """
     View of pendu game.
     """
+    __slots__ = ()
+
     def __init__(self, ui):
         super().__init__(ui)
 
@@ -39,14 +42,16 @@ class View(UserInteractView):
         """
         Send updated main message.
         """
-        await self.ui.send(self.str(callback.word_list, callback.lifes, callback.errors, callback.previous_try))
+        await self.ui.send_board(self.str(callback.word_list, callback.lifes, callback.errors, callback.previous_try))
 
     async def send_game_over(self, word):
         await self.ui.send(MessageNLS.get_message(MessageLiterals.PENDU_LOSE, word))
+        logger.log(Constant.VERBOSE, "Drawing template cache hit rate: %.2f", PenduDrawing.hit_rate())
 
     async def send_victory(self, word):
-        await self.ui.send(self.str(list(word), Constant.PENDU_NB_MAX_ERRORS, []))
+        await self.ui.send_board(self.str(list(word), Constant.PENDU_NB_MAX_ERRORS, []))
         await self.ui.send(MessageNLS.get_message(MessageLiterals.PENDU_WIN))
+        logger.log(Constant.VERBOSE, "Drawing template cache hit rate: %.2f", PenduDrawing.hit_rate())
 
     def str(self, word_list, lifes, errors, previous_try=None):
         return self.str_discord(word_list, lifes, errors, previous_try)
@@ -72,27 +77,55 @@ class PenduDrawing:
         self.nb_errors = Constant.PENDU_NB_MAX_ERRORS - lifes
         self.errors = errors
 
-    def error_step(self, index, string):
+    @staticmethod
+    def step(nb_errors, index, string):
         """
-        Alias for printing or not a part of the drawing, based on the internal
-        count of errors.
+        Return the part of the drawing, or blanks of the same length if it is
+        not shown yet with this count of errors.
 
         @param  index   minimal step index to show the part.
         @param  string  the part of the drawing to show.
         """
-        return string if self.nb_errors >= index else ' ' * len(string)
+        return string if nb_errors >= index else ' ' * len(string)
 
-    def __str__(self):
-        if self.nb_errors == 0:
-            return "```{}```".format(self.word)
-        prefix = ' ' * self.word_size
+    @staticmethod
+    @functools.lru_cache(maxsize=Constant.PENDU_DRAWING_CACHE_SIZE)
+    def template(nb_errors, word_size, lang_code):
+        """
+        Return the drawing around the word and the errors, as a tuple of
+        (text before word, text between word and errors, text after errors).
+        Templates are cached: they only depend on the parameters.
+
+        @param  lang_code   the current language, to be part of the cache key.
+        """
+        prefix = ' ' * word_size
         inter = '   '
-        return "\n".join([
+        step = PenduDrawing.step
+        head = "\n".join([
                 "```",
-                "{}{}  {}".format(prefix, inter, self.error_step(4, '_____')),
-                "{}{}  {}{}  {}".format(prefix, inter, self.error_step(2, '|'), self.error_step(3, '/'), self.error_step(5, '|')),
-                "{}{}  {}  {}{}{}  {}:".format(prefix, inter, self.error_step(2, '|'), self.error_step(10, '\\'), self.error_step(6, 'O'), self.error_step(11, '/'), MessageNLS.get_message(MessageLiterals.ERRORS)),
-                "{}{}  {}   {}   {}".format(self.word, inter, self.error_step(2, '|'), self.error_step(7, '|'), self.errors),
-                "{}{}  {}  {} {}".format(prefix, inter, self.error_step(2, '|'), self.error_step(8, '/'), self.error_step(9, '\\')),
-                "{}{}{}{}{}".format(prefix, inter, self.error_step(1, '__'), self.error_step(1, '_' if self.nb_errors == 1 else '|'), self.error_step(1, '__')),
+                "{}{}  {}".format(prefix, inter, step(nb_errors, 4, '_____')),
+                "{}{}  {}{}  {}".format(prefix, inter, step(nb_errors, 2, '|'), step(nb_errors, 3, '/'), step(nb_errors, 5, '|')),
+                "{}{}  {}  {}{}{}  {}:".format(prefix, inter, step(nb_errors, 2, '|'), step(nb_errors, 10, '\\'), step(nb_errors, 6, 'O'), step(nb_errors, 11, '/'), MessageNLS.get_message(MessageLiterals.ERRORS)),
+                ""])
+        middle = "{}  {}   {}   ".format(inter, step(nb_errors, 2, '|'), step(nb_errors, 7, '|'))
+        tail = "\n".join([
+                "",
+                "{}{}  {}  {} {}".format(prefix, inter, step(nb_errors, 2, '|'), step(nb_errors, 8, '/'), step(nb_errors, 9, '\\')),
+                "{}{}{}{}{}".format(prefix, inter, step(nb_errors, 1, '__'), step(nb_errors, 1, '_' if nb_errors == 1 else '|'), step(nb_errors, 1, '__')),
                 "```"])
+        return head, middle, tail
+
+    @staticmethod
+    def hit_rate():
+        """
+        Return the ratio of drawings served from the template cache.
+        """
+        info = PenduDrawing.template.cache_info()
+        total = info.hits + info.misses
+        return info.hits / total if total > 0 else 0.
+
+    def __str__(self):
+        if self.nb_errors == 0:
+            return "```{}```".format(self.word)
+        head, middle, tail = PenduDrawing.template(self.nb_errors, self.word_size, MessageNLS.get_language())
+        return "".join([head, self.word, middle, str(self.errors), tail])
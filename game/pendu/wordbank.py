@@ -0,0 +1,140 @@
+"""
+This module define the word bank of Pendu game.
+Words of the dictionary are sorted once by difficulty and length, so that a
+word matching the requested settings is picked in constant time.
+"""
+from utils import tools
+import logging
+logger = logging.getLogger(__name__)
+
+from array import array
+from collections import Counter
+from enum import Enum
+from random import randrange
+from game.pendu.dictionary import Dictionary
+from utils.tools import Constant
+
+
+class Difficulty(Enum):
+    EASY = 0
+    MEDIUM = 1
+    HARD = 2
+
+    @staticmethod
+    def parse(name):
+        """
+        Return the Difficulty matching the provided name (english or french),
+        or None if unknown.
+        """
+        return DIFFICULTY_NAMES.get(name.lower())
+
+DIFFICULTY_NAMES = {
+        "easy": Difficulty.EASY,
+        "facile": Difficulty.EASY,
+        "medium": Difficulty.MEDIUM,
+        "moyen": Difficulty.MEDIUM,
+        "hard": Difficulty.HARD,
+        "difficile": Difficulty.HARD
+}
+
+
+class WordBank:
+    """
+    Buckets of words by difficulty, sorted by length.
+
+    The difficulty score of a word is the mean rarity of its distinct letters,
+    plus a penalty for words with few distinct letters (less chances for a
+    tried letter to be in the word). Letters rarity and the score bounds of the
+    three difficulties (terciles, words of equal score in the easier one) are
+    measured on the whole dictionary, so that a word always gets the same
+    difficulty.
+
+    Use `WordBank.get(path)` to share the same instance between all games.
+    """
+    instances = dict()  # map file path to its WordBank
+
+    def __init__(self, dictionary):
+        self.dictionary = dictionary
+        self.buckets = dict()       # map Difficulty (or None for any) to word indexes sorted by length
+        self.length_starts = dict() # map Difficulty (or None for any) to the start position of each length in its bucket
+        self.max_length = 0
+        self.rarity = dict()            # map letter to its rarity, from 0 (most frequent) to 1
+        self.score_bounds = (0., 0.)    # highest scores of easy and medium words
+        self.build_buckets()
+        logger.debug("Word bank built for '%s'.", dictionary.path)
+
+    @staticmethod
+    def get(path=Constant.PENDU_DATABASE_FILE):
+        """
+        Return the shared WordBank of the provided file.
+        Buckets are built on first call only.
+        """
+        if path not in WordBank.instances:
+            WordBank.instances[path] = WordBank(Dictionary.get(path))
+        return WordBank.instances[path]
+
+    def build_buckets(self):
+        words = [self.dictionary[index] for index in range(len(self.dictionary))]
+        lengths = array('L', map(len, words))
+        self.max_length = max(lengths, default=0)
+
+        frequencies = Counter("".join(words))
+        ranking = [letter for letter, _ in frequencies.most_common()]
+        self.rarity = {letter: rank / max(1, len(ranking) - 1) for rank, letter in enumerate(ranking)}
+
+        scores = list(map(self.score, words))
+        if scores:
+            ordered = sorted(scores)
+            self.score_bounds = (ordered[max(0, len(ordered) // 3 - 1)], ordered[max(0, 2 * len(ordered) // 3 - 1)])
+
+        by_length = sorted(range(len(words)), key=lengths.__getitem__)
+        difficulties = [self.get_difficulty_of_score(score) for score in scores]
+        for difficulty in [None, *Difficulty]:
+            bucket = array('L', by_length if difficulty is None
+                    else (index for index in by_length if difficulties[index] is difficulty))
+            # starts[length] is the position of the first word at least `length` long
+            counts = Counter(lengths[index] for index in bucket)
+            starts = array('L', [0] * (self.max_length + 2))
+            for length in range(1, self.max_length + 2):
+                starts[length] = starts[length - 1] + counts.get(length - 1, 0)
+            self.buckets[difficulty] = bucket
+            self.length_starts[difficulty] = starts
+
+    def score(self, word):
+        letters = set(word)
+        return sum(self.rarity.get(letter, 1.) for letter in letters) / len(letters) + 1 / len(letters)
+
+    def get_difficulty(self, word):
+        return self.get_difficulty_of_score(self.score(word))
+
+    def get_difficulty_of_score(self, score):
+        if score <= self.score_bounds[0]:
+            return Difficulty.EASY
+        return Difficulty.MEDIUM if score <= self.score_bounds[1] else Difficulty.HARD
+
+    def count(self, min_len=0, max_len=None, difficulty=None):
+        """
+        Return the number of words matching the provided settings.
+        """
+        lower, upper = self.bounds(min_len, max_len, difficulty)
+        return upper - lower
+
+    def bounds(self, min_len, max_len, difficulty):
+        starts = self.length_starts[difficulty]
+        min_len = min(max(min_len, 0), self.max_length + 1)
+        max_len = self.max_length if max_len is None else min(max(max_len, -1), self.max_length)
+        return starts[min_len], starts[max_len + 1]
+
+    def pick(self, min_len=0, max_len=None, difficulty=None):
+        """
+        Return a random word matching the provided settings, in lowercase.
+
+        @param  min_len     Minimal length of the word.
+        @param  max_len     Optional. Maximal length of the word.
+        @param  difficulty  Optional. Difficulty of the word. Any if None.
+        @raise  ValueError  if no word matches the settings.
+        """
+        lower, upper = self.bounds(min_len, max_len, difficulty)
+        if lower >= upper:
+            raise ValueError(f"No word matches length [{min_len}, {max_len}] and difficulty {difficulty}.")
+        return self.dictionary[self.buckets[difficulty][randrange(lower, upper)]]
@@ -0,0 +1,131 @@
+"""
+Bot opponent of Puissance 4 game.
+Negamax search with alpha-beta pruning and a transposition table, on bitboards.
+
+The search is CPU bound: it runs in a pool of worker processes so that the
+event loop of the bot keeps serving other games. Each worker process keeps its
+own transposition table between searches.
+"""
+from utils import tools
+import logging
+logger = logging.getLogger(__name__)
+
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from game.puissance4.model import WIDTH, COLUMN_SIZE, NB_CELLS, BOARD_MASK, bottom_mask, column_mask, can_play, is_win
+from utils.tools import Constant
+
+# columns explored from the center, where moves are usually better
+COLUMN_ORDER = sorted(range(WIDTH), key=lambda column: abs(WIDTH // 2 - column))
+WIN_SCORE = 1000  # above any heuristic score
+# transposition table flags
+EXACT, LOWER, UPPER = 0, 1, 2
+
+# map position key to (depth, flag, score); one table per process
+transposition_table = dict()
+pool = None
+
+
+def get_pool():
+    """
+    Return the process pool running searches, created on first use.
+    """
+    global pool
+    if pool is None:
+        pool = ProcessPoolExecutor(max_workers=Constant.PUISSANCE4_AI_WORKERS,
+                mp_context=multiprocessing.get_context("spawn"))
+    return pool
+
+def shutdown_pool():
+    global pool
+    if pool is not None:
+        pool.shutdown(wait=False, cancel_futures=True)
+        pool = None
+
+
+def best_move(position, mask, depth=Constant.PUISSANCE4_AI_DEPTH):
+    """
+    Return the best column to play.
+    Picklable entry point of the worker processes.
+
+    @param  position    stones of the player to play.
+    @param  mask        stones of both players.
+    @param  depth       number of moves to look ahead.
+    """
+    if len(transposition_table) > Constant.PUISSANCE4_AI_TABLE_SIZE:
+        transposition_table.clear()
+    best_column, best_score = None, -WIN_SCORE - 1
+    alpha, beta = -WIN_SCORE, WIN_SCORE
+    for column in COLUMN_ORDER:
+        if not can_play(mask, column):
+            continue
+        if is_win(position | ((mask + bottom_mask(column)) & column_mask(column))):
+            return column
+        score = -negamax(position ^ mask, mask | (mask + bottom_mask(column)), depth - 1, -beta, -alpha)
+        if score > best_score:
+            best_column, best_score = column, score
+            alpha = max(alpha, score)
+    return best_column
+
+def negamax(position, mask, depth, alpha, beta):
+    """
+    Return the score of the position for the player to play:
+    positive if winning (the sooner, the higher), negative if losing.
+    """
+    moves = bin(mask).count('1')
+    if moves == NB_CELLS:
+        return 0
+    for column in range(WIDTH):
+        if can_play(mask, column) and is_win(position | ((mask + bottom_mask(column)) & column_mask(column))):
+            return WIN_SCORE - moves
+    if depth <= 0:
+        return evaluate(position, mask)
+
+    key = position + mask # unique for each position
+    entry = transposition_table.get(key)
+    if entry is not None and entry[0] >= depth:
+        if entry[1] == EXACT:
+            return entry[2]
+        if entry[1] == LOWER:
+            alpha = max(alpha, entry[2])
+        else:
+            beta = min(beta, entry[2])
+        if alpha >= beta:
+            return entry[2]
+
+    original_alpha = alpha
+    score = -WIN_SCORE
+    opponent = position ^ mask
+    for column in COLUMN_ORDER:
+        if not can_play(mask, column):
+            continue
+        score = max(score, -negamax(opponent, mask | (mask + bottom_mask(column)), depth - 1, -beta, -alpha))
+        alpha = max(alpha, score)
+        if alpha >= beta:
+            break
+
+    flag = UPPER if score <= original_alpha else LOWER if score >= beta else EXACT
+    transposition_table[key] = (depth, flag, score)
+    return score
+
+def evaluate(position, mask):
+    """
+    Heuristic score of a position: difference between the number of empty
+    cells completing an alignment for the player to play and for its opponent.
+    """
+    return (bin(winning_cells(position, mask)).count('1')
+            - bin(winning_cells(position ^ mask, mask)).count('1'))
+
+def winning_cells(position, mask):
+    """
+    Return the bitboard of empty cells that would complete 4 aligned stones of the position.
+    """
+    cells = (position << 1) & (position << 2) & (position << 3) # vertical
+    for shift in (COLUMN_SIZE, COLUMN_SIZE - 1, COLUMN_SIZE + 1): # horizontal, diagonals
+        pairs = (position << shift) & (position << (2 * shift))
+        cells |= pairs & (position << (3 * shift))
+        cells |= pairs & (position >> shift)
+        pairs = (position >> shift) & (position >> (2 * shift))
+        cells |= pairs & (position << shift)
+        cells |= pairs & (position >> (3 * shift))
+    return cells & BOARD_MASK & ~mask
@@ -0,0 +1,102 @@
+"""
+Definitions of Controller and Callback objects for Puissance 4 game.
+"""
+from utils import tools
+import logging
+logger = logging.getLogger(__name__)
+
+import asyncio, sys
+from game.puissance4 import ai
+from game.puissance4.model import Model
+from mvc.controller import AbstractController, AbstractCallback
+from utils.tools import Constant
+
+
+class Controller(AbstractController):
+    """
+    Controller for Puissance 4 game.
+    Players play in turn in the channel. The bot can play one of them.
+    """
+    __slots__ = ()
+
+    def __init__(self, orchestrator, context, view, model=None, **settings):
+        """
+        @param  model       Optional. Model of a restored game.
+        @param  settings    Optional. Settings forwarded to a new Model.
+        """
+        super().__init__(orchestrator, model if model is not None else Model(**settings), view)
+        assert not self.model.is_over()
+
+    # Lifecycle
+
+    async def loop(self):
+        """
+        Main game loop.
+        """
+        previous_move = None
+
+        while not self.model.is_over():
+            if self.model.is_ai_turn():
+                column = await self.play_ai()
+            else:
+                callback = Callback(self.model.get_grid(), self.model.get_player(), previous_move, self.model.get_playable_columns())
+                try:
+                    await self.call(self.main_view, callback, timeout=10*60)
+                except TimeoutError:
+                    logger.warning("Player did not answer before timeout.") # should never appear in case of no timeout.
+                    continue
+                except asyncio.exceptions.CancelledError:
+                    logger.warning("Game loop cancelled.")
+                    raise
+                except:
+                    logger.exception("Call to player failed.")
+                    raise
+                column = callback.column
+            self.model.play(column)
+            previous_move = column
+
+        self.orchestrator.close_view(self.main_view.id)
+        await self.main_view.send_end(self.model.get_grid(), self.model.winner(), self.model.ai_player)
+
+    async def play_ai(self):
+        """
+        Return the column chosen by the bot.
+        The search runs in a worker process, not to block the event loop.
+        """
+        position, mask = self.model.get_position()
+        # the search is sent to workers by name, which must resolve in the
+        # current modules: they are new ones once the game is reloaded.
+        best_move = getattr(sys.modules[ai.__name__], "best_move")
+        return await asyncio.get_running_loop().run_in_executor(ai.get_pool(),
+                best_move, position, mask, Constant.PUISSANCE4_AI_DEPTH)
+
+
+class Callback(AbstractCallback):
+    """
+    Callback object for Puissance 4 game.
+    """
+    __slots__ = ("grid", "player", "previous_move", "playable_columns", "column")
+
+    def __init__(self, grid, player, previous_move, playable_columns):
+        super().__init__()
+        # inputs
+        self.grid = grid
+        self.player = player
+        self.previous_move = previous_move
+        self.playable_columns = playable_columns
+        # output
+        self.column = None
+
+    def answered(self):
+        return self.column is not None
+
+    # call
+
+    def play_column(self, column):
+        """
+        The view must call this method to play a move.
+
+        @param  column  index of a playable column, from 0.
+        """
+        self.column = column
+        self.notify()
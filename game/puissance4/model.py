@@ -0,0 +1,157 @@
+"""
+This module define the data model for Puissance 4 (Connect Four) game.
+The board is stored as bitboards: one integer per player, one bit per cell.
+
+Bit order of cells (column by column, with one extra sentinel row on top):
+     6 13 20 27 34 41 48
+     5 12 19 26 33 40 47
+     ...
+     0  7 14 21 28 35 42
+"""
+from utils import tools
+import logging
+logger = logging.getLogger(__name__)
+
+import struct
+
+WIDTH = 7
+HEIGHT = 6
+COLUMN_SIZE = HEIGHT + 1   # including sentinel row
+NB_CELLS = WIDTH * HEIGHT
+BOTTOM_MASK = sum(1 << (column * COLUMN_SIZE) for column in range(WIDTH))
+BOARD_MASK = BOTTOM_MASK * ((1 << HEIGHT) - 1)
+# player 0 and 1 bitboards, bot player (-1 for none)
+DUMP_FORMAT = struct.Struct("<QQb")
+
+
+def bottom_mask(column):
+    return 1 << (column * COLUMN_SIZE)
+
+def top_mask(column):
+    return 1 << (HEIGHT - 1 + column * COLUMN_SIZE)
+
+def column_mask(column):
+    return ((1 << HEIGHT) - 1) << (column * COLUMN_SIZE)
+
+def can_play(mask, column):
+    """
+    True if the column of the board (mask of all stones) is not full.
+    """
+    return 0 <= column < WIDTH and mask & top_mask(column) == 0
+
+def is_win(position):
+    """
+    True if the bitboard of a player contains 4 aligned stones.
+    """
+    for shift in (1, COLUMN_SIZE, COLUMN_SIZE - 1, COLUMN_SIZE + 1): # vertical, horizontal, diagonals
+        pairs = position & (position >> shift)
+        if pairs & (pairs >> (2 * shift)):
+            return True
+    return False
+
+
+class Model:
+    """
+    Represent the data model of Puissance 4 game.
+    Player 0 starts. Playing a move and detecting a win are done in constant time.
+    """
+    __slots__ = ("boards", "mask", "moves", "ai_player")
+
+    def __init__(self, ai_player=None):
+        """
+        @param  ai_player   Optional. Index of the player played by the bot.
+        """
+        self.ai_player = ai_player
+        self.restart()
+
+    def restart(self):
+        # stones of each player
+        self.boards = [0, 0]
+        # stones of both players
+        self.mask = 0
+        # number of played moves
+        self.moves = 0
+
+    def dump(self):
+        """
+        Return the state of the game as compact bytes, to be restored with `Model.load`.
+        """
+        return DUMP_FORMAT.pack(self.boards[0], self.boards[1], -1 if self.ai_player is None else self.ai_player)
+
+    @staticmethod
+    def load(data):
+        """
+        Return a Model restored from bytes provided by `dump`.
+        """
+        board0, board1, ai_player = DUMP_FORMAT.unpack(data)
+        model = Model(None if ai_player < 0 else ai_player)
+        model.boards = [board0, board1]
+        model.mask = board0 | board1
+        model.moves = bin(model.mask).count('1')
+        return model
+
+    # Getters
+
+    def get_player(self):
+        """
+        Index of the player to play.
+        """
+        return self.moves & 1
+
+    def is_ai_turn(self):
+        return self.ai_player is not None and self.get_player() == self.ai_player
+
+    def can_play(self, column):
+        return can_play(self.mask, column)
+
+    def get_playable_columns(self):
+        return [column for column in range(WIDTH) if self.can_play(column)]
+
+    def get_position(self):
+        """
+        Return (stones of the player to play, stones of both players).
+        """
+        return self.boards[self.get_player()], self.mask
+
+    def winner(self):
+        """
+        Index of the winner, None if no winner yet.
+        Only the last player can have won.
+        """
+        last_player = 1 - self.get_player()
+        return last_player if is_win(self.boards[last_player]) else None
+
+    def is_over(self):
+        """
+        True if the game is done.
+        """
+        return self.moves == NB_CELLS or self.winner() is not None
+
+    def get_grid(self):
+        """
+        Return the rows of the board from top to bottom.
+        Each cell is the index of the player, or None if empty.
+        """
+        grid = []
+        for row in range(HEIGHT - 1, -1, -1):
+            line = []
+            for column in range(WIDTH):
+                bit = 1 << (column * COLUMN_SIZE + row)
+                line.append(0 if self.boards[0] & bit else 1 if self.boards[1] & bit else None)
+            grid.append(line)
+        return grid
+
+    # play
+
+    def play(self, column):
+        """
+        Drop a stone of the current player in the column.
+
+        @raise  ValueError  if the column is full or does not exist.
+        """
+        if not self.can_play(column):
+            raise ValueError(f"Column {column} cannot be played.")
+        stone = (self.mask + bottom_mask(column)) & column_mask(column) & ~self.mask
+        self.boards[self.get_player()] |= stone
+        self.mask |= stone
+        self.moves += 1
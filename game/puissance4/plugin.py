@@ -0,0 +1,22 @@
+"""
+Entry point of the puissance4 game, loaded on first use by the game registry.
+"""
+from utils import tools
+import logging
+logger = logging.getLogger(__name__)
+
+from game.puissance4 import ai
+from game.puissance4.controller import Controller
+from game.puissance4.model import Model
+from game.puissance4.view import View
+
+
+def teardown():
+    ai.shutdown_pool()
+
+async def create(orchestrator, ctx, view, opponent=None, *ignored):
+    """
+    Argument: "bot" to play against the bot.
+    """
+    ai_player = 1 if opponent is not None and opponent.lower() == "bot" else None
+    return Controller(orchestrator, ctx, view, ai_player=ai_player)
@@ -0,0 +1,69 @@
+from utils import tools
+import logging
+logger = logging.getLogger(__name__)
+
+import asyncio
+from game.puissance4 import ai
+from game.puissance4.model import Model
+from test.archi import TestCase
+from time import time
+
+
+class TestAI(TestCase):
+    def get_model(self, columns):
+        model = Model()
+        for column in columns:
+            model.play(column)
+        return model
+
+    def test_win(self):
+        """
+        The bot completes its own alignment.
+        """
+        model = self.get_model([0, 6, 1, 6, 2, 5])
+        self.assertEqual(3, ai.best_move(*model.get_position(), 4))
+
+    def test_win_above_opponent(self):
+        """
+        Only the played stone counts for a win, not the stones under it.
+        """
+        model = self.get_model([2, 0, 4, 4, 4, 6, 4, 2, 3, 4, 0, 6]) # opponent stones in column 4
+        self.assertIn(ai.best_move(*model.get_position(), 4), (1, 5))
+        model.play(4)
+        self.assertIsNone(model.winner())
+        model = self.get_model([5, 4, 1, 4, 3, 6, 0, 1, 0, 3, 1, 0, 5, 1, 3, 5, 4, 5, 3, 4])
+        self.assertEqual(2, ai.best_move(*model.get_position(), 4))
+
+    def test_block(self):
+        """
+        The bot prevents the alignment of its opponent.
+        """
+        model = self.get_model([0, 6, 1, 6, 2])
+        self.assertEqual(3, ai.best_move(*model.get_position(), 4))
+
+    def test_winning_cells(self):
+        model = self.get_model([1, 6, 2, 6, 3])
+        cells = ai.winning_cells(model.boards[0], model.mask)
+        self.assertEqual(2, bin(cells).count('1')) # both ends of the row
+
+    def test_process_pool(self):
+        """
+        Searches run in worker processes, concurrently with the event loop.
+        """
+        model = Model()
+        async def search():
+            loop = asyncio.get_running_loop()
+            ticks = 0
+            future = loop.run_in_executor(ai.get_pool(), ai.best_move, *model.get_position())
+            while not future.done():
+                await asyncio.sleep(.01)
+                ticks += 1
+            return await future, ticks
+        try:
+            t = time()
+            column, ticks = asyncio.run(search())
+            logger.info("Search took %.3f sec.", time() - t)
+            self.assertEqual(3, column)
+            self.assertGreater(ticks, 0)
+        finally:
+            ai.shutdown_pool()
@@ -0,0 +1,84 @@
+from utils import tools
+import logging
+logger = logging.getLogger(__name__)
+
+import asyncio
+from game.puissance4 import ai
+from game.puissance4.controller import Controller
+from game.puissance4.view import View
+from mvc.ui import ConsoleUI
+from test.archi import TestCase, DiscordOrchestratorForTest
+from test.interaction import UIForTest
+
+
+class FirstColumnUIForTest(ConsoleUI):
+    """
+    Player always playing the first playable column.
+    """
+    async def send(self, message):
+        if self.view.callback is not None:
+            await self.view.on_message(str(self.view.callback.playable_columns[0] + 1))
+
+
+class PlayersUIForTest(ConsoleUI):
+    """
+    Scheduled (author id, content) messages, sent until the move is accepted.
+    """
+    def __init__(self, messages):
+        super().__init__()
+        self.messages = messages
+
+    async def send(self, message):
+        while self.view.callback is not None and self.messages:
+            await self.view.on_message(self.messages.pop())
+
+    def get_message(self, message):
+        return message[1]
+
+    def get_author_id(self, message):
+        return message[0]
+
+
+class TestController(TestCase):
+    def start(self, ui, **settings):
+        orchestrator = DiscordOrchestratorForTest()
+        view = View(ui)
+        orchestrator.lock_new_view(view.id)
+        orchestrator.open_new_view(view.id, view)
+        return Controller(orchestrator, None, view, **settings)
+
+    def test_play_game(self):
+        """
+        Play an entire game between two players.
+        """
+        game = self.start(UIForTest(list(reversed(['1', '2', '1', '2', '1', '2', '1']))))
+        asyncio.run(game.loop())
+        self.assertTrue(game.model.is_over())
+        self.assertEqual(0, game.model.winner())
+
+    def test_players_bound_to_colours(self):
+        """
+        Once played, a colour can only be played by the same player.
+        """
+        ui = PlayersUIForTest(list(reversed([(7, '1'), (8, '2'), (7, '1'),
+                (9, '2'),   # not a player
+                (7, '2'),   # not the turn of this player
+                (8, '2'), (7, '1'), (8, '2'), (7, '1')])))
+        game = self.start(ui)
+        asyncio.run(game.loop())
+        self.assertEqual([], ui.messages)
+        self.assertEqual([7, 8], game.main_view.players)
+        self.assertEqual(7, game.model.moves)
+        self.assertEqual(0, game.model.winner())
+
+    def test_play_against_bot(self):
+        """
+        Play an entire game against the bot.
+        """
+        game = self.start(FirstColumnUIForTest(), ai_player=1)
+        try:
+            asyncio.run(game.loop())
+        finally:
+            ai.shutdown_pool()
+        self.assertTrue(game.model.is_over())
+        self.assertEqual(1, game.model.winner())
@@ -0,0 +1,62 @@
+from utils import tools
+import logging
+logger = logging.getLogger(__name__)
+
+from game.puissance4.model import Model, HEIGHT
+from test.archi import TestCase
+
+
+class TestModel(TestCase):
+    def play(self, columns, ai_player=None):
+        model = Model(ai_player)
+        for column in columns:
+            model.play(column)
+        return model
+
+    def test_vertical(self):
+        model = self.play([0, 1, 0, 1, 0, 1])
+        self.assertFalse(model.is_over())
+        model.play(0)
+        self.assertTrue(model.is_over())
+        self.assertEqual(0, model.winner())
+
+    def test_horizontal(self):
+        model = self.play([6, 0, 6, 1, 5, 2, 4, 3])
+        self.assertEqual(1, model.winner())
+
+    def test_diagonals(self):
+        model = self.play([0, 1, 1, 2, 3, 2, 2, 3, 4, 3, 3])
+        self.assertEqual(0, model.winner())
+        model = self.play([6, 5, 5, 4, 3, 4, 4, 3, 2, 3, 3])
+        self.assertEqual(0, model.winner())
+
+    def test_no_wrap(self):
+        """
+        Stones at the top of a column and the bottom of the next one are not aligned.
+        """
+        model = self.play([0, 1, 0, 1, 0, 1, 2, 0, 2, 0, 2, 0, 1, 2])
+        self.assertIsNone(model.winner())
+
+    def test_full_column(self):
+        model = self.play([3] * HEIGHT)
+        self.assertFalse(model.can_play(3))
+        self.assertNotIn(3, model.get_playable_columns())
+        with self.assertRaises(ValueError):
+            model.play(3)
+        with self.assertRaises(ValueError):
+            model.play(7)
+
+    def test_grid(self):
+        model = self.play([3, 3, 4])
+        grid = model.get_grid()
+        self.assertEqual([None, None, None, 0, 0, None, None], grid[-1])
+        self.assertEqual([None, None, None, 1, None, None, None], grid[-2])
+        self.assertEqual(1, model.get_player())
+
+    def test_dump(self):
+        model = self.play([3, 3, 4, 2], ai_player=1)
+        restored = Model.load(model.dump())
+        self.assertEqual(model.get_grid(), restored.get_grid())
+        self.assertEqual(model.get_player(), restored.get_player())
+        self.assertEqual(1, restored.ai_player)
+        self.assertIsNone(Model.load(Model().dump()).ai_player)
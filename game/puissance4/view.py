@@ -0,0 +1,88 @@
+from utils import tools
+import logging
+logger = logging.getLogger(__name__)
+
+from utils.tools import Constant
+from mvc.view import UserInteractView
+from utils.language import MessageNLS
+from utils.language_resources.MessageLiterals import MessageLiterals
+
+# stone of each player, and empty cell
+STONES = ("X", "O")
+EMPTY = "."
+
+
+class View(UserInteractView):
+    """
+    View of Puissance 4 game.
+    Columns are played by sending their number, from 1.
+    In a shared game, each colour belongs to the author of its first move.
+    """
+    __slots__ = ("players",)
+
+    def __init__(self, ui):
+        super().__init__(ui)
+        self.players = [None, None] # author id of each colour, once played
+
+    def is_player(self, author_id):
+        """
+        True if the author can play the current colour.
+        """
+        player = self.players[self.callback.player]
+        return player is None or player == author_id
+
+    # UserInteractView specific
+
+    def is_expected_on_message(self, message):
+        """
+        To be called on on_message event.
+        """
+        return (super().is_expected_on_message(message)
+                and message.isdigit()
+                and int(message) - 1 in self.callback.playable_columns)
+
+    async def on_message(self, message):
+        content = self.ui.get_message(message)
+        id = self.ui.get_message_id(message)
+        author_id = self.ui.get_author_id(message)
+        if not self.is_expected_on_message(content):
+            logger.log(Constant.VERBOSE, "Ignore message %s.", id)
+        elif not self.is_player(author_id):
+            logger.log(Constant.VERBOSE, "Ignore message %s: not the turn of its author.", id)
+        else:
+            callback = self.get_callback()
+            self.players[callback.player] = author_id
+            callback.play_column(int(content) - 1)
+
+    # Puissance 4 specific
+
+    async def send(self, callback):
+        """
+        Send updated main message.
+        """
+        await self.ui.send_board("\n".join([
+                self.str(callback.grid, callback.previous_move),
+                MessageNLS.get_message(MessageLiterals.PUISSANCE4_TURN, STONES[callback.player])]))
+
+    async def send_end(self, grid, winner, ai_player=None):
+        await self.ui.send_board(self.str(grid))
+        if winner is None:
+            await self.ui.send(MessageNLS.get_message(MessageLiterals.PUISSANCE4_DRAW))
+        elif winner == ai_player:
+            await self.ui.send(MessageNLS.get_message(MessageLiterals.PUISSANCE4_AI_WIN))
+        else:
+            await self.ui.send(MessageNLS.get_message(MessageLiterals.PUISSANCE4_WIN, STONES[winner]))
+
+    def str(self, grid, previous_move=None):
+        """
+        Board in ascii, shown with the multilines block-code quotes (``).
+        The last played column is marked under the board.
+        """
+        lines = ["```"]
+        for row in grid:
+            lines.append("|{}|".format(" ".join(EMPTY if cell is None else STONES[cell] for cell in row)))
+        lines.append(" {} ".format(" ".join(str(column + 1) for column in range(len(grid[0])))))
+        if previous_move is not None:
+            lines.append(" " * (2 * previous_move + 1) + "^")
+        lines.append("```")
+        return "\n".join(lines)
@@ -0,0 +1,197 @@
+"""
+Registry of the available games.
+
+Games are declared here with lightweight metadata only, so that the bot can
+register their commands without importing them. The game package is imported
+on first use, from its `plugin` module which provides:
+- `Controller`, `Model` and `View` classes of the game,
+- `async def create(orchestrator, ctx, view, *args)`, returning the controller
+  of a new game, or None after telling the player that arguments are invalid,
+- optionally `setup()`, called once the game is imported, and `teardown()`,
+  called to release the resources of this version of the game: when it is
+  replaced by a reload and no running game uses it anymore, or when the bot
+  is closed.
+
+Loading a game may take time (e.g. indexing words): the bot runs `load` and
+`reload` in a thread, not to block the event loop.
+
+A game can be reloaded from its files while the bot runs: its modules are
+imported again as new module objects, so that running games finish on the
+code they started with. Previous versions are torn down with `release_retired`
+once their last game is over.
+"""
+from utils import tools
+import logging
+logger = logging.getLogger(__name__)
+
+import importlib, sys, threading
+from time import perf_counter
+from utils.startup import Startup
+
+
+class GamePlugin:
+    """
+    Metadata of a game, and its plugin module once loaded.
+    """
+    __slots__ = ("name", "game_type", "aliases", "help", "module", "retired", "lock")
+
+    def __init__(self, name, game_type, aliases=(), help=""):
+        """
+        @param  name        Name of the game package, also the command name.
+        @param  game_type   Identifier of the game in snapshots. Never reuse one.
+        """
+        self.name = name
+        self.game_type = game_type
+        self.aliases = aliases
+        self.help = help
+        self.module = None
+        self.retired = []   # plugin modules replaced by a reload, maybe still used by running games
+        self.lock = threading.RLock() # loads from several threads
+
+    def is_loaded(self):
+        return self.module is not None
+
+    def load(self):
+        """
+        Return the plugin module of the game, imported on first call.
+        Thread safe.
+        """
+        with self.lock:
+            return self.load_module()
+
+    def load_module(self):
+        if self.module is None:
+            start_time = perf_counter()
+            module = importlib.import_module(f"game.{self.name}.plugin")
+            if hasattr(module, "setup"):
+                module.setup()
+            self.module = module
+            duration = perf_counter() - start_time
+            Startup.record_import(f"game.{self.name}", duration)
+            logger.info("Game '%s' loaded in %.3f sec.", self.name, duration)
+        return self.module
+
+    def reload(self):
+        """
+        Import the game again from its files.
+        Modules of the package are removed from the import system rather than
+        updated in place: running games keep the previous ones. On error, the
+        previous modules are restored.
+
+        @raise  Exception   raised by the import of the new code.
+        """
+        with self.lock:
+            self.reload_module()
+
+    def reload_module(self):
+        package = f"game.{self.name}"
+        previous = {name: module for name, module in sys.modules.items()
+                if name == package or name.startswith(package + ".")}
+        previous_module = self.module
+        for name in previous:
+            del sys.modules[name]
+        importlib.invalidate_caches()
+        self.module = None
+        try:
+            self.load_module()
+        except BaseException:
+            for name in [name for name in sys.modules if name == package or name.startswith(package + ".")]:
+                del sys.modules[name]
+            sys.modules.update(previous)
+            if package in previous:
+                setattr(sys.modules["game"], self.name, previous[package])
+            self.module = previous_module
+            raise
+        if previous_module is not None:
+            self.retired.append(previous_module)
+
+    def release_retired(self, controllers):
+        """
+        Tear down the previous versions of the game not used by the provided
+        running controllers anymore.
+        """
+        with self.lock:
+            used = {type(controller) for controller in controllers}
+            released = [module for module in self.retired if module.Controller not in used]
+            self.retired = [module for module in self.retired if module.Controller in used]
+        for module in released:
+            GamePlugin.teardown(module)
+        if released:
+            logger.info("%s previous versions of game '%s' released.", len(released), self.name)
+
+    @staticmethod
+    def teardown(module):
+        if hasattr(module, "teardown"):
+            try:
+                module.teardown()
+            except Exception:
+                logger.exception("Failed to tear down %s.", module.__name__)
+
+
+class GameRegistry:
+    """
+    Class-level registry of games, by name and by game type.
+    """
+    plugins = dict()    # map game name to its GamePlugin
+    types = dict()      # map game type to its GamePlugin
+
+    @staticmethod
+    def register(plugin):
+        assert plugin.game_type not in GameRegistry.types, f"Game type {plugin.game_type} is already used."
+        GameRegistry.plugins[plugin.name] = plugin
+        GameRegistry.types[plugin.game_type] = plugin
+
+    @staticmethod
+    def get(name):
+        """
+        @raise  KeyError    on unknown game.
+        """
+        return GameRegistry.plugins[name]
+
+    @staticmethod
+    def get_type(game_type):
+        """
+        @raise  KeyError    on unknown game type.
+        """
+        return GameRegistry.types[game_type]
+
+    @staticmethod
+    def get_name(controller):
+        """
+        Name of the game package of the controller, e.g. "pendu".
+        """
+        return type(controller).__module__.split(".")[-2]
+
+    @staticmethod
+    def get_plugin(controller):
+        """
+        Return the GamePlugin of the controller; None if not a registered game.
+        """
+        return GameRegistry.plugins.get(GameRegistry.get_name(controller))
+
+    @staticmethod
+    def shutdown():
+        """
+        Release resources of loaded games, including their previous versions.
+        """
+        for plugin in GameRegistry.plugins.values():
+            plugin.release_retired(())
+            if plugin.is_loaded():
+                GamePlugin.teardown(plugin.module)
+
+    @staticmethod
+    def release_retired(controllers):
+        """
+        Tear down previous versions of games not used by the running controllers.
+        """
+        for plugin in GameRegistry.plugins.values():
+            if plugin.retired:
+                plugin.release_retired(controllers)
+
+
+GameRegistry.register(GamePlugin("pendu", 1,
+        help="Devine le mot caché. Difficulté (facile, moyen, difficile) et longueurs optionnelles.\n"
+        "Guess the hidden word. Optional difficulty (easy, medium, hard) and lengths."))
+GameRegistry.register(GamePlugin("puissance4", 2, aliases=("p4",),
+        help="Aligne 4 pions. Ajoute \"bot\" pour jouer contre le bot.\n"
+        "Align 4 stones. Add \"bot\" to play against the bot."))
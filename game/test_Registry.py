@@ -0,0 +1,159 @@
+from utils import tools
+import logging
+logger = logging.getLogger(__name__)
+
+import asyncio, os, subprocess, sys, threading, time
+from types import SimpleNamespace
+from unittest import mock
+from game.registry import GamePlugin, GameRegistry
+from interface.orchestration import Games
+from mvc.ui import ConsoleUI
+from utils.language import MessageNLS
+from utils.language_resources.MessageLiterals import MessageLiterals
+from utils.startup import Startup
+from test.archi import TestCase
+
+
+class TestRegistry(TestCase):
+    def test_lazy_import(self):
+        """
+        Games are not imported with the bot.
+        """
+        code = "import sys, interface.orchestration; print(sorted(m for m in sys.modules if m.startswith('game.')))"
+        result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, timeout=60,
+                env=dict(os.environ, PYTHONPATH=os.getcwd()))
+        self.assertEqual("['game.registry']", result.stdout.strip(), result.stderr)
+
+    def test_load(self):
+        for name, plugin in GameRegistry.plugins.items():
+            self.assertIs(plugin, GameRegistry.get_type(plugin.game_type))
+            game = plugin.load()
+            self.assertTrue(plugin.is_loaded())
+            self.assertIs(game, plugin.load())
+            self.assertIn(f"game.{name}", Startup.imports)
+            for attribute in ("Controller", "Model", "View", "create"):
+                self.assertTrue(hasattr(game, attribute), f"{name}.plugin.{attribute} is missing.")
+            self.assertEqual(name, GameRegistry.get_name(game.Controller.__new__(game.Controller)))
+            self.assertIs(plugin, GameRegistry.get_plugin(game.Controller.__new__(game.Controller)))
+
+    def test_commands(self):
+        """
+        The Games cog declares one command per game.
+        """
+        cog = Games(None)
+        names = {command.name: command for command in cog.get_commands()}
+        for name, plugin in GameRegistry.plugins.items():
+            self.assertIn(name, names)
+            self.assertEqual(list(plugin.aliases), names[name].aliases)
+            self.assertIs(plugin, names[name].extras["plugin"])
+
+    def test_invalid_settings(self):
+        game = GameRegistry.get("pendu").load()
+        sent = []
+        async def send(message):
+            sent.append(message)
+        ctx = SimpleNamespace(send=send)
+        for args in (("impossible",), ("easy", "x"), ("easy", "30", "40")):
+            self.assertIsNone(asyncio.run(game.create(None, ctx, game.View(ConsoleUI()), *args)))
+        self.assertEqual([MessageNLS.get_message(MessageLiterals.PENDU_INVALID_SETTINGS)] * 3, sent)
+        controller = asyncio.run(game.create(None, ctx, game.View(ConsoleUI()), "easy", "5", "8", "ignored"))
+        self.assertTrue(5 <= len(controller.model.secret_word) <= 8)
+
+    def test_load_in_thread(self):
+        """
+        Concurrent loads in threads set the game up once, without blocking the event loop.
+        """
+        setups = []
+        def setup():
+            time.sleep(.2)
+            setups.append(threading.get_ident())
+        plugin = GamePlugin("fake", 0)
+        async def main():
+            ticks = 0
+            async def tick():
+                nonlocal ticks
+                while not setups:
+                    ticks += 1
+                    await asyncio.sleep(.01)
+            with mock.patch("game.registry.importlib.import_module", return_value=SimpleNamespace(setup=setup)):
+                modules = await asyncio.gather(asyncio.to_thread(plugin.load), asyncio.to_thread(plugin.load), tick())
+            self.assertIs(modules[0], modules[1])
+            self.assertGreater(ticks, 5)
+        asyncio.run(main())
+        self.assertEqual(1, len(setups))
+        Startup.imports.pop("game.fake")
+
+
+class TestReload(TestCase):
+    def reload(self, name):
+        """
+        Reload the game, and restore the original modules at the end of the test.
+        """
+        plugin = GameRegistry.get(name)
+        previous_module = plugin.load()
+        modules = {key: module for key, module in sys.modules.items() if key.startswith(f"game.{name}")}
+        def restore():
+            GamePlugin.teardown(plugin.module)
+            sys.modules.update(modules)
+            setattr(sys.modules["game"], name, modules[f"game.{name}"])
+            plugin.module = previous_module
+            plugin.retired.clear()
+        self.addCleanup(restore)
+        plugin.reload()
+        return plugin, previous_module
+
+    def test_reload(self):
+        plugin, previous = self.reload("pendu")
+        self.assertIsNot(previous, plugin.module)
+        self.assertIsNot(previous.Controller, plugin.module.Controller)
+        self.assertIs(plugin.module.Controller, sys.modules["game.pendu.controller"].Controller)
+        self.assertEqual([previous], plugin.retired)
+        # running games keep their code
+        self.assertIs(previous.Model, previous.Controller.__init__.__globals__["Model"])
+
+    def test_release_retired(self):
+        """
+        A previous version is torn down once no running game uses it.
+        """
+        plugin, previous = self.reload("pendu")
+        running = previous.Controller.__new__(previous.Controller)
+        new = plugin.module.Controller.__new__(plugin.module.Controller)
+        with mock.patch.object(previous, "teardown") as teardown:
+            GameRegistry.release_retired([running, new])
+            self.assertEqual([previous], plugin.retired)
+            teardown.assert_not_called()
+            GameRegistry.release_retired([new])
+            self.assertEqual([], plugin.retired)
+            teardown.assert_called_once_with()
+
+    def test_teardown(self):
+        """
+        Tearing down puissance4 shuts its search pool down.
+        """
+        game = GameRegistry.get("puissance4").load()
+        ai = sys.modules[game.__name__.rsplit(".", 1)[0] + ".ai"]
+        ai.get_pool()
+        GamePlugin.teardown(game)
+        self.assertIsNone(ai.pool)
+
+    def test_reload_error(self):
+        plugin = GameRegistry.get("pendu")
+        previous = plugin.load()
+        modules = {key: module for key, module in sys.modules.items() if key.startswith("game.pendu")}
+        with mock.patch("game.registry.importlib.import_module", side_effect=SyntaxError("invalid syntax")):
+            with self.assertRaises(SyntaxError):
+                plugin.reload()
+        self.assertIs(previous, plugin.module)
+        self.assertEqual([], plugin.retired)
+        for key, module in modules.items():
+            self.assertIs(module, sys.modules[key])
+
+    def test_running_ai_game(self):
+        """
+        A game against the bot started before the reload can still play.
+        """
+        game = GameRegistry.get("puissance4").load()
+        controller = game.Controller(None, None, game.View(ConsoleUI()), ai_player=0)
+        self.reload("puissance4")
+        column = asyncio.run(controller.play_ai())
+        self.assertTrue(controller.model.can_play(column))
@@ -2,22 +2,122 @@ from utils import tools
 import logging
 logger = logging.getLogger(__name__)
 
-import discord, configparser, traceback
+import asyncio, discord, configparser, os, sys
 from discord.ext import commands
+from interface.channels import ChannelNames
+from interface.errors import ErrorReporter
 from utils.language import MessageNLS
 from utils.language_resources.MessageLiterals import MessageLiterals
 from utils.tools import Constant
 
 
+def get_games_intents():
+    """
+    Minimal intents to play games: guilds (channels), messages and reactions.
+    """
+    intents = discord.Intents.none()
+    intents.guilds = True
+    intents.messages = True
+    intents.message_content = True
+    intents.reactions = True
+    return intents
+
+# map cache profile name to the options of the discord client
+CACHE_PROFILES = {
+        # every event, every member, presence and message cached
+        "full": lambda: {"intents": discord.Intents.all()},
+        # no member nor message cache, no member chunking at startup
+        "games": lambda: {"intents": get_games_intents(),
+                "member_cache_flags": discord.MemberCacheFlags.none(),
+                "chunk_guilds_at_startup": False,
+                "max_messages": None}
+}
+
+
+class Settings:
+    """
+    Settings of a profile section of the configuration file.
+    A Settings object is never modified: on reload, the bot swaps it for a new
+    one, so that readers get consistent values without lock.
+    """
+    __slots__ = ("command_prefix", "token", "error_channel", "target_channel",
+            "game_ttl", "metrics_port", "cache_profile", "admins")
+    RESTART_REQUIRED = ("token", "metrics_port", "cache_profile") # only used at startup
+
+    def __init__(self, **values):
+        for name in Settings.__slots__:
+            setattr(self, name, values[name])
+
+    @staticmethod
+    def read(config_path, profil_section):
+        """
+        Return the settings of the profile section of the configuration file.
+
+        @raise  Exception   on missing or invalid settings.
+        """
+        config = configparser.ConfigParser(default_section="DEFAULT",
+                inline_comment_prefixes=('#'), # to enable comments in lines
+                allow_no_value=True,
+                empty_lines_in_values=False)
+        config.read(config_path)
+        values = dict()
+
+        # Mandatory attributes
+        values["command_prefix"] = config.get(profil_section, "prefix_command")
+        values["token"] = config.get(profil_section, "token")
+
+        # Optional attributes
+        values["error_channel"] = config.getint(profil_section, "error_channel", fallback=None)
+        values["target_channel"] = config.getint(profil_section, "target_channel", fallback=None)
+        values["game_ttl"] = config.getint(profil_section, "game_ttl", fallback=None) or tools.Constant.GAME_TTL
+        values["metrics_port"] = config.getint(profil_section, "metrics_port", fallback=None)
+        values["cache_profile"] = config.get(profil_section, "cache_profile", fallback=None) or "full"
+        if values["cache_profile"] not in CACHE_PROFILES:
+            raise ValueError(f"Unknown cache profile '{values['cache_profile']}'.")
+
+        # Admins section
+        admins = set()
+        for admin_id, no_value in config["ADMINS"].items():
+            if no_value is None:
+                try:
+                    admins.add(int(admin_id))
+                except ValueError:
+                    logger.warning("Non expected non-integer value in ADMINDS section.")
+        values["admins"] = frozenset(admins)
+        return Settings(**values)
+
+    def replace(self, **values):
+        """
+        Return a copy of the settings, with the provided values changed.
+        """
+        return Settings(**{name: values.get(name, getattr(self, name)) for name in Settings.__slots__})
+
+    def diff(self, other):
+        """
+        Return the names of the settings with a different value in other.
+        """
+        return [name for name in Settings.__slots__ if getattr(self, name) != getattr(other, name)]
+
+
 class DiscordBot(commands.Bot):
     """
     A bot class to be able to interact with discord API.
+
+    Settings are read from the configuration file, and read again when the file
+    changes (or on `reload_config`), without reconnecting.
     """
-    def __init__(self, config_path, config_context):
+    def __init__(self, config_path, config_context, **options):
+        """
+        @param  options     Optional. Forwarded to discord client (e.g. shards).
+        """
         logger.log(tools.Constant.VERBOSE, "__init__(%s, %s)", config_path, config_context)
+        self.config_path = config_path
+        self.config_context = config_context
         self.read_config(config_path, config_context)
-        super().__init__(command_prefix=self.command_prefix, intents=discord.Intents.all())
+        super().__init__(command_prefix=self.command_prefix, **CACHE_PROFILES[self.cache_profile](), **options)
         self.error_count = 0
+        self.channel_names = ChannelNames() # labels of channels, for logs and reports
+        self.error_reporter = ErrorReporter() # enabled on ready, with error_channel
 
     # config init
 
@@ -26,34 +126,72 @@ class DiscordBot(commands.Bot):
         Initialise bot with settings from configuration file.
         """
         try:
-            config = configparser.ConfigParser(default_section="DEFAULT",
-                    inline_comment_prefixes=('#'), # to enable comments in lines
-                    allow_no_value=True,
-                    empty_lines_in_values=False)
-            config.read(config_path)
-
-            # Mandatory attributes
-            self.command_prefix = config.get(profil_section, "prefix_command")
-            self.token = config.get(profil_section, "token")
-
-            # Optional attributes
-            self.error_channel = config.getint(profil_section, "error_channel", fallback=None)
-            self.target_channel = config.getint(profil_section, "target_channel", fallback=None)
-
-            # Admins section
-            self.admins = set()
-            admins = config["ADMINS"]
-            for admin_id, no_value in admins.items():
-                if no_value is None:
-                    try:
-                        admin = int(admin_id)
-                        self.admins.add(admin)
-                    except ValueError:
-                        logger.warning("Non expected non-integer value in ADMINDS section.")
+            self.apply_settings(Settings.read(config_path, profil_section))
         except:
             logger.error("Cannot read properly config file.")
             raise
 
+    def apply_settings(self, settings):
+        """
+        Swap the settings of the bot. Channels are resolved once the bot is ready.
+        """
+        self.settings = settings
+        self.command_prefix = settings.command_prefix
+        self.error_channel = settings.error_channel
+        self.target_channel = settings.target_channel
+
+    token = property(lambda self: self.settings.token)
+    game_ttl = property(lambda self: self.settings.game_ttl)
+    metrics_port = property(lambda self: self.settings.metrics_port)
+    cache_profile = property(lambda self: self.settings.cache_profile)
+    admins = property(lambda self: self.settings.admins)
+
+    async def reload_config(self):
+        """
+        Read the configuration file again, and swap the settings if they are valid.
+        Settings only used at startup keep their value until restart.
+
+        @return     Names of the changed settings; None if the file is not valid.
+        """
+        try:
+            settings = Settings.read(self.config_path, self.config_context)
+        except Exception:
+            logger.exception("Invalid configuration file: settings are not changed.")
+            return None
+        previous = self.settings
+        for name in Settings.RESTART_REQUIRED:
+            if getattr(settings, name) != getattr(previous, name):
+                logger.warning("Setting '%s' changed: restart required.", name)
+        settings = settings.replace(**{name: getattr(previous, name) for name in Settings.RESTART_REQUIRED})
+        changed = previous.diff(settings)
+        if not changed:
+            return changed
+        self.apply_settings(settings)
+        if self.is_ready():
+            self.resolve_channels()
+            if "command_prefix" in changed:
+                await self.change_presence(activity=discord.Game(self.command_prefix + "help for help"))
+        logger.info("Configuration reloaded: %s changed.", ", ".join(changed))
+        return changed
+
+    async def watch_config(self):
+        """
+        Reload the configuration file when it is modified, until the bot is closed.
+        """
+        modified_time = self.get_config_time()
+        while not self.is_closed():
+            await asyncio.sleep(Constant.CONFIG_WATCH_PERIOD)
+            current_time = self.get_config_time()
+            if current_time != modified_time:
+                modified_time = current_time
+                await self.reload_config()
+
+    def get_config_time(self):
+        try:
+            return os.stat(self.config_path).st_mtime_ns
+        except OSError:
+            return None
+
     # bot connection
 
     def run(self, *args, **kwargs):
@@ -86,30 +224,50 @@ class DiscordBot(commands.Bot):
             if self.error_count > 0:
                 logger.error("%s errors occured during session.", self.error_count)
 
+    async def setup_hook(self):
+        self.config_task = asyncio.create_task(self.watch_config())
+
     async def on_ready(self):
         """
         Set help message as activity.
         Initialise channels.
         """
-        # Set channels
-        if self.error_channel is not None:
+        self.resolve_channels()
+
+        # Set help message
+        helpMessage = discord.Game(self.command_prefix + "help for help")
+        await self.change_presence(activity=helpMessage)
+
+        logger.info("%s has connected to Discord!", self.user.name)
+        self.log_cache_sizes()
+
+    def resolve_channels(self):
+        """
+        Get the channels of the channel ids from settings.
+        """
+        self.error_channel = None
+        if self.settings.error_channel is not None:
             try:
-                self.error_channel = self.get_channel(self.error_channel)
+                self.error_channel = self.get_channel(self.settings.error_channel)
             except:
-                self.error_channel = None
                 logger.exception("Fail to get channel for error logs.")
-        if self.target_channel is not None:
+        self.error_reporter.channel = self.error_channel
+        self.target_channel = None
+        if self.settings.target_channel is not None:
             try:
-                self.target_channel = self.get_channel(self.target_channel)
+                self.target_channel = self.get_channel(self.settings.target_channel)
             except:
-                self.target_channel = None
                 logger.exception("Fail to get target_channel.")
 
-        # Set help message
-        helpMessage = discord.Game(self.command_prefix + "help for help")
-        await self.change_presence(activity=helpMessage)
-
-        logger.info("%s has connected to Discord!", self.user.name)
+    def log_cache_sizes(self):
+        """
+        Log the size of the discord client caches, set by the cache profile.
+        """
+        logger.info("Cache profile '%s': %s guilds, %s channels, %s members, %s users, %s messages.",
+                self.cache_profile, len(self.guilds),
+                sum(len(guild.channels) for guild in self.guilds),
+                sum(len(guild.members) for guild in self.guilds),
+                len(self.users), len(self.cached_messages))
 
     # bot events
 
@@ -124,42 +282,41 @@ class DiscordBot(commands.Bot):
 
     def log_input_message(self, message):
         if logger.isEnabledFor(Constant.VERBOSE):
-            UNKNOWN = "unknown"
-            context = None
-            if isinstance(message.channel, discord.DMChannel):
-                if message.channel.recipient is not None:
-                    context = "PRIV/" + message.channel.recipient.display_name
-            elif isinstance(message.channel, discord.GroupChannel):
-                if message.channel.name is not None:
-                    context = "PRIV/" + message.channel.name
-                else:
-                    context = "GROUP/<" + str(len(message.channel.recipients)) + " pers.>"
-            elif isinstance(message.channel, discord.TextChannel):
-                context = message.channel.guild.name
-                if message.channel.category is not None:
-                    context += "/" + message.channel.category.name
-                context += "/" + message.channel.name
-            else:
-                context = UNKNOWN
             logger.log(Constant.VERBOSE, "(%s <%s>) [%s <%s>] %s:%s%s",
-                    context, message.channel.id,
+                    self.channel_names.get(message.channel), message.channel.id,
                     message.author.display_name, message.author.id,
                     message.id,
                     '\n' if '\n' in message.content else ' ', message.content)
 
+    async def on_guild_channel_update(self, before, after):
+        self.channel_names.invalidate(after)
+
+    async def on_guild_channel_delete(self, channel):
+        self.channel_names.invalidate(channel)
+
+    async def on_thread_update(self, before, after):
+        self.channel_names.invalidate(after)
+
+    async def on_thread_delete(self, thread):
+        self.channel_names.invalidate(thread)
+
+    async def on_guild_update(self, before, after):
+        self.channel_names.invalidate_guild(after)
+
+    async def on_guild_remove(self, guild):
+        self.channel_names.invalidate_guild(guild)
+
     async def on_raw_reaction_add(self, payload):
         """
         When this method is overriden, it should call at the beginning with
         `super().on_raw_reaction_add(payload)`
         """
-        logger.log(Constant.VERBOSE, "Reaction %s detected <%s>.".format(payload.emoji.name, payload.emoji.name.encode("ascii", 'backslashreplace')))
-        await super().on_raw_reaction_add(payload)
+        logger.log(Constant.VERBOSE, "Reaction %s detected <%s>.", payload.emoji.name, payload.emoji.name.encode("ascii", 'backslashreplace'))
 
     async def on_error(self, event, *args, **kwargs):
         self.error_count += 1
         logger.exception("Catched an error in %s:", event)
-        if self.error_channel:
-            await self.error_channel.send("```\n" + traceback.format_exc() + "\n```")
+        self.error_reporter.report(event, sys.exc_info())
 
     async def on_command_error(self, ctx, error):
         """
@@ -174,4 +331,4 @@ class DiscordBot(commands.Bot):
             raise error
 
     def is_admin(self, user_id):
-        return user_id in self.admins
+        return user_id in self.settings.admins
@@ -0,0 +1,93 @@
+"""
+Human readable names of discord channels, cached by channel id.
+Used to give context to logs, error reports and metrics.
+"""
+from utils import tools
+import logging
+logger = logging.getLogger(__name__)
+
+import discord
+from collections import OrderedDict
+from utils.tools import Constant
+
+
+class ChannelNames:
+    """
+    Cache of channel labels, e.g. "guild/category/channel" or "PRIV/user".
+
+    Labels are computed once per channel. The bot must invalidate them when a
+    channel or a guild is updated or deleted. The least recently used labels
+    are dropped above CHANNEL_NAMES_CACHE_SIZE.
+    """
+    __slots__ = ("labels", "guild_channels", "threads")
+
+    UNKNOWN = "unknown"
+
+    def __init__(self):
+        self.labels = OrderedDict()     # map channel id to its label
+        self.guild_channels = dict()    # map guild id to the ids of its cached channels
+        self.threads = dict()           # map channel id to the ids of its cached threads
+
+    def __len__(self):
+        return len(self.labels)
+
+    def get(self, channel):
+        """
+        Return the label of the channel.
+        """
+        label = self.labels.get(channel.id)
+        if label is not None:
+            self.labels.move_to_end(channel.id)
+            return label
+        label = ChannelNames.build_label(channel)
+        self.labels[channel.id] = label
+        guild = getattr(channel, "guild", None)
+        if guild is not None:
+            self.guild_channels.setdefault(guild.id, set()).add(channel.id)
+        if isinstance(channel, discord.Thread) and channel.parent is not None:
+            self.threads.setdefault(channel.parent.id, set()).add(channel.id) # labelled with their parent
+        if len(self.labels) > Constant.CHANNEL_NAMES_CACHE_SIZE:
+            self.labels.popitem(last=False) # ids left in guild_channels and threads are harmless
+        return label
+
+    def invalidate(self, channel):
+        """
+        Forget the label of an updated or deleted channel.
+        A category also invalidates the channels of its guild, and a channel
+        the threads it contains.
+        """
+        if isinstance(channel, discord.CategoryChannel):
+            self.invalidate_guild(channel.guild)
+        else:
+            self.labels.pop(channel.id, None)
+            for thread_id in self.threads.pop(channel.id, ()):
+                self.labels.pop(thread_id, None)
+
+    def invalidate_guild(self, guild):
+        """
+        Forget the labels of all channels of an updated or removed guild.
+        """
+        for channel_id in self.guild_channels.pop(guild.id, ()):
+            self.labels.pop(channel_id, None)
+            self.threads.pop(channel_id, None)
+
+    @staticmethod
+    def build_label(channel):
+        if isinstance(channel, discord.DMChannel):
+            if channel.recipient is not None:
+                return "PRIV/" + channel.recipient.display_name
+        elif isinstance(channel, discord.GroupChannel):
+            if channel.name is not None:
+                return "PRIV/" + channel.name
+            return "GROUP/<" + str(len(channel.recipients)) + " pers.>"
+        elif isinstance(channel, discord.Thread):
+            if channel.parent is not None:
+                return ChannelNames.build_label(channel.parent) + "/" + channel.name
+            return channel.guild.name + "/" + channel.name
+        elif isinstance(channel, discord.TextChannel):
+            parts = [channel.guild.name]
+            if channel.category is not None:
+                parts.append(channel.category.name)
+            parts.append(channel.name)
+            return "/".join(parts)
+        return ChannelNames.UNKNOWN
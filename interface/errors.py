@@ -0,0 +1,136 @@
+"""
+Reporting of errors to the error channel.
+The cost of reporting is bounded whatever the error rate: repeated errors are
+aggregated into periodic digests, the queue of reports is bounded, and a
+circuit breaker stops reporting while the channel cannot be reached.
+"""
+from utils import tools
+import logging
+logger = logging.getLogger(__name__)
+
+import asyncio, traceback
+from collections import deque
+from time import monotonic
+from mvc.ui import Outbox
+from utils.tools import Constant
+
+
+class ErrorReporter:
+    """
+    Aggregate errors by fingerprint (exception type and stack of the traceback).
+
+    The first occurrence of an error is reported with its full traceback.
+    Repeats are counted and reported every ERROR_DIGEST_PERIOD seconds, as
+    one line per error: "×137 in last 60s: ...".
+    """
+    __slots__ = ("channel", "pending", "digests", "task", "failures", "open_until", "dropped")
+
+    def __init__(self, channel=None):
+        self.channel = channel      # None to disable reporting
+        self.pending = deque()      # reports waiting to be sent, up to ERROR_QUEUE_SIZE
+        self.digests = dict()       # map fingerprint to [number of repeats, summary]
+        self.task = None
+        self.failures = 0           # consecutive failed sends
+        self.open_until = 0         # circuit breaker: no send before this time
+        self.dropped = 0            # reports dropped since the last digest
+
+    @staticmethod
+    def fingerprint(exc_info):
+        """
+        Identify an error by its type and where it was raised, not by its message.
+        """
+        exc_type, exc_value, exc_traceback = exc_info
+        frames = tuple((frame.filename, frame.lineno, frame.name) for frame in traceback.extract_tb(exc_traceback))
+        return hash((exc_type, frames))
+
+    @staticmethod
+    def summary(event, exc_info):
+        exc_type, exc_value, exc_traceback = exc_info
+        return "{}: {} (in {})".format(exc_type.__name__, exc_value, event)[:Constant.ERROR_SUMMARY_SIZE]
+
+    def report(self, event, exc_info):
+        """
+        Report an error, from its sys.exc_info().
+        """
+        if self.channel is None or exc_info[0] is None:
+            return
+        fingerprint = ErrorReporter.fingerprint(exc_info)
+        digest = self.digests.get(fingerprint)
+        if digest is not None:
+            digest[0] += 1
+            self.wake()
+            return
+        self.digests[fingerprint] = [0, ErrorReporter.summary(event, exc_info)]
+        text = "".join(traceback.format_exception(*exc_info))
+        self.enqueue("```\n" + text[-(Constant.MESSAGE_MAX_SIZE - 8):] + "\n```")
+
+    def enqueue(self, content):
+        if len(self.pending) >= Constant.ERROR_QUEUE_SIZE:
+            self.dropped += 1
+        else:
+            self.pending.append(content)
+        self.wake()
+
+    # processing
+
+    def wake(self):
+        if self.task is None:
+            self.task = asyncio.create_task(self.process())
+
+    async def process(self):
+        """
+        Send pending reports, then digests every period, while errors occur.
+        """
+        try:
+            while self.pending or self.digests:
+                while self.pending:
+                    await self.post(self.pending.popleft())
+                await asyncio.sleep(Constant.ERROR_DIGEST_PERIOD)
+                self.flush_digests()
+        finally:
+            self.task = None
+
+    def flush_digests(self):
+        """
+        Queue the digest of repeated errors. Errors without repeat are
+        forgotten: their next occurrence is reported with traceback.
+        """
+        lines = []
+        for fingerprint, digest in list(self.digests.items()):
+            if digest[0] == 0:
+                del self.digests[fingerprint]
+            else:
+                lines.append("×{} in last {}s: {}".format(digest[0], Constant.ERROR_DIGEST_PERIOD, digest[1]))
+                digest[0] = 0
+        if self.dropped > 0:
+            lines.append("{} reports dropped.".format(self.dropped))
+            self.dropped = 0
+        content = ""
+        for line in lines:
+            if content and len(content) + 1 + len(line) > Constant.MESSAGE_MAX_SIZE:
+                self.enqueue(content)
+                content = ""
+            content = line if not content else content + "\n" + line
+        if content:
+            self.enqueue(content)
+
+    async def post(self, content):
+        """
+        Send a report, unless the circuit breaker is open.
+        """
+        if monotonic() < self.open_until:
+            self.dropped += 1
+            return
+        try:
+            message = await Outbox.get(self.channel).send(content)
+        except Exception:
+            logger.exception("Cannot send error report.")
+            message = None
+        if message is not None:
+            self.failures = 0
+            return
+        self.failures += 1
+        if self.failures >= Constant.ERROR_BREAKER_THRESHOLD:
+            logger.warning("Error reports disabled for %s sec after %s failures.", Constant.ERROR_BREAKER_COOLDOWN, self.failures)
+            self.open_until = monotonic() + Constant.ERROR_BREAKER_COOLDOWN
+            self.failures = 0
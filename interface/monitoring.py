@@ -0,0 +1,56 @@
+"""
+HTTP endpoint exporting the metrics of the bot, in Prometheus text format.
+"""
+from utils import tools
+import logging
+logger = logging.getLogger(__name__)
+
+import asyncio
+from aiohttp import web
+from time import perf_counter
+from utils.metrics import Metrics
+from utils.tools import Constant
+
+
+class MetricsListener:
+    """
+    Listener of the main orchestrator serving `/metrics` on localhost, and
+    measuring the lag of the event loop.
+    """
+    def __init__(self, port, host="127.0.0.1"):
+        self.port = port
+        self.host = host
+        self.runner = None
+        self.closed = None  # future resolved on close
+
+    async def start(self):
+        application = web.Application()
+        application.router.add_get("/metrics", self.get_metrics)
+        self.runner = web.AppRunner(application, access_log=None)
+        await self.runner.setup()
+        await web.TCPSite(self.runner, self.host, self.port).start()
+        logger.info("Metrics served on http://%s:%s/metrics", self.host, self.port)
+        self.closed = asyncio.get_running_loop().create_future()
+        lag_task = asyncio.create_task(self.measure_lag())
+        try:
+            await self.closed
+        finally:
+            lag_task.cancel()
+            await self.runner.cleanup()
+
+    async def close(self):
+        if self.closed is not None and not self.closed.done():
+            self.closed.set_result(None)
+
+    async def get_metrics(self, request):
+        return web.Response(body=Metrics.render().encode(),
+                headers={"Content-Type": "text/plain; version=0.0.4; charset=utf-8"})
+
+    async def measure_lag(self):
+        """
+        Sleep periodically and measure how late the loop wakes up.
+        """
+        while True:
+            start_time = perf_counter()
+            await asyncio.sleep(Constant.METRICS_LAG_PERIOD)
+            Metrics.observe("bot_event_loop_lag_seconds", max(0., perf_counter() - start_time - Constant.METRICS_LAG_PERIOD))
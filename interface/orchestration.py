@@ -4,16 +4,25 @@ logger = logging.getLogger(__name__)
 logger_thread = logging.getLogger("thread_verbose")
 logger_thread.setLevel(logging.ERROR)
 
-import threading, asyncio
+import threading, asyncio, contextvars, os
+from collections import Counter
+from time import time, perf_counter
 from asyncio.exceptions import CancelledError
 from enum import Enum, auto
 from discord.ext import commands
-from game import pendu # to be able to reference pendu
-from game.pendu import view, controller
+from game.registry import GameRegistry
 from interface.bot import DiscordBot
-from mvc.ui import DiscordUI
-from utils.language import MessageNLS
+from interface.monitoring import MetricsListener
+from interface.reaper import Reaper
+from interface.snapshot import Snapshot
+from mvc.ui import DiscordUI, Outbox
+from utils.language import MessageNLS, LanguageSettings, SUPPORTED_LANG_CODES
 from utils.language_resources.MessageLiterals import MessageLiterals
+from utils.metrics import Metrics
+from utils.startup import Startup
+
+# (metric labels, start time) of the event handled in the current task
+handler_timer = contextvars.ContextVar("handler_timer", default=None)
 
 
 class OrchestratorType(Enum):
@@ -23,10 +32,26 @@ class Orchestrator:
     """
     Main orchestrator.
     """
-    def __init__(self, config_path, config_context):
+    def __init__(self, config_path, config_context, shard_ids=None, shard_count=None, supervisor=None):
+        """
+        @param  shard_ids   Optional. Gateway shards to connect to, in sharded mode.
+        @param  shard_count Optional. Total number of shards, in sharded mode.
+        @param  supervisor  Optional. Connection to the Supervisor process, in sharded mode.
+        """
         self.terminate = False
+        self.terminate_event = None # created in the running loop
+        self.supervisor = supervisor
         self.listeners = []
-        self.listeners.append(DiscordOrchestrator(self, config_path, config_context))
+        if shard_ids is None:
+            self.listeners.append(DiscordOrchestrator(self, config_path, config_context))
+        else:
+            self.listeners.append(ShardedDiscordOrchestrator(self, config_path, config_context, shard_ids, shard_count))
+        if supervisor is not None:
+            self.listeners.append(SupervisorLink(self, supervisor))
+        metrics_port = self.listeners[0].metrics_port
+        if metrics_port is not None:
+            # one port per worker in sharded mode
+            self.listeners.append(MetricsListener(metrics_port + (shard_ids[0] if shard_ids else 0)))
 
     def run(self):
         """
@@ -34,22 +59,25 @@ class Orchestrator:
 
         In case of Ctrl+C, asyncio.run is expected to catch KeyboardInterrupt.
         Others asyncio method will deal with CancelledError.
+        Listeners are then closed in a new loop.
 
-        In case of clean close (from command), we will raise of own
-        KeyboardInterrupt exception to others.
+        In case of clean close (from command), listeners are closed by
+        wait_for_end, and all listeners return.
         """
         try:
             asyncio.run(self.gather_listeners())
         except KeyboardInterrupt:
             logger.warning("Ctrl+C catched.")
-            for orchestrator in self.listeners:
-                asyncio.run(orchestrator.close())
+            asyncio.run(self.shutdown())
 
     async def gather_listeners(self):
         """
-        In case of close command, a KeyboardInterrupt is raised from wait_for_end.
+        A KeyboardInterrupt can still be raised by a listener.
         """
         logger.log(tools.Constant.VERBOSE, "Start all listeners.")
+        self.terminate_event = asyncio.Event()
+        if self.terminate:
+            self.terminate_event.set()
         try:
             await asyncio.gather(*[orchestrator.start() for orchestrator in self.listeners], self.wait_for_end())
         except KeyboardInterrupt:
@@ -57,14 +85,50 @@ class Orchestrator:
             # try/catch in order to consume exception.
             pass
 
+    async def close_all(self):
+        """
+        Stop instruction for the whole bot.
+        In sharded mode, it is forwarded to the supervisor to stop all workers.
+        """
+        if self.supervisor is not None:
+            self.supervisor.send(SupervisorLink.STOP)
+        else:
+            await self.close()
+
+    def forward_reload(self, name):
+        """
+        In sharded mode, forward the reload of a game to the other workers.
+        """
+        if self.supervisor is not None:
+            self.supervisor.send((SupervisorLink.RELOAD, name))
+
     async def close(self):
+        """
+        Signal the stop instruction. Listeners are closed by wait_for_end.
+        """
         self.terminate = True
+        if self.terminate_event is not None:
+            self.terminate_event.set()
 
     async def wait_for_end(self):
-        while not self.terminate:
-            await asyncio.sleep(1)
+        await self.terminate_event.wait()
         logger.debug("Detected stop instruction.")
-        raise KeyboardInterrupt()
+        await self.shutdown()
+
+    async def shutdown(self):
+        """
+        Close all listeners concurrently and report how long each one took.
+        """
+        start_time = time()
+        async def close_listener(orchestrator):
+            listener_start_time = time()
+            try:
+                await orchestrator.close()
+            except Exception:
+                logger.exception("Failed to close %s.", type(orchestrator).__name__)
+            logger.info("%s closed in %.3f sec.", type(orchestrator).__name__, time() - listener_start_time)
+        await asyncio.gather(*[close_listener(orchestrator) for orchestrator in self.listeners])
+        logger.info("Shutdown completed in %.3f sec.", time() - start_time)
 
 
 class DiscordOrchestrator(DiscordBot):
@@ -78,78 +142,398 @@ class DiscordOrchestrator(DiscordBot):
     This instance is connected with a bot account, and will forward events to
     appropriate views.
     Views must be registered with open_new_view().
-    For now, only 1 view can be open per channel.
+    A channel can host one shared view, plus one personal view per player.
     """
-    def __init__(self, main_orchestrator, config_path, config_context):
+    def __init__(self, main_orchestrator, config_path, config_context, **options):
         logger.log(tools.Constant.VERBOSE, "__init__(%s, %s)", config_path, config_context)
-        super().__init__(config_path, config_context)
-        self.all_views = dict() # map channel_id to the view object
+        super().__init__(config_path, config_context, **options)
+        self.snapshot_file = tools.Constant.SNAPSHOT_FILE
+        self.all_views = dict() # map view id (channel_id, player_id) to the view object
+        self.all_controllers = dict() # map view id to the controller of the game, if any
+        self.channel_views = dict() # map channel id to its open views, by view id
+        self.prefilter_counts = Counter() # number of messages stopped at each stage of on_message
+        self.game_tasks = dict() # map running game task to its controller
+        self.snapshot_restored = False
+        self.reaper = Reaper(self.game_ttl) # closes games without activity
+        self.languages = LanguageSettings(tools.Constant.LANGUAGES_FILE)
         self.main_orchestrator = main_orchestrator
+        Metrics.gauge("bot_active_views", lambda: len(self.all_views), "Open and locked game routes.")
+        Metrics.gauge("bot_outbox_depth", Outbox.total_depth, "Messages waiting to be sent.")
 
     async def setup_hook(self):
         """
         Setup bot. Only called once in login().
         """
+        Startup.mark("setup_hook")
+        await super().setup_hook()
         await self.add_cog(Games(self))
         await self.add_cog(Admin(self))
+        self.checkpoint_task = asyncio.create_task(self.checkpoint_snapshot())
+        self.reaper_task = asyncio.create_task(self.reaper.run(self.expire_game))
 
     async def on_ready(self):
         await super().on_ready()
+        if not self.snapshot_restored:
+            Startup.mark("on_ready")
+            self.snapshot_restored = True
+            await self.restore_snapshot()
+            logger.info(Startup.report())
+
+    async def close(self):
+        """
+        Running games get a grace period to finish their turn, then all games
+        are saved in the snapshot before disconnecting.
+        """
+        if not self.is_closed():
+            start_time = time()
+            await self.drain_games(tools.Constant.SHUTDOWN_GRACE_PERIOD)
+            await Outbox.drain(tools.Constant.SHUTDOWN_GRACE_PERIOD)
+            GameRegistry.shutdown()
+            drain_time = time()
+            self.save_snapshot()
+            snapshot_time = time()
+            await super().close()
+            logger.info("Close phases: drain %.3f sec, snapshot %.3f sec, disconnect %.3f sec.",
+                    drain_time - start_time, snapshot_time - drain_time, time() - snapshot_time)
+            logger.info("Messages prefilter: %s", dict(self.prefilter_counts))
+        else:
+            await super().close()
 
     async def close_all(self):
         """
         Forward close instruction to the main orchestrator.
         """
-        await self.main_orchestrator.close()
+        await self.main_orchestrator.close_all()
+
+    async def reload_config(self):
+        """
+        A new game_ttl applies to each game from its next player activity.
+        """
+        changed = await super().reload_config()
+        if changed and "game_ttl" in changed:
+            self.reaper.ttl = self.game_ttl
+        return changed
 
     # Views management
+    #
+    # A view is registered with its route: (channel_id, player_id).
+    # player_id is None for a game shared by the whole channel, or the user id
+    # for a personal game. Threads are channels: each thread has its own routes.
+
+    def get_route(self, channel_id, author_id):
+        """
+        Return the route of the view expecting messages from the author in the
+        channel, if any. A personal game has priority on the shared game of the channel.
+        """
+        if self.all_views.get((channel_id, author_id)) is not None:
+            return (channel_id, author_id)
+        if self.all_views.get((channel_id, None)) is not None:
+            return (channel_id, None)
+        return None
 
-    def can_open_new_view(self, channel_id):
+    def get_route_view(self, channel_id, author_id):
         """
-        Return True if the provided channel id is available for a new view.
+        Return the view expecting messages from the author in the channel, if any.
+        """
+        return self.all_views.get(self.get_route(channel_id, author_id))
+
+    def can_open_new_view(self, view_id):
+        """
+        Return True if the provided view id (route) is available for a new view.
         False otherwise.
         """
-        return channel_id not in self.all_views
+        return view_id not in self.all_views
 
-    def lock_new_view(self, channel_id):
+    def lock_new_view(self, view_id):
         """
-        Lock the channel id to prevent from initialising multiple views,
+        Lock the view id to prevent from initialising multiple views,
         due to asynchronism.
-        The channel id must be available.
+        The view id must be available.
+
+        @param  view_id     The view id must be available.
+        @raise  AssertionError  If the view id is not available.
+        """
+        assert self.can_open_new_view(view_id)
+        self.all_views[view_id] = None
+
+    def open_new_view(self, view_id, view, controller=None):
+        """
+        Register the view with its associated view id.
+        The view id must be locked.
+
+        @param  controller  Optional. Controller of the game, to be saved in snapshots.
+        @raise  AssertionError  If the view id is not locked.
+        """
+        assert view_id in self.all_views, "View id must be previously locked."
+        assert self.all_views[view_id] is None, "View id is already open."
+        self.all_views[view_id] = view
+        self.channel_views.setdefault(view_id[0], dict())[view_id] = view
+        if controller is not None:
+            self.all_controllers[view_id] = controller
+        self.reaper.touch(view_id)
+
+    def close_view(self, view_id):
+        """
+        Unregister the view id.
+        Events for this view id will not be forward anymore.
+        """
+        self.all_views.pop(view_id)
+        self.all_controllers.pop(view_id, None)
+        views = self.channel_views.get(view_id[0])
+        if views is not None:
+            views.pop(view_id, None)
+            if not views:
+                del self.channel_views[view_id[0]]
+        self.reaper.forget(view_id)
+
+    # Games lifecycle
+
+    def start_game(self, controller):
+        """
+        Run the game loop in a dedicated task.
+
+        @return     The task, to be awaited for the end of the game.
+        """
+        self.stop_handler_timer() # the command is done once its game is started
+        task = asyncio.create_task(controller.loop())
+        self.game_tasks[task] = controller
+        task.add_done_callback(self.on_game_done)
+        Metrics.inc("bot_games_started_total", (("game", GameRegistry.get_name(controller)),))
+        return task
+
+    def on_game_done(self, task):
+        controller = self.game_tasks.pop(task)
+        if not task.cancelled() and task.exception() is None:
+            Metrics.inc("bot_games_finished_total", (("game", GameRegistry.get_name(controller)),))
+        GameRegistry.release_retired(self.game_tasks.values()) # previous versions of reloaded games
+
+    async def expire_game(self, view_id):
+        """
+        Close a game without player activity for longer than the ttl: its task
+        is cancelled, the players are notified, and the route is released.
+        """
+        view = self.all_views.get(view_id)
+        if view is None:
+            return
+        controller = self.all_controllers.get(view_id)
+        self.close_view(view_id)
+        for task, task_controller in list(self.game_tasks.items()):
+            if task_controller is controller:
+                task.cancel()
+        logger.info("Game of route %s closed after %s sec without activity.", view_id, self.reaper.ttl)
+        self.use_channel_language(self.get_channel(view_id[0]))
+        await view.ui.send(MessageNLS.get_message(MessageLiterals.GAME_TIMEOUT))
 
-        @param  channel_id  The channel id must be available.
-        @raise  AssertionError  If the channel is not available.
+    async def drain_games(self, grace_period):
         """
-        assert self.can_open_new_view(channel_id)
-        self.all_views[channel_id] = None
+        Wait for games that are processing a turn, up to the grace period.
+        Games waiting for a player answer are not waited: they will be restored
+        from snapshot.
+        """
+        busy = [task for task, controller in self.game_tasks.items()
+                if not task.done() and controller.get_main_view().callback is None]
+        if busy:
+            logger.info("Waiting for %s games to finish their turn.", len(busy))
+            done, pending = await asyncio.wait(busy, timeout=grace_period)
+            if pending:
+                logger.warning("%s games did not finish their turn in time.", len(pending))
+
+    # Snapshot of games
 
-    def open_new_view(self, channel_id, view):
+    def save_snapshot(self):
         """
-        Register the view with its associated channel id.
-        The channel id must be locked.
+        Save all active games in the snapshot file.
+        """
+        try:
+            Snapshot.save(self.snapshot_file, self.all_controllers)
+        except OSError:
+            logger.exception("Cannot save snapshot of games.")
 
-        @raise  AssertionError  If the channel id is not locked.
+    async def restore_snapshot(self):
         """
-        assert channel_id in self.all_views, "Channel must be previously locked."
-        assert self.all_views[channel_id] is None, "Channel is already open."
-        self.all_views[channel_id] = view
+        Restart all games from the snapshot file, in their channels.
+        The snapshot is read in a thread, as it loads the games.
+        """
+        nb_games = 0
+        for view_id, controller_class, view_class, model in await asyncio.to_thread(Snapshot.load, self.snapshot_file):
+            channel_id, player_id = view_id
+            channel = self.get_channel(channel_id)
+            if channel is None or not self.can_open_new_view(view_id):
+                logger.warning("Cannot restore game in channel %s.", channel_id)
+                continue
+            self.lock_new_view(view_id)
+            self.use_channel_language(channel)
+            view = view_class(DiscordUI(channel, player_id))
+            controller = controller_class(self, None, view, model=model)
+            self.open_new_view(view_id, view, controller)
+            self.start_game(controller)
+            nb_games += 1
+        if nb_games > 0:
+            logger.info("%s games restored from snapshot.", nb_games)
 
-    def close_view(self, channel_id):
+    async def checkpoint_snapshot(self):
         """
-        Unregister the channel id.
-        Events for this channel id will not be forward anymore.
+        Periodically save active games, until the bot is closed.
         """
-        self.all_views.pop(channel_id)
+        while not self.is_closed():
+            await asyncio.sleep(tools.Constant.SNAPSHOT_PERIOD)
+            self.save_snapshot()
+
+    # Games reload
+
+    async def reload_game(self, name):
+        """
+        Reload a game from its files, and register again the game commands.
+        New games use the new code, while running games finish on the previous one.
+
+        @return     Number of running games left on the previous code.
+        @raise  KeyError    on unknown game.
+        @raise  Exception   raised by the import of the new code.
+        """
+        plugin = GameRegistry.get(name)
+        await asyncio.to_thread(plugin.reload)
+        plugin.release_retired(self.game_tasks.values())
+        await self.remove_cog(Games.__cog_name__)
+        await self.add_cog(Games(self))
+        nb_games = sum(1 for controller in self.game_tasks.values() if GameRegistry.get_name(controller) == name)
+        logger.info("Game '%s' reloaded. %s running games on the previous code.", name, nb_games)
+        return nb_games
+
+    # Languages
+
+    def use_channel_language(self, channel):
+        """
+        Use the language set for the channel, or its guild, in the current task.
+        Games started from this task inherit the language.
+        """
+        guild = getattr(channel, "guild", None)
+        MessageNLS.use_language(None if channel is None else self.languages.resolve(channel.id, guild.id if guild is not None else None))
 
     # Event forwarding
 
+    def start_handler_timer(self, labels):
+        handler_timer.set((labels, perf_counter()))
+
+    def stop_handler_timer(self):
+        """
+        Record the latency of the event handled by the current task, once.
+        """
+        timer = handler_timer.get()
+        if timer is not None:
+            handler_timer.set(None)
+            labels, start_time = timer
+            Metrics.observe("bot_handler_latency_seconds", perf_counter() - start_time, labels)
+
+    async def invoke(self, ctx):
+        """
+        Measure the latency of commands, instead of the message holding them.
+        A game command is measured up to the start of its game.
+        """
+        self.start_handler_timer((("event", "command"), ("command", ctx.command.qualified_name if ctx.command is not None else "")))
+        try:
+            await super().invoke(ctx)
+        finally:
+            self.stop_handler_timer()
+
+    async def on_raw_reaction_add(self, payload):
+        self.start_handler_timer((("event", "on_raw_reaction_add"),))
+        try:
+            await super().on_raw_reaction_add(payload)
+        finally:
+            self.stop_handler_timer()
+
     async def on_message(self, message):
+        self.start_handler_timer((("event", "on_message"),))
+        self.use_channel_language(message.channel)
+        try:
+            await self.forward_message(message)
+        finally:
+            self.stop_handler_timer()
+
+    async def forward_message(self, message):
         """
         Forward on_message event.
+
+        Messages are prefiltered in constant time: only prefixed messages from
+        users go through commands processing, and only messages routed to an
+        open view are forwarded. Others are dropped without logging.
+        Each stage is counted in prefilter_counts.
+        Every message is shown to the uis of the channel, as it scrolls their board.
         """
-        await super().on_message(message)
-        if message.channel.id in self.all_views:
-            await self.all_views[message.channel.id].on_message(message)
+        for view in self.channel_views.get(message.channel.id, dict()).values():
+            view.ui.on_message(message)
+        route = self.get_route(message.channel.id, message.author.id)
+        view = self.all_views.get(route)
+        if not message.author.bot and message.content.startswith(self.command_prefix):
+            self.prefilter_counts["command"] += 1
+            await super().on_message(message)
+        elif view is not None:
+            self.prefilter_counts["view"] += 1
+            self.log_input_message(message)
+        else:
+            self.prefilter_counts["bot" if message.author.bot else "no_prefix"] += 1
+            return
+        if view is not None:
+            if not message.author.bot:
+                self.reaper.touch(route)
+            await view.on_message(message)
+
+class ShardedDiscordOrchestrator(DiscordOrchestrator, commands.AutoShardedBot):
+    """
+    DiscordOrchestrator connected to a subset of the gateway shards.
+    Each instance saves its games in its own snapshot file.
+    """
+    def __init__(self, main_orchestrator, config_path, config_context, shard_ids, shard_count):
+        super().__init__(main_orchestrator, config_path, config_context, shard_ids=shard_ids, shard_count=shard_count)
+        root, extension = os.path.splitext(tools.Constant.SNAPSHOT_FILE)
+        self.snapshot_file = "{}-{}{}".format(root, "-".join(str(shard_id) for shard_id in shard_ids), extension)
+
+class SupervisorLink:
+    """
+    Listener of the connection with the Supervisor process, in sharded mode.
+    The orchestrator is closed on stop instruction, or if the supervisor is gone.
+    Reload instructions are (RELOAD, game name) tuples.
+    """
+    STOP = "stop"
+    RELOAD = "reload"
+
+    def __init__(self, orchestrator, connection):
+        self.orchestrator = orchestrator
+        self.connection = connection
+        self.closed = None  # future resolved on close
+
+    async def start(self):
+        loop = asyncio.get_running_loop()
+        self.closed = loop.create_future()
+        loop.add_reader(self.connection.fileno(), self.on_readable)
+        try:
+            await self.closed
+        finally:
+            loop.remove_reader(self.connection.fileno())
+
+    def on_readable(self):
+        try:
+            message = self.connection.recv()
+        except EOFError:
+            logger.error("Connection with supervisor lost.")
+            asyncio.get_running_loop().remove_reader(self.connection.fileno())
+            message = SupervisorLink.STOP
+        if message == SupervisorLink.STOP:
+            logger.debug("Stop instruction from supervisor.")
+            asyncio.create_task(self.orchestrator.close())
+        elif isinstance(message, tuple) and message[0] == SupervisorLink.RELOAD:
+            logger.debug("Reload instruction of game '%s' from supervisor.", message[1])
+            asyncio.create_task(self.reload_game(message[1]))
+
+    async def reload_game(self, name):
+        try:
+            await self.orchestrator.listeners[0].reload_game(name)
+        except Exception:
+            logger.exception("Cannot reload game '%s'.", name)
+
+    async def close(self):
+        if self.closed is not None and not self.closed.done():
+            self.closed.set_result(None)
 
 class Admin(commands.Cog, name="Administration"):
     """
@@ -174,25 +558,95 @@ class Admin(commands.Cog, name="Administration"):
         """
         await self.bot.close_all()
 
+    @commands.command(name='config')
+    async def config(self, ctx):
+        """
+        Read the configuration file again, without disconnecting.
+        """
+        changed = await self.bot.reload_config()
+        if changed is None:
+            await ctx.send(MessageNLS.get_message(MessageLiterals.CONFIG_INVALID))
+        else:
+            await ctx.send(MessageNLS.get_message(MessageLiterals.CONFIG_RELOADED, ", ".join(changed) or "-"))
+
+    @commands.command(name='reload')
+    async def reload(self, ctx, name):
+        """
+        Reload a game from its files, without disconnecting.
+        Running games finish on the previous version.
+        """
+        try:
+            nb_games = await self.bot.reload_game(name)
+        except KeyError:
+            await ctx.send(MessageNLS.get_message(MessageLiterals.GAME_UNKNOWN, ", ".join(GameRegistry.plugins)))
+            return
+        except Exception as error:
+            logger.exception("Cannot reload game '%s'.", name)
+            await ctx.send(MessageNLS.get_message(MessageLiterals.GAME_RELOAD_FAILED, name, repr(error)))
+            return
+        self.bot.main_orchestrator.forward_reload(name)
+        await ctx.send(MessageNLS.get_message(MessageLiterals.GAME_RELOADED, name, nb_games))
+
+    @commands.command(name='language')
+    async def language(self, ctx, lang_code, scope="channel"):
+        """
+        Set the language of the channel, or of the guild with scope "guild".
+        "default" removes the setting.
+        """
+        lang_code = None if lang_code == "default" else lang_code.lower()
+        try:
+            if scope == "guild" and ctx.guild is not None:
+                self.bot.languages.set_guild(ctx.guild.id, lang_code)
+            else:
+                self.bot.languages.set_channel(ctx.channel.id, lang_code)
+        except AttributeError:
+            await ctx.send(MessageNLS.get_message(MessageLiterals.LANGUAGE_UNSUPPORTED, ", ".join(SUPPORTED_LANG_CODES)))
+            return
+        self.bot.use_channel_language(ctx.channel)
+        await ctx.send(MessageNLS.get_message(MessageLiterals.LANGUAGE_SET, MessageNLS.get_language()))
+
 class Games(commands.Cog, name="Jeux"):
     """
-    Tous les jeux disponibles. 1 seul jeu en cours par salon.
-    All available games. Only 1 game per channel.
+    Tous les jeux disponibles. 1 jeu partagé par salon, puis 1 jeu personnel par joueur.
+    All available games. 1 shared game per channel, then 1 personal game per player.
+
+    One command is declared per game of the registry. The game is imported on
+    its first command.
     """
     def __init__(self, orchestrator):
         self.orchestrator = orchestrator    # Works as if it is the same class
+        self.__cog_commands__ = self.__cog_commands__ + tuple(
+                commands.Command(Games.play_game, name=plugin.name, aliases=list(plugin.aliases),
+                        help=plugin.help, extras={"plugin": plugin})
+                for plugin in GameRegistry.plugins.values())
 
-    @commands.command(name="pendu")
-    async def init_pendu(self, ctx):
+    async def play_game(self, ctx, *args):
         """
-        Devine le mot caché.
-        Guess the hidden word.
+        Start the game of the command, with its optional arguments.
         """
-        if not self.orchestrator.can_open_new_view(ctx.channel.id):
-            pass
-        else:
-            self.orchestrator.lock_new_view(ctx.channel.id)
-            view = pendu.view.View(DiscordUI(ctx.channel))
-            controller = pendu.controller.Controller(self.orchestrator, ctx, view)
-            self.orchestrator.open_new_view(ctx.channel.id, view)
-            await controller.loop()
+        game = await asyncio.to_thread(ctx.command.extras["plugin"].load) # may index words on first call
+        view_id = self.get_view_id(ctx)
+        if view_id is not None:
+            self.orchestrator.lock_new_view(view_id)
+            try:
+                view = game.View(DiscordUI(ctx.channel, view_id[1]))
+                controller = await game.create(self.orchestrator, ctx, view, *args)
+            except Exception:
+                self.orchestrator.close_view(view_id) # release the route
+                raise
+            if controller is None:
+                self.orchestrator.close_view(view_id)
+                return
+            self.orchestrator.open_new_view(view_id, view, controller)
+            await self.orchestrator.start_game(controller)
+
+    def get_view_id(self, ctx):
+        """
+        Return the route of a new game: shared in the channel, or personal if
+        the channel is busy. None if the player already has a game there.
+        """
+        view_id = (ctx.channel.id, None)
+        if not self.orchestrator.can_open_new_view(view_id):
+            # the channel is busy: start a personal game
+            view_id = (ctx.channel.id, ctx.author.id)
+        return view_id if self.orchestrator.can_open_new_view(view_id) else None
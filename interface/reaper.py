@@ -0,0 +1,95 @@
+"""
+Expiry of idle games.
+The Reaper tracks the last activity of each route and reports routes idle for
+longer than the time to live, so that abandoned games release their channel.
+"""
+from utils import tools
+import logging
+logger = logging.getLogger(__name__)
+
+import asyncio, heapq, itertools
+from time import monotonic
+
+
+class Reaper:
+    """
+    Scheduler of route expirations, based on a heap of deadlines.
+
+    Activity only updates the deadline of the route: heap entries are lazily
+    checked when they expire, and pushed again if the route was active since.
+    Touching a route is O(1), expiring one is O(log n).
+    """
+    __slots__ = ("ttl", "deadlines", "heap", "counter", "wakeup")
+
+    def __init__(self, ttl):
+        """
+        @param  ttl     Seconds of inactivity before a route expires.
+        """
+        self.ttl = ttl
+        self.deadlines = dict() # map route to its current deadline
+        self.heap = []          # of (deadline, order, route); may hold outdated deadlines
+        self.counter = itertools.count() # order of entries with the same deadline
+        self.wakeup = None      # event set when an earlier deadline is scheduled
+
+    def __len__(self):
+        return len(self.deadlines)
+
+    def touch(self, route):
+        """
+        Record an activity on the route, and track it if new.
+        """
+        deadline = monotonic() + self.ttl
+        if route not in self.deadlines:
+            self.push(route, deadline)
+        self.deadlines[route] = deadline
+
+    def forget(self, route):
+        """
+        Stop tracking the route. Its heap entry is dropped when it expires.
+        """
+        self.deadlines.pop(route, None)
+
+    def push(self, route, deadline):
+        heapq.heappush(self.heap, (deadline, next(self.counter), route))
+        if self.wakeup is not None and self.heap[0][2] is route:
+            self.wakeup.set()
+
+    def pop_expired(self, now=None):
+        """
+        Return the routes idle for longer than the ttl, and stop tracking them.
+        """
+        now = monotonic() if now is None else now
+        expired = []
+        while self.heap and self.heap[0][0] <= now:
+            deadline, order, route = heapq.heappop(self.heap)
+            current = self.deadlines.get(route)
+            if current is None:
+                continue # forgotten
+            if current > deadline:
+                self.push(route, current) # active since
+            else:
+                del self.deadlines[route]
+                expired.append(route)
+        return expired
+
+    def next_deadline(self):
+        return self.heap[0][0] if self.heap else None
+
+    async def run(self, on_expired):
+        """
+        Call on_expired(route) for each expired route, until cancelled.
+        """
+        self.wakeup = asyncio.Event()
+        while True:
+            deadline = self.next_deadline()
+            timeout = None if deadline is None else max(0, deadline - monotonic())
+            try:
+                await asyncio.wait_for(self.wakeup.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+            self.wakeup.clear()
+            for route in self.pop_expired():
+                try:
+                    await on_expired(route)
+                except Exception:
+                    logger.exception("Failed to expire route %s.", route)
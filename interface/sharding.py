@@ -0,0 +1,147 @@
+"""
+Sharded mode of the bot.
+The Supervisor runs one Orchestrator per worker process, each connected to a
+subset of the discord gateway shards, so that the load is spread over cores.
+"""
+from utils import tools
+import logging
+logger = logging.getLogger(__name__)
+
+import configparser, multiprocessing, time
+from multiprocessing.connection import wait
+from interface.orchestration import Orchestrator, SupervisorLink
+from utils.tools import Constant
+
+
+def run_worker(config_path, config_context, shard_ids, shard_count, connection):
+    """
+    Entry point of a worker process.
+    Each worker writes its own log file.
+    """
+    tools.setup_logging(config_path, "-".join(str(shard_id) for shard_id in shard_ids))
+    logger.info("Worker started for shards %s/%s.", shard_ids, shard_count)
+    Orchestrator(config_path, config_context, shard_ids, shard_count, connection).run()
+
+
+class Supervisor:
+    """
+    Start and watch worker processes.
+
+    Worker i is connected to shards i, i + nb_workers, i + 2*nb_workers...
+    A crashed worker is restarted. A stop instruction from any worker (admin
+    `stop` command) is forwarded to all workers, and a game reload (admin
+    `reload` command) to all other workers.
+    """
+    worker_target = run_worker  # function run by worker processes
+
+    def __init__(self, config_path, config_context, nb_workers, shard_count=None):
+        self.config_path = config_path
+        self.config_context = config_context
+        self.nb_workers = nb_workers
+        self.shard_count = shard_count if shard_count is not None else nb_workers
+        assert self.shard_count >= nb_workers, "Each worker needs at least one shard."
+        self.workers = dict()   # map worker index to (process, connection)
+        self.stopping = False
+        self.context = multiprocessing.get_context("spawn")
+
+    @staticmethod
+    def read_config(config_path, profil_section):
+        """
+        Return (nb_workers, shard_count) from configuration file.
+        Sharded mode is requested when nb_workers > 1.
+        """
+        config = configparser.ConfigParser(default_section="DEFAULT",
+                inline_comment_prefixes=('#'), # to enable comments in lines
+                allow_no_value=True,
+                empty_lines_in_values=False)
+        config.read(config_path)
+        nb_workers = config.get(profil_section, "workers", fallback=None)
+        shard_count = config.get(profil_section, "shard_count", fallback=None)
+        return int(nb_workers) if nb_workers else 1, int(shard_count) if shard_count else None
+
+    def get_shard_ids(self, index):
+        return list(range(index, self.shard_count, self.nb_workers))
+
+    # Lifecycle
+
+    def run(self):
+        """
+        Start all workers and watch them until they all stopped.
+        """
+        for index in range(self.nb_workers):
+            self.start_worker(index)
+        try:
+            while self.workers:
+                self.wait_events()
+        except KeyboardInterrupt:
+            # workers receive Ctrl+C too, and close themselves.
+            logger.warning("Ctrl+C catched.")
+            self.stop()
+            for process, connection in self.workers.values():
+                process.join()
+        logger.info("All workers stopped.")
+
+    def start_worker(self, index):
+        connection, worker_connection = self.context.Pipe()
+        process = self.context.Process(target=type(self).worker_target, name=f"worker-{index}",
+                args=(self.config_path, self.config_context, self.get_shard_ids(index), self.shard_count, worker_connection))
+        process.start()
+        worker_connection.close()
+        self.workers[index] = (process, connection)
+
+    def stop(self):
+        """
+        Forward the stop instruction to all workers.
+        """
+        self.stopping = True
+        for process, connection in self.workers.values():
+            try:
+                connection.send(SupervisorLink.STOP)
+            except OSError:
+                pass # worker already gone
+
+    def forward(self, message, source):
+        """
+        Send the message to all workers but the source.
+        """
+        for index, (process, connection) in self.workers.items():
+            if index != source:
+                try:
+                    connection.send(message)
+                except OSError:
+                    pass # worker already gone
+
+    def wait_events(self):
+        """
+        Wait for a message from a worker or for the end of a worker, and process it.
+        """
+        sources = dict()
+        for index, (process, connection) in self.workers.items():
+            sources[process.sentinel] = (index, False)
+            sources[connection] = (index, True)
+        for ready in wait(list(sources)):
+            index, is_message = sources[ready]
+            if index not in self.workers:
+                continue
+            process, connection = self.workers[index]
+            if is_message:
+                try:
+                    message = connection.recv()
+                except EOFError:
+                    continue # end of the worker is detected by its sentinel
+                if message == SupervisorLink.STOP and not self.stopping:
+                    logger.warning("Stop instruction from worker %s.", index)
+                    self.stop()
+                elif isinstance(message, tuple) and message[0] == SupervisorLink.RELOAD:
+                    logger.info("Reload of game '%s' from worker %s.", message[1], index)
+                    self.forward(message, index)
+            else:
+                process.join()
+                connection.close()
+                del self.workers[index]
+                if self.stopping or process.exitcode == 0:
+                    logger.info("Worker %s stopped.", index)
+                else:
+                    logger.error("Worker %s crashed (exit code %s). Restart in %s sec.", index, process.exitcode, Constant.SHARD_RESTART_DELAY)
+                    time.sleep(Constant.SHARD_RESTART_DELAY)
+                    self.start_worker(index)
@@ -0,0 +1,98 @@
+"""
+Snapshot of in-flight games.
+All active games are serialized into one binary file, so that they can be
+restored after a restart of the bot.
+
+File format (little endian):
+- header: magic number, version, number of games.
+- for each game: channel id, player id (0 for a shared game), game type, size
+  of the payload, then the payload given by the `dump` method of the game model.
+Game types are declared in the game registry. Only the games found in the
+snapshot are imported.
+"""
+from utils import tools
+import logging
+logger = logging.getLogger(__name__)
+
+import os, struct
+from game.registry import GameRegistry
+
+MAGIC = b"BDSN"
+VERSION = 2
+HEADER = struct.Struct("<4sBI")
+RECORD = struct.Struct("<QQBH")
+
+
+class Snapshot:
+    """
+    Save and load active games.
+    """
+    @staticmethod
+    def save(path, controllers):
+        """
+        Write all games in a single file. The previous snapshot is atomically
+        replaced, or removed if there is no game to save.
+
+        @param  controllers     Map of view id (channel_id, player_id) to the controller of the game.
+        @return     Number of saved games.
+        """
+        records = []
+        for (channel_id, player_id), controller in controllers.items():
+            plugin = GameRegistry.get_plugin(controller)
+            if plugin is None:
+                logger.warning("Cannot save game of type %s.", type(controller).__name__)
+                continue
+            payload = controller.model.dump()
+            records.append(RECORD.pack(channel_id, player_id or 0, plugin.game_type, len(payload)))
+            records.append(payload)
+        nb_games = len(records) // 2
+
+        if nb_games == 0:
+            if os.path.exists(path):
+                os.remove(path)
+            return 0
+        temporary_path = path + ".tmp"
+        with open(temporary_path, "wb") as file:
+            file.write(HEADER.pack(MAGIC, VERSION, nb_games))
+            file.write(b"".join(records))
+        os.replace(temporary_path, path)
+        logger.debug("%s games saved in '%s'.", nb_games, path)
+        return nb_games
+
+    @staticmethod
+    def load(path):
+        """
+        Read all games from the snapshot file.
+        Return an empty list if there is no snapshot or if it is not readable.
+        Games that cannot be restored are skipped.
+
+        @return     List of ((channel_id, player_id), controller class, view class, model).
+        """
+        try:
+            with open(path, "rb") as file:
+                data = memoryview(file.read())
+        except FileNotFoundError:
+            return []
+
+        games = []
+        try:
+            magic, version, nb_games = HEADER.unpack_from(data)
+            if magic != MAGIC or version != VERSION:
+                logger.error("Snapshot '%s' has an unsupported format.", path)
+                return []
+            offset = HEADER.size
+            for _ in range(nb_games):
+                channel_id, player_id, game_type, size = RECORD.unpack_from(data, offset)
+                offset += RECORD.size
+                if offset + size > len(data):
+                    raise ValueError("Truncated game record.")
+                try:
+                    game = GameRegistry.get_type(game_type).load()
+                    games.append(((channel_id, player_id or None), game.Controller, game.View, game.Model.load(data[offset:offset + size])))
+                except Exception:
+                    # a game that cannot be restored does not prevent the others
+                    logger.exception("Cannot restore game of type %s in channel %s.", game_type, channel_id)
+                offset += size
+        except (struct.error, ValueError):
+            logger.exception("Snapshot '%s' is corrupted. %s games restored.", path, len(games))
+        return games
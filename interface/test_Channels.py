@@ -0,0 +1,83 @@
+from utils import tools
+import logging
+logger = logging.getLogger(__name__)
+
+import discord
+from unittest.mock import MagicMock
+from interface.channels import ChannelNames
+from test.archi import TestCase
+
+
+def get_text_channel(channel_id, name, guild, category=None):
+    channel = MagicMock(spec=discord.TextChannel)
+    channel.id, channel.name, channel.guild, channel.category = channel_id, name, guild, category
+    return channel
+
+def get_guild(guild_id, name):
+    guild = MagicMock(spec=discord.Guild)
+    guild.id, guild.name = guild_id, name
+    return guild
+
+
+class TestChannelNames(TestCase):
+    def test_labels(self):
+        names = ChannelNames()
+        guild = get_guild(1, "guild")
+        category = MagicMock(spec=discord.CategoryChannel)
+        category.id, category.name, category.guild = 10, "category", guild
+        channel = get_text_channel(11, "general", guild, category)
+        self.assertEqual("guild/category/general", names.get(channel))
+        self.assertEqual("guild/games", names.get(get_text_channel(12, "games", guild)))
+
+        thread = MagicMock(spec=discord.Thread)
+        thread.id, thread.name, thread.guild, thread.parent = 13, "thread", guild, channel
+        self.assertEqual("guild/category/general/thread", names.get(thread))
+
+        private = MagicMock(spec=discord.DMChannel)
+        private.id, private.recipient = 14, MagicMock(display_name="user")
+        self.assertEqual("PRIV/user", names.get(private))
+        self.assertEqual(ChannelNames.UNKNOWN, names.get(MagicMock(id=15)))
+
+    def test_invalidation(self):
+        names = ChannelNames()
+        guild = get_guild(1, "guild")
+        channel = get_text_channel(11, "general", guild)
+        other = get_text_channel(12, "games", guild)
+        names.get(channel), names.get(other)
+
+        channel.name = "renamed"
+        self.assertEqual("guild/general", names.get(channel)) # cached
+        names.invalidate(channel)
+        self.assertEqual("guild/renamed", names.get(channel))
+
+        guild.name = "server"
+        names.invalidate_guild(guild)
+        self.assertEqual(0, len(names))
+        self.assertEqual("server/games", names.get(other))
+
+    def test_thread_invalidation(self):
+        """
+        Renaming a channel also renames its threads.
+        """
+        names = ChannelNames()
+        guild = get_guild(1, "guild")
+        channel = get_text_channel(11, "general", guild)
+        thread = MagicMock(spec=discord.Thread)
+        thread.id, thread.name, thread.guild, thread.parent = 13, "thread", guild, channel
+        self.assertEqual("guild/general/thread", names.get(thread))
+
+        channel.name = "renamed"
+        names.invalidate(channel)
+        self.assertEqual("guild/renamed/thread", names.get(thread))
+
+    def test_size(self):
+        names = ChannelNames()
+        guild = get_guild(1, "guild")
+        size = tools.Constant.CHANNEL_NAMES_CACHE_SIZE
+        tools.Constant.CHANNEL_NAMES_CACHE_SIZE = 2
+        try:
+            for channel_id in range(3):
+                names.get(get_text_channel(channel_id, str(channel_id), guild))
+        finally:
+            tools.Constant.CHANNEL_NAMES_CACHE_SIZE = size
+        self.assertEqual([1, 2], list(names.labels))
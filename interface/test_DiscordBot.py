@@ -2,7 +2,7 @@ from utils import tools
 import logging
 logger = logging.getLogger(__name__)
 
-import asyncio, time
+import asyncio, os, shutil, tempfile, time
 import configparser
 from interface.bot import DiscordBot
 from test.archi import TestCase, DiscordBotForTest
@@ -207,6 +207,70 @@ class TestConfigInit(TestCase):
         bot = DiscordBot("test/resources/config_complet.ini", "TEST")
         bot = DiscordBot("test/resources/config_complet.ini", "PROD")
 
+    def test_cache_profile(self):
+        bot = DiscordBot("test/resources/config_cache.ini", "FULL")
+        self.assertEqual("full", bot.cache_profile)
+        self.assertTrue(bot.intents.members)
+        bot = DiscordBot("test/resources/config_cache.ini", "GAMES")
+        self.assertEqual("games", bot.cache_profile)
+        self.assertFalse(bot.intents.members)
+        self.assertFalse(bot.intents.presences)
+        self.assertTrue(bot.intents.message_content)
+        self.assertTrue(bot.intents.guild_messages)
+        self.assertIsNone(bot._connection.max_messages)
+        self.assertFalse(bot._connection.member_cache_flags.joined)
+
+    def get_config(self):
+        path = os.path.join(tempfile.mkdtemp(), "config.ini")
+        shutil.copy("test/resources/config_cache.ini", path)
+        self.addCleanup(shutil.rmtree, os.path.dirname(path))
+        return path
+
+    def edit_config(self, path, old, new):
+        with open(path) as file:
+            content = file.read()
+        with open(path, "w") as file:
+            file.write(content.replace(old, new))
+
+    def test_reload_config(self):
+        path = self.get_config()
+        bot = DiscordBot(path, "GAMES")
+        settings = bot.settings
+        self.assertTrue(bot.is_admin(666))
+        self.assertEqual([], asyncio.run(bot.reload_config()))
+        self.assertIs(settings, bot.settings)
+
+        self.edit_config(path, "666", "777")
+        self.edit_config(path, "prefix_command = .", "prefix_command = !")
+        self.edit_config(path, "cache_profile = games", "cache_profile = full")
+        self.assertEqual(["command_prefix", "admins"], asyncio.run(bot.reload_config()))
+        self.assertFalse(bot.is_admin(666))
+        self.assertTrue(bot.is_admin(777))
+        self.assertEqual("!", bot.command_prefix)
+        self.assertEqual("games", bot.cache_profile) # restart required
+        self.assertEqual(".", settings.command_prefix) # previous settings unchanged
+
+        self.edit_config(path, "cache_profile = full", "cache_profile = unknown")
+        settings = bot.settings
+        self.assertIsNone(asyncio.run(bot.reload_config()))
+        self.assertIs(settings, bot.settings)
+
+    def test_watch_config(self):
+        path = self.get_config()
+        bot = DiscordBot(path, "GAMES")
+        period = tools.Constant.CONFIG_WATCH_PERIOD
+        tools.Constant.CONFIG_WATCH_PERIOD = .01
+        self.addCleanup(setattr, tools.Constant, "CONFIG_WATCH_PERIOD", period)
+        async def main():
+            task = asyncio.create_task(bot.watch_config())
+            await asyncio.sleep(.05)
+            self.edit_config(path, "666", "777")
+            os.utime(path, ns=(time.time_ns() + 10**9, time.time_ns() + 10**9))
+            await asyncio.sleep(.05)
+            task.cancel()
+        asyncio.run(main())
+        self.assertTrue(bot.is_admin(777))
+
     @TestCase.connected()
     def test_error_channel(self):
         """
@@ -0,0 +1,105 @@
+from utils import tools
+import logging
+logger = logging.getLogger(__name__)
+
+import asyncio, sys
+from interface.errors import ErrorReporter
+from mvc.test_UI import ChannelForTest
+from mvc.ui import Outbox
+from test.archi import TestCase
+from utils.tools import Constant
+
+
+class FailingChannelForTest(ChannelForTest):
+    async def send(self, content):
+        raise ConnectionError()
+
+
+def raise_error(value):
+    raise ValueError(value)
+
+def get_exc_info(value=0):
+    try:
+        raise_error(value)
+    except ValueError:
+        return sys.exc_info()
+
+
+class TestErrorReporter(TestCase):
+    def setUp(self):
+        period = Constant.ERROR_DIGEST_PERIOD
+        Constant.ERROR_DIGEST_PERIOD = .2
+        self.addCleanup(setattr, Constant, "ERROR_DIGEST_PERIOD", period)
+        self.addCleanup(Outbox.instances.clear)
+
+    def test_fingerprint(self):
+        """
+        Errors raised at the same place are the same error, whatever the message.
+        """
+        self.assertEqual(ErrorReporter.fingerprint(get_exc_info(1)), ErrorReporter.fingerprint(get_exc_info(2)))
+        try:
+            raise_error(3)
+        except ValueError:
+            self.assertNotEqual(ErrorReporter.fingerprint(get_exc_info(1)), ErrorReporter.fingerprint(sys.exc_info()))
+
+    def test_digest(self):
+        """
+        An error storm is reported as one traceback and one digest.
+        """
+        channel = ChannelForTest()
+        reporter = ErrorReporter(channel)
+        async def main():
+            for value in range(137):
+                reporter.report("on_message", get_exc_info(value))
+            await asyncio.sleep(.3)
+            self.assertEqual(2, len(channel.sends))
+            await reporter.task
+        asyncio.run(main())
+        self.assertIn("Traceback", channel.sends[0])
+        self.assertIn("ValueError: 0", channel.sends[0])
+        self.assertTrue(channel.sends[1].startswith("×136 in last 0.2s: ValueError: 0 (in on_message)"), channel.sends[1])
+        self.assertEqual(2, len(channel.sends))
+        self.assertEqual({}, reporter.digests)
+
+    def test_bounded_queue(self):
+        channel = ChannelForTest()
+        reporter = ErrorReporter(channel)
+        async def main():
+            for value in range(Constant.ERROR_QUEUE_SIZE + 5):
+                exec(f"def f{value}(): raise_error({value})", globals())
+                try:
+                    globals()[f"f{value}"]()
+                except ValueError:
+                    reporter.report("on_message", sys.exc_info())
+            self.assertEqual(Constant.ERROR_QUEUE_SIZE, len(reporter.pending))
+            self.assertEqual(5, reporter.dropped)
+            reporter.task.cancel()
+        asyncio.run(main())
+        reporter.pending.clear()
+        reporter.flush_digests()
+        self.assertEqual(["5 reports dropped."], list(reporter.pending))
+
+    def test_circuit_breaker(self):
+        """
+        Reports are dropped without send while the channel fails.
+        """
+        channel = FailingChannelForTest(2)
+        reporter = ErrorReporter(channel)
+        async def main():
+            for value in range(Constant.ERROR_BREAKER_THRESHOLD + 2):
+                exec(f"def g{value}(): raise_error({value})", globals())
+                try:
+                    globals()[f"g{value}"]()
+                except ValueError:
+                    reporter.report("on_message", sys.exc_info())
+            await asyncio.sleep(.1)
+            self.assertGreater(reporter.open_until, 0)
+            self.assertEqual(2, reporter.dropped)
+            reporter.task.cancel()
+        asyncio.run(main())
+
+    def test_disabled(self):
+        reporter = ErrorReporter()
+        reporter.report("on_message", get_exc_info())
+        self.assertIsNone(reporter.task)
+        self.assertEqual({}, reporter.digests)
@@ -2,7 +2,17 @@ from utils import tools
 import logging
 logger = logging.getLogger(__name__)
 
-import asyncio, time
+import aiohttp, asyncio, time
+from types import SimpleNamespace
+from game.pendu.controller import Controller
+from game.pendu.view import View
+from interface.monitoring import MetricsListener
+from game.registry import GamePlugin
+from interface.orchestration import Orchestrator, DiscordOrchestrator, Games
+from mvc.ui import ConsoleUI
+from utils.language import MessageNLS
+from utils.language_resources.MessageLiterals import MessageLiterals
+from utils.metrics import Metrics
 from test.archi import TestCase, DiscordBotForTest, OrchestratorForTest
 
 
@@ -149,6 +159,31 @@ class TestOrchestratorClose(TestCase):
         orch.run()
         self.assertTrue(bot.is_closed())
 
+    def test_shutdown_parallel(self):
+        """
+        The stop instruction is detected immediately and listeners are closed concurrently.
+        """
+        class Listener:
+            def __init__(self):
+                self.closed = False
+            async def start(self):
+                while not self.closed:
+                    await asyncio.sleep(.1)
+            async def close(self):
+                await asyncio.sleep(1)
+                self.closed = True
+        orch = Orchestrator("test/resources/config_complet.ini", "TEST")
+        orch.listeners = [Listener(), Listener(), Listener()]
+        async def stop():
+            await asyncio.sleep(.5)
+            await orch.close()
+        async def main():
+            await asyncio.gather(orch.gather_listeners(), stop())
+        t = time.time()
+        asyncio.run(main())
+        self.assertIncertitude(time.time() - t, 1.5, .05) # closed in parallel, right after the stop
+        self.assertTrue(all(listener.closed for listener in orch.listeners))
+
     @TestCase.interactive()
     def test_input_interrupt(self):
         """
@@ -361,3 +396,196 @@ class TestAsyncThreadLifecycle(TestCase):
         with self.assertTime(1):
             asyncio.run(gather())
             logger.debug("Reached.")
+
+class OrchestratorForRouting(DiscordOrchestrator):
+    """
+    Offline orchestrator recording processed commands.
+    """
+    def __init__(self):
+        super().__init__(None, "test/resources/config_complet.ini", "TEST")
+        self.processed = []
+
+    async def process_commands(self, message):
+        self.processed.append(message.content)
+
+class ViewForRouting:
+    def __init__(self):
+        self.received = []
+        self.ui = SimpleNamespace(seen=[])
+        self.ui.on_message = lambda message: self.ui.seen.append(message.content)
+
+    async def on_message(self, message):
+        self.received.append(message.content)
+
+def get_message(channel_id, content, bot=False, author_id=0):
+    author = SimpleNamespace(bot=bot, display_name="user", id=author_id)
+    return SimpleNamespace(channel=SimpleNamespace(id=channel_id), author=author, id=0, content=content)
+
+class TestPrefilter(TestCase):
+    def test_on_message_stages(self):
+        """
+        Only commands are processed, and only messages of channels with a view are forwarded.
+        """
+        orch = OrchestratorForRouting()
+        view = ViewForRouting()
+        orch.lock_new_view((1, None))
+        orch.open_new_view((1, None), view)
+        orch.lock_new_view((2, None)) # locked, not open
+        async def main():
+            await orch.on_message(get_message(1, "a"))
+            await orch.on_message(get_message(1, ".help"))
+            await orch.on_message(get_message(1, "board", bot=True))
+            await orch.on_message(get_message(2, "b"))
+            await orch.on_message(get_message(3, ".help"))
+            await orch.on_message(get_message(3, ".help", bot=True))
+            await orch.on_message(get_message(3, "c"))
+        asyncio.run(main())
+        self.assertEqual([".help", ".help"], orch.processed)
+        self.assertEqual(["a", ".help", "board"], view.received)
+        self.assertEqual({"command": 2, "view": 2, "bot": 1, "no_prefix": 2}, dict(orch.prefilter_counts))
+
+    def test_routing(self):
+        """
+        Personal games receive their player messages; the shared game receives the others.
+        """
+        orch = OrchestratorForRouting()
+        shared, personal, thread = ViewForRouting(), ViewForRouting(), ViewForRouting()
+        for view_id, view in [((1, None), shared), ((1, 7), personal), ((2, 7), thread)]:
+            orch.lock_new_view(view_id)
+            orch.open_new_view(view_id, view)
+        async def main():
+            await orch.on_message(get_message(1, "a", author_id=7))
+            await orch.on_message(get_message(1, "b", author_id=8))
+            await orch.on_message(get_message(2, "c", author_id=7))
+            await orch.on_message(get_message(2, "d", author_id=8))
+        asyncio.run(main())
+        self.assertEqual(["b"], shared.received)
+        self.assertEqual(["a"], personal.received)
+        self.assertEqual(["c"], thread.received)
+        orch.close_view((1, 7))
+        self.assertIs(shared, orch.get_route_view(1, 7))
+
+    def test_scroll(self):
+        """
+        The uis of a channel see all its messages, whichever view they are routed to.
+        """
+        orch = OrchestratorForRouting()
+        shared, personal, thread = ViewForRouting(), ViewForRouting(), ViewForRouting()
+        for view_id, view in [((1, None), shared), ((1, 7), personal), ((2, 7), thread)]:
+            orch.lock_new_view(view_id)
+            orch.open_new_view(view_id, view)
+        async def main():
+            await orch.on_message(get_message(1, "a", author_id=7))
+            await orch.on_message(get_message(1, "b", author_id=8))
+            await orch.on_message(get_message(1, "board", bot=True))
+        asyncio.run(main())
+        self.assertEqual(["a", "b", "board"], shared.ui.seen)
+        self.assertEqual(["a", "b", "board"], personal.ui.seen)
+        self.assertEqual([], thread.ui.seen)
+        orch.close_view((1, None))
+        orch.close_view((1, 7))
+        self.assertNotIn(1, orch.channel_views)
+
+class TestGames(TestCase):
+    def test_failed_game_creation(self):
+        """
+        The route reserved for a game is released if the game cannot be created.
+        """
+        orch = OrchestratorForRouting()
+        async def create(orchestrator, ctx, view, *args):
+            raise OSError("dictionary not found")
+        plugin = GamePlugin("fake", 0)
+        plugin.module = SimpleNamespace(View=View, create=create)
+        ctx = SimpleNamespace(command=SimpleNamespace(extras={"plugin": plugin}),
+                channel=SimpleNamespace(id=5), author=SimpleNamespace(id=1))
+        with self.assertRaises(OSError):
+            asyncio.run(Games(orch).play_game(ctx))
+        self.assertTrue(orch.can_open_new_view((5, None)))
+
+class RecordUIForTest(ConsoleUI):
+    def __init__(self, id=(1, None)):
+        super().__init__()
+        self.id = id    # route of the view
+        self.sent = []
+
+    async def send(self, message):
+        self.sent.append(message)
+
+    def get_message(self, message):
+        return message.content
+
+class TestExpiry(TestCase):
+    def test_expire_game(self):
+        """
+        A game without player message is closed after the ttl; activity postpones it.
+        """
+        orch = OrchestratorForRouting()
+        orch.reaper.ttl = .3
+        ui = RecordUIForTest()
+        view = View(ui)
+        async def main():
+            reaper_task = asyncio.create_task(orch.reaper.run(orch.expire_game))
+            orch.lock_new_view((1, None))
+            controller = Controller(orch, None, view)
+            orch.open_new_view((1, None), view, controller)
+            game_task = orch.start_game(controller)
+            await asyncio.sleep(.2)
+            await orch.on_message(get_message(1, "bonjour"))
+            await asyncio.sleep(.2)
+            self.assertTrue(orch.get_route_view(1, 0) is view)
+            await asyncio.sleep(.2)
+            self.assertIsNone(orch.get_route_view(1, 0))
+            self.assertNotIn((1, None), orch.all_controllers)
+            await asyncio.gather(game_task, return_exceptions=True)
+            self.assertTrue(game_task.cancelled())
+            reaper_task.cancel()
+        asyncio.run(main())
+        self.assertEqual(MessageNLS.get_message(MessageLiterals.GAME_TIMEOUT), ui.sent[-1])
+        self.assertEqual(0, len(orch.reaper))
+
+class TestMetrics(TestCase):
+    def setUp(self):
+        Metrics.reset()
+        self.addCleanup(Metrics.reset)
+
+    def test_handlers_and_games(self):
+        """
+        Messages and games are counted; the active views gauge follows all_views.
+        """
+        orch = OrchestratorForRouting()
+        view = View(RecordUIForTest())
+        async def main():
+            await orch.on_message(get_message(1, "a"))
+            orch.lock_new_view((1, None))
+            controller = Controller(orch, None, view)
+            orch.open_new_view((1, None), view, controller)
+            task = orch.start_game(controller)
+            for letter in "abcdefghijklmnopqrstuvwxyz":
+                while view.callback is None and not task.done():
+                    await asyncio.sleep(0)
+                await orch.on_message(get_message(1, letter))
+            await task
+        asyncio.run(main())
+        self.assertEqual(27, Metrics.histograms[("bot_handler_latency_seconds", (("event", "on_message"),))].count)
+        self.assertEqual(1, Metrics.counters[("bot_games_started_total", (("game", "pendu"),))])
+        self.assertEqual(1, Metrics.counters[("bot_games_finished_total", (("game", "pendu"),))])
+        self.assertIn("bot_active_views 0", Metrics.render())
+
+    def test_endpoint(self):
+        """
+        Metrics are served over HTTP until the listener is closed.
+        """
+        listener = MetricsListener(0)
+        async def main():
+            task = asyncio.create_task(listener.start())
+            while listener.closed is None:
+                await asyncio.sleep(.01)
+            port = listener.runner.addresses[0][1]
+            async with aiohttp.ClientSession() as session:
+                async with session.get(f"http://127.0.0.1:{port}/metrics") as response:
+                    self.assertEqual(200, response.status)
+                    self.assertIn("text/plain", response.headers["Content-Type"])
+                    self.assertIn("bot_process_resident_memory_bytes", await response.text())
+            await listener.close()
+            await task
+        asyncio.run(main())
@@ -0,0 +1,57 @@
+from utils import tools
+import logging
+logger = logging.getLogger(__name__)
+
+import asyncio
+from interface.reaper import Reaper
+from test.archi import TestCase
+from time import monotonic
+
+
+class TestReaper(TestCase):
+    def test_expiry(self):
+        reaper = Reaper(10)
+        now = monotonic()
+        reaper.touch((1, None))
+        reaper.touch((2, 3))
+        reaper.touch((4, None))
+        reaper.forget((4, None))
+        self.assertEqual([], reaper.pop_expired(now + 5))
+        self.assertEqual([(1, None), (2, 3)], reaper.pop_expired(now + 11))
+        self.assertEqual(0, len(reaper))
+        self.assertEqual([], reaper.heap)
+
+    def test_activity(self):
+        """
+        An active route gets a new deadline, without new heap entry.
+        """
+        reaper = Reaper(10)
+        now = monotonic()
+        reaper.touch((1, None))
+        reaper.deadlines[(1, None)] = now + 20 # as touched 10 sec later
+        reaper.touch((2, None))
+        self.assertEqual(2, len(reaper.heap))
+        self.assertEqual([(2, None)], reaper.pop_expired(now + 15))
+        self.assertEqual([(1, None)], reaper.pop_expired(now + 21))
+
+    def test_run(self):
+        """
+        The background task wakes up for a deadline earlier than the ones it waits for.
+        """
+        expired = []
+        async def on_expired(route):
+            expired.append((route, monotonic() - start))
+        async def main():
+            reaper = Reaper(1)
+            task = asyncio.create_task(reaper.run(on_expired))
+            await asyncio.sleep(.1)
+            reaper.touch((1, None))
+            reaper.ttl = .2
+            reaper.touch((2, None))
+            await asyncio.sleep(1.5)
+            task.cancel()
+        start = monotonic()
+        asyncio.run(main())
+        self.assertEqual([(2, None), (1, None)], [route for route, t in expired])
+        self.assertIncertitude(expired[0][1], .3, .05)
+        self.assertIncertitude(expired[1][1], 1.1, .05)
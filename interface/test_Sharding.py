@@ -0,0 +1,100 @@
+from utils import tools
+import logging
+logger = logging.getLogger(__name__)
+
+import os, shutil, tempfile
+from interface.orchestration import Orchestrator, ShardedDiscordOrchestrator, SupervisorLink
+from interface.sharding import Supervisor
+from test.archi import TestCase
+from utils.tools import Constant
+
+
+def stop_worker(config_path, config_context, shard_ids, shard_count, connection):
+    """
+    Worker for test: the first worker sends the stop instruction, all workers wait for it.
+    """
+    if shard_ids[0] == 0:
+        connection.send(SupervisorLink.STOP)
+    assert connection.recv() == SupervisorLink.STOP
+
+def reload_worker(config_path, config_context, shard_ids, shard_count, connection):
+    """
+    Worker for test: the first worker sends a reload then the stop instruction,
+    other workers receive the reload first.
+    """
+    if shard_ids[0] == 0:
+        connection.send((SupervisorLink.RELOAD, "pendu"))
+        connection.send(SupervisorLink.STOP)
+    else:
+        assert connection.recv() == (SupervisorLink.RELOAD, "pendu")
+    assert connection.recv() == SupervisorLink.STOP
+
+def crash_worker(config_path, config_context, shard_ids, shard_count, connection):
+    """
+    Worker for test: crash on first run, identified by a marker file in config_path directory.
+    """
+    marker = os.path.join(config_path, str(shard_ids[0]))
+    if not os.path.exists(marker):
+        open(marker, "w").close()
+        os._exit(1)
+
+
+class TestSupervisor(TestCase):
+    def test_shard_ids(self):
+        supervisor = Supervisor(None, None, 3, 8)
+        self.assertEqual([[0, 3, 6], [1, 4, 7], [2, 5]], [supervisor.get_shard_ids(index) for index in range(3)])
+        self.assertEqual([1], Supervisor(None, None, 2).get_shard_ids(1))
+
+    def test_read_config(self):
+        self.assertEqual((1, None), Supervisor.read_config("test/resources/config_complet.ini", "TEST"))
+
+    def test_stop_all(self):
+        """
+        A stop instruction from one worker stops all workers.
+        """
+        class SupervisorForTest(Supervisor):
+            worker_target = stop_worker
+        supervisor = SupervisorForTest(None, None, 3)
+        supervisor.run()
+        self.assertEqual({}, supervisor.workers)
+        self.assertTrue(supervisor.stopping)
+
+    def test_forward_reload(self):
+        """
+        A reload from one worker is forwarded to the other workers only.
+        """
+        class SupervisorForTest(Supervisor):
+            worker_target = reload_worker
+            def wait_events(self):
+                super().wait_events()
+                assert len(self.workers) == 3 or self.stopping, "A worker crashed."
+        supervisor = SupervisorForTest(None, None, 3)
+        supervisor.run()
+        self.assertEqual({}, supervisor.workers)
+
+    def test_restart_crashed(self):
+        """
+        Crashed workers are restarted once, then stop normally.
+        """
+        class SupervisorForTest(Supervisor):
+            worker_target = crash_worker
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        delay = Constant.SHARD_RESTART_DELAY
+        Constant.SHARD_RESTART_DELAY = 0
+        try:
+            SupervisorForTest(directory, None, 2).run()
+        finally:
+            Constant.SHARD_RESTART_DELAY = delay
+        self.assertEqual(["0", "1"], sorted(os.listdir(directory)))
+
+
+class TestShardedOrchestrator(TestCase):
+    def test_init(self):
+        orch = Orchestrator("test/resources/config_complet.ini", "TEST", [1, 3], 4)
+        bot = orch.listeners[0]
+        self.assertIsInstance(bot, ShardedDiscordOrchestrator)
+        self.assertEqual([1, 3], bot.shard_ids)
+        self.assertEqual(4, bot.shard_count)
+        self.assertNotEqual(Constant.SNAPSHOT_FILE, bot.snapshot_file)
+        self.assertTrue(bot.snapshot_file.endswith("-1-3.bin"))
@@ -0,0 +1,104 @@
+from utils import tools
+import logging
+logger = logging.getLogger(__name__)
+
+import os, shutil, tempfile
+from time import time
+from game.pendu.controller import Controller
+from game.pendu.model import Model
+from game.pendu.view import View
+from game import puissance4
+from game.puissance4 import controller, model, view
+from interface.snapshot import HEADER, RECORD, Snapshot
+from mvc.ui import ConsoleUI
+from test.archi import TestCase
+
+
+class TestSnapshot(TestCase):
+    def get_path(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        return os.path.join(directory, "snapshot.bin")
+
+    def get_game(self, secret_word):
+        model = Model.__new__(Model)
+        model.secret_word = secret_word
+        model.restart()
+        return Controller(None, None, View(ConsoleUI()), model=model)
+
+    def test_save_load(self):
+        path = self.get_path()
+        games = {(1, None): self.get_game("test"), (2**60, 2**62): self.get_game("pendu")}
+        games[(1, None)].model.play_letter('s')
+        self.assertEqual(2, Snapshot.save(path, games))
+
+        restored = Snapshot.load(path)
+        self.assertEqual(2, len(restored))
+        for view_id, controller_class, view_class, model in restored:
+            self.assertIs(Controller, controller_class)
+            self.assertIs(View, view_class)
+            self.assertEqual(str(games[view_id].model), str(model))
+
+    def test_game_types(self):
+        """
+        Games of different types are restored with their own classes.
+        """
+        path = self.get_path()
+        model = puissance4.model.Model(ai_player=1)
+        model.play(3)
+        games = {(1, None): self.get_game("test"),
+                (1, 2): puissance4.controller.Controller(None, None, puissance4.view.View(ConsoleUI()), model=model)}
+        Snapshot.save(path, games)
+
+        restored = {view_id: (controller_class, model) for view_id, controller_class, view_class, model in Snapshot.load(path)}
+        self.assertIs(Controller, restored[(1, None)][0])
+        self.assertIs(puissance4.controller.Controller, restored[(1, 2)][0])
+        self.assertEqual(model.get_grid(), restored[(1, 2)][1].get_grid())
+
+    def test_no_games(self):
+        """
+        Saving no game removes the previous snapshot.
+        """
+        path = self.get_path()
+        Snapshot.save(path, {(1, None): self.get_game("test")})
+        self.assertTrue(os.path.exists(path))
+        self.assertEqual(0, Snapshot.save(path, {}))
+        self.assertFalse(os.path.exists(path))
+        self.assertEqual([], Snapshot.load(path))
+
+    def test_corrupted(self):
+        path = self.get_path()
+        Snapshot.save(path, {(1, None): self.get_game("test"), (2, 3): self.get_game("pendu")})
+        with open(path, "r+b") as file:
+            file.truncate(os.path.getsize(path) - 3)
+        self.assertEqual(1, len(Snapshot.load(path)))
+
+    def test_invalid_record(self):
+        """
+        A game that cannot be restored is skipped, not the following ones.
+        """
+        path = self.get_path()
+        Snapshot.save(path, {(1, None): self.get_game("test"), (2, 3): self.get_game("pendu")})
+        with open(path, "r+b") as file:
+            file.seek(HEADER.size + RECORD.size - 3) # game type of the first record
+            file.write(bytes([255]))
+        restored = Snapshot.load(path)
+        self.assertEqual([(2, 3)], [view_id for view_id, controller_class, view_class, model in restored])
+
+    def test_restore_duration(self):
+        """
+        10k games are saved and restored in well under a second.
+        """
+        path = self.get_path()
+        games = {(channel_id, None): self.get_game("abaissements") for channel_id in range(10000)}
+        t = time()
+        Snapshot.save(path, games)
+        logger.info("10k games saved in %.3f sec.", time() - t)
+        t = time()
+        restored = Snapshot.load(path)
+        for view_id, controller_class, view_class, model in restored:
+            controller_class(None, None, view_class(ConsoleUI()), model=model)
+        t = time() - t
+        logger.info("10k games restored in %.3f sec.", t)
+        self.assertEqual(10000, len(restored))
+        self.assertLess(t, .5)
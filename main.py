@@ -6,17 +6,27 @@ Usage:
 
 with CONTEXT the name of the section in resources/config.ini .
 Several sections can be created in order not to overwrite values when you need to switch context.
+When `workers` is set above 1 in the section, the bot runs in sharded mode with
+one process per worker.
 """
 ## Setup logger
 from utils import tools
 import logging
 logger = logging.getLogger(__name__)
 
+from utils.startup import Startup # start time of the program
 from interface.orchestration import Orchestrator
+from interface.sharding import Supervisor
+Startup.mark("imports")
 
 
 if __name__ == '__main__':
     CONTEXT = tools.read_input()
-    bot = Orchestrator(tools.Constant.CONFIG_PATH, CONTEXT)
+    tools.setup_logging(tools.Constant.CONFIG_PATH)
+    nb_workers, shard_count = Supervisor.read_config(tools.Constant.CONFIG_PATH, CONTEXT)
+    if nb_workers > 1:
+        bot = Supervisor(tools.Constant.CONFIG_PATH, CONTEXT, nb_workers, shard_count)
+    else:
+        bot = Orchestrator(tools.Constant.CONFIG_PATH, CONTEXT)
     # start Bot
     bot.run()       # Stop with ctrl+C
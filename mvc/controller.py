@@ -14,6 +14,8 @@ class AbstractController:
     The Controller is responsible of the logic of the game.
     It calls views with callback and wait for the answer.
     """
+    __slots__ = ("model", "orchestrator", "main_view")
+
     def __init__(self, orchestrator, model, main_view):
         self.model = model
         self.orchestrator = orchestrator
@@ -55,9 +57,23 @@ class AbstractCallback:
     One Callback is created for each player turn.
     A Callback must contain all the input data for the view.
     `answered` variable must be set to True when the view play a move.
+    Subclasses must call `notify` when a move is provided, to wake up the
+    controller waiting for it.
     """
+    __slots__ = ("_end_call", "waiter")
+
     def __init__(self):
-        self.end_call = False  # This is set to True when the call to view ends.
+        self._end_call = False  # This is set to True when the call to view ends.
+        self.waiter = None      # future resolved when ready, while waiting.
+
+    @property
+    def end_call(self):
+        return self._end_call
+
+    @end_call.setter
+    def end_call(self, value):
+        self._end_call = value
+        self.notify()
 
     def is_ready(self):
         """
@@ -74,18 +90,29 @@ class AbstractCallback:
         """
         raise NotImplementedError()
 
+    def notify(self):
+        """
+        Wake up the waiting controller if the callback is ready.
+        """
+        if self.waiter is not None and not self.waiter.done() and self.is_ready():
+            self.waiter.set_result(None)
+
     async def wait(self, timeout=None):
         """
         Raise a TimeoutError if no move is provided before the timeout duration.
+        Return as soon as the callback is ready.
 
         @param  timeout     Timeout duration in seconds. None if no timeout requested.
         @raise  TimeoutError
         """
         start_time = time()
-        await asyncio.sleep(.05)
-        while not self.is_ready():
-            if timeout is not None and time() - start_time > timeout:
+        if not self.is_ready():
+            self.waiter = asyncio.get_running_loop().create_future()
+            try:
+                await asyncio.wait_for(self.waiter, timeout)
+            except asyncio.TimeoutError:
                 logger.log(tools.Constant.VERBOSE, "Raise timeout ! (%f/%ssec)", time() - start_time, timeout)
                 raise TimeoutError()
-            await asyncio.sleep(1)
+            finally:
+                self.waiter = None
         logger.log(tools.Constant.VERBOSE, "Answer in time : %f/%ssec", time() - start_time, timeout)
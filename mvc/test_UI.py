@@ -0,0 +1,147 @@
+from utils import tools
+import logging
+logger = logging.getLogger(__name__)
+
+import asyncio, discord
+from time import time
+from mvc.ui import DiscordUI, Outbox
+from test.archi import TestCase
+from utils.tools import Constant
+
+
+class ChannelForTest:
+    """
+    Fake discord channel, counting API calls.
+    """
+    class Message:
+        def __init__(self, channel, id, content):
+            self.channel = channel
+            self.id = id
+            self.content = content
+
+        async def edit(self, content):
+            if self.channel.fail_edit:
+                raise discord.HTTPException(type("Response", (), {"status": 404, "reason": "Not Found"})(), "Unknown Message")
+            self.channel.edits += 1
+            self.content = content
+
+    def __init__(self, id=1):
+        self.id = id
+        self.sends = []
+        self.edits = 0
+        self.fail_edit = False
+
+    async def send(self, content):
+        self.sends.append(content)
+        return ChannelForTest.Message(self, len(self.sends), content)
+
+
+class TestDiscordUI(TestCase):
+    def test_board_edit(self):
+        """
+        The board is edited until it scrolled too far.
+        """
+        channel = ChannelForTest()
+        ui = DiscordUI(channel)
+        async def main():
+            await ui.send_board("1")
+            await ui.board
+            await ui.send_board("2")
+            await ui.board
+            self.assertEqual((1, 1), (len(channel.sends), channel.edits))
+            self.assertEqual("2", (await ui.board).content)
+
+            for index in range(Constant.BOARD_MAX_SCROLL):
+                ui.on_message(ChannelForTest.Message(channel, 100 + index, "a"))
+            await ui.send_board("3")
+            await ui.board
+            self.assertEqual((1, 2), (len(channel.sends), channel.edits))
+
+            ui.on_message(ChannelForTest.Message(channel, 200, "b"))
+            await ui.send_board("4")
+            self.assertEqual("4", (await ui.board).content)
+            self.assertEqual((2, 2), (len(channel.sends), channel.edits))
+
+            channel.fail_edit = True
+            await ui.send_board("5")
+            self.assertEqual("5", (await ui.board).content)
+            self.assertEqual((3, 2), (len(channel.sends), channel.edits))
+        asyncio.run(main())
+
+    def test_coalescing(self):
+        """
+        Pending messages are merged, and pending board edits only keep the last one.
+        """
+        channel = ChannelForTest(2)
+        ui = DiscordUI(channel)
+        async def main():
+            await ui.send_board("board")
+            for content in ["a", "b", "c"]:
+                await ui.send_board(content)
+            await ui.send("x")
+            await ui.send("y")
+            await ui.send("z" * Constant.MESSAGE_MAX_SIZE)
+            self.assertEqual(3, ui.queue_depth())
+            await Outbox.drain(1)
+        asyncio.run(main())
+        self.assertEqual(["c", "x\ny", "z" * Constant.MESSAGE_MAX_SIZE], channel.sends)
+        self.assertEqual(0, ui.queue_depth())
+
+    def test_release(self):
+        """
+        An idle Outbox is dropped once its bucket is full again.
+        """
+        channel = ChannelForTest(4)
+        ui = DiscordUI(channel)
+        period = Constant.OUTBOX_PERIOD
+        Constant.OUTBOX_PERIOD = .5
+        self.addCleanup(setattr, Constant, "OUTBOX_PERIOD", period)
+        async def main():
+            await ui.send("a")
+            await Outbox.drain(1)
+            self.assertIn(channel.id, Outbox.instances) # one token used
+            await asyncio.sleep(Constant.OUTBOX_PERIOD / Constant.OUTBOX_BURST + .05)
+            self.assertNotIn(channel.id, Outbox.instances)
+        asyncio.run(main())
+
+    def test_rate_limit(self):
+        """
+        Messages over the burst are paced, without blocking the sender.
+        """
+        channel = ChannelForTest(3)
+        ui = DiscordUI(channel)
+        async def main():
+            t = time()
+            for index in range(Constant.OUTBOX_BURST + 1):
+                await ui.send_board(str(index)) # new board each time: not merged
+                ui.scrolled = Constant.BOARD_MAX_SCROLL + 1
+            self.assertLess(time() - t, .1)
+            await asyncio.sleep(.1)
+            self.assertEqual(Constant.OUTBOX_BURST, len(channel.sends))
+            await Outbox.drain(Constant.OUTBOX_PERIOD)
+            self.assertIncertitude(time() - t, Constant.OUTBOX_PERIOD / Constant.OUTBOX_BURST, .05)
+        asyncio.run(main())
+        self.assertEqual(Constant.OUTBOX_BURST + 1, len(channel.sends))
+
+    def test_spaced_messages(self):
+        """
+        The rate limit holds for messages sent while the queue is empty.
+        """
+        channel = ChannelForTest(5)
+        ui = DiscordUI(channel)
+        period = Constant.OUTBOX_PERIOD
+        Constant.OUTBOX_PERIOD = .5
+        self.addCleanup(setattr, Constant, "OUTBOX_PERIOD", period)
+        nb_messages = 2 * Constant.OUTBOX_BURST + 2
+        async def main():
+            t = time()
+            for index in range(nb_messages):
+                await ui.send_board(str(index))
+                ui.scrolled = Constant.BOARD_MAX_SCROLL + 1
+                await asyncio.sleep(.05)
+            await Outbox.drain(5)
+            return time() - t
+        duration = asyncio.run(main())
+        self.assertEqual(nb_messages, len(channel.sends))
+        # burst, then one message per OUTBOX_PERIOD / OUTBOX_BURST
+        self.assertGreater(duration, (nb_messages - Constant.OUTBOX_BURST) * Constant.OUTBOX_PERIOD / Constant.OUTBOX_BURST - .05)
@@ -7,8 +7,16 @@ from utils import tools
 import logging
 logger = logging.getLogger(__name__)
 
+import asyncio, discord
+from collections import deque
+from time import monotonic, perf_counter
+from utils.metrics import Metrics
+from utils.tools import Constant
+
 
 class AbstractUI:
+    __slots__ = ("id", "view")
+
     def __init__(self, id):
         self.id = id
         self.view = None    # init by the view itself.
@@ -19,17 +27,39 @@ class AbstractUI:
         """
         raise NotImplementedError()
 
+    async def send_board(self, message):
+        """
+        Show the board of the game on the ui.
+        By default, the board is sent as a new message.
+        """
+        await self.send(message)
+
+    def on_message(self, message):
+        """
+        To be called by the orchestrator for every message of the channel,
+        whichever view it is routed to.
+        """
+        pass
+
     def get_message(self, message):
         return message
 
     def get_message_id(self, message):
         return None
 
+    def get_author_id(self, message):
+        """
+        Return the id of the author of the message; None if unknown.
+        """
+        return None
+
 
 class ConsoleUI(AbstractUI):
     """
     This interface manage interactions through terminal.
     """
+    __slots__ = ()
+
     def __init__(self):
         super().__init__("stdin")
 
@@ -40,16 +70,213 @@ class ConsoleUI(AbstractUI):
 class DiscordUI(AbstractUI):
     """
     This interface manage Discord interactions.
+    Messages are queued in the Outbox of the channel: sending never waits for
+    the discord API.
+
+    The board is a persistent message, edited in place as long as it has not
+    scrolled too far in the channel.
     """
-    def __init__(self, channel):
-        super().__init__(channel.id)
+    __slots__ = ("channel", "board", "scrolled")
+
+    def __init__(self, channel, player_id=None):
+        """
+        @param  player_id   Optional. Player of a personal game; None if shared in the channel.
+        """
+        super().__init__((channel.id, player_id))
         self.channel = channel
+        self.board = None   # future of the last board message sent
+        self.scrolled = 0   # number of messages posted after the board, including bot ones
 
     async def send(self, message):
-        await self.channel.send(message)
+        Outbox.get(self.channel).send(message)
+
+    async def send_board(self, message):
+        outbox = Outbox.get(self.channel)
+        if self.board is not None and self.scrolled <= Constant.BOARD_MAX_SCROLL:
+            self.board = outbox.edit(self.board, message)
+        else:
+            self.board = outbox.send(message, board=True)
+            self.scrolled = 0
+
+    def on_message(self, message):
+        if not self.is_board(message):
+            self.scrolled += 1
+
+    def is_board(self, message):
+        return (self.board is not None and self.board.done()
+                and self.board.result() is not None and self.board.result().id == message.id)
+
+    def queue_depth(self):
+        """
+        Number of messages waiting to be sent on the channel.
+        """
+        outbox = Outbox.instances.get(self.channel.id)
+        return len(outbox) if outbox is not None else 0
 
     def get_message(self, message):
         return message.content
 
     def get_message_id(self, message):
         return message.id
+
+    def get_author_id(self, message):
+        return message.author.id
+
+
+class Outbox:
+    """
+    Queue of outgoing messages of a discord channel, processed in background.
+
+    Consecutive pending messages are merged when they fit in a single discord
+    message, and consecutive edits of the same board only keep the last one.
+    Calls to the discord API are paced to stay under the rate limit of the
+    channel (OUTBOX_BURST messages per OUTBOX_PERIOD seconds).
+
+    An idle Outbox lives until its rate limit bucket is full again, so that the
+    limit holds across idle periods. Use `Outbox.get(channel)`.
+    """
+    __slots__ = ("channel", "pending", "task", "tokens", "refill_time")
+    instances = dict()  # map channel id to its active Outbox
+
+    SEND = 0
+    EDIT = 1
+
+    def __init__(self, channel):
+        self.channel = channel
+        self.pending = deque()  # of [kind, content, board, future]
+        self.task = None
+        self.tokens = Constant.OUTBOX_BURST
+        self.refill_time = monotonic()
+
+    @staticmethod
+    def get(channel):
+        """
+        Return the Outbox of the channel, created if needed.
+        """
+        outbox = Outbox.instances.get(channel.id)
+        if outbox is None:
+            outbox = Outbox.instances[channel.id] = Outbox(channel)
+        return outbox
+
+    @staticmethod
+    def total_depth():
+        """
+        Number of messages waiting to be sent, over all channels.
+        """
+        return sum(len(outbox) for outbox in Outbox.instances.values())
+
+    @staticmethod
+    async def drain(timeout):
+        """
+        Wait for all pending messages to be sent, up to the timeout in seconds.
+        """
+        tasks = [outbox.task for outbox in Outbox.instances.values() if outbox.task is not None]
+        if tasks:
+            await asyncio.wait(tasks, timeout=timeout)
+
+    def __len__(self):
+        return len(self.pending)
+
+    # queueing
+
+    def send(self, content, board=False):
+        """
+        Queue a new message.
+
+        @param  board   True if the message will be edited later: it is not merged with others.
+        @return     Future of the sent message; None if it could not be sent.
+        """
+        if not board and self.pending:
+            last = self.pending[-1]
+            if (last[0] == Outbox.SEND and last[2] is None
+                    and len(last[1]) + 1 + len(content) <= Constant.MESSAGE_MAX_SIZE):
+                last[1] += "\n" + content
+                return last[3]
+        future = asyncio.get_running_loop().create_future()
+        self.pending.append([Outbox.SEND, content, True if board else None, future])
+        self.wake()
+        return future
+
+    def edit(self, board, content):
+        """
+        Queue the edition of a message. A new message is sent if the edition fails.
+
+        @param  board   Future of the message to edit.
+        @return     Future of the edited (or new) message; None if it could not be sent.
+        """
+        if self.pending:
+            last = self.pending[-1]
+            if last[0] == Outbox.EDIT and last[3] is board:
+                last[1] = content
+                return board
+            if last[0] == Outbox.SEND and last[3] is board:
+                last[1] = content # not sent yet
+                return board
+        future = asyncio.get_running_loop().create_future()
+        self.pending.append([Outbox.EDIT, content, board, future])
+        self.wake()
+        return future
+
+    # processing
+
+    def wake(self):
+        if self.task is None:
+            self.task = asyncio.create_task(self.process())
+
+    async def process(self):
+        try:
+            while self.pending:
+                await self.acquire()
+                kind, content, board, future = self.pending.popleft()
+                message = None
+                try:
+                    if kind == Outbox.EDIT:
+                        message = await board
+                        if message is not None:
+                            start_time = perf_counter()
+                            try:
+                                await message.edit(content=content)
+                            except discord.HTTPException:
+                                logger.warning("Cannot edit board message %s. Send a new one.", message.id)
+                                message = None
+                            Metrics.observe("bot_send_latency_seconds", perf_counter() - start_time, (("kind", "edit"),))
+                    if message is None:
+                        start_time = perf_counter()
+                        message = await self.channel.send(content)
+                        Metrics.observe("bot_send_latency_seconds", perf_counter() - start_time, (("kind", "send"),))
+                except Exception:
+                    logger.exception("Cannot send message on channel %s.", self.channel.id)
+                    message = None
+                future.set_result(message)
+        finally:
+            self.task = None
+            self.release()
+
+    def release(self):
+        """
+        Drop the idle Outbox once its bucket is full again; wait for it otherwise.
+        """
+        if self.pending or self.task is not None or Outbox.instances.get(self.channel.id) is not self:
+            return
+        self.refill()
+        if self.tokens >= Constant.OUTBOX_BURST:
+            Outbox.instances.pop(self.channel.id)
+        else:
+            asyncio.get_running_loop().call_later(
+                    (Constant.OUTBOX_BURST - self.tokens) * Constant.OUTBOX_PERIOD / Constant.OUTBOX_BURST, self.release)
+
+    async def acquire(self):
+        """
+        Wait for the rate limit bucket of the channel to allow one more call.
+        """
+        self.refill()
+        if self.tokens < 1:
+            await asyncio.sleep((1 - self.tokens) * Constant.OUTBOX_PERIOD / Constant.OUTBOX_BURST)
+            self.refill()
+        self.tokens -= 1
+
+    def refill(self):
+        now = monotonic()
+        self.tokens = min(Constant.OUTBOX_BURST,
+                self.tokens + (now - self.refill_time) * Constant.OUTBOX_BURST / Constant.OUTBOX_PERIOD)
+        self.refill_time = now
@@ -19,6 +19,8 @@ class AbstractView:
     The view must filter if this event is expected or not, and answer to the
     controller through the callback only when required.
     """
+    __slots__ = ("id",)
+
     def __init__(self, id):
         self.id = id
 
@@ -37,6 +39,8 @@ class UserInteractView(AbstractView):
     It is called by the orchestrator when an event is received on the associated ui.
     Call is forwarded to the ui.
     """
+    __slots__ = ("ui", "callback")
+
     def __init__(self, ui: AbstractUI):
         assert isinstance(ui, AbstractUI) # python does not check type
         super().__init__(ui.id)
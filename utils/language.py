@@ -1,49 +1,160 @@
 """
 Manage language text messages from tags.
-These messages are define in literals class that must inherit from Enum.
+Tags are the members of MessageLiterals Enum, which also holds the default
+(english) text of messages.
 
-Default language (english) is MessageLiterals.
-Others languages must be defined in a dedicated class.
+Other languages are data files in language_resources, named <lang code>.json,
+mapping tag names to texts. They are loaded on first use and kept in a
+bounded cache.
 Text messages can support arguments, formated {i} with index i starting from 0.
+
+The language is chosen for the current asyncio task (e.g. from the channel of
+the message being handled), with a default language for the whole program.
 """
 from utils import tools
 import logging
 logger = logging.getLogger(__name__)
 
+import contextvars, json, os
+from collections import OrderedDict
+from string import Formatter
 from utils.language_resources.MessageLiterals import MessageLiterals
-from utils.language_resources.MessageLiterals_fr import MessageLiterals_fr
+from utils.tools import Constant
+
+DEFAULT_LANG_CODE = "en"
+LANGUAGE_RESOURCES = os.path.join(os.path.dirname(__file__), "language_resources")
+# map supported language code to its pack file; None for the default language
+SUPPORTED_LANG_CODES = {DEFAULT_LANG_CODE: None}
+for file_name in sorted(os.listdir(LANGUAGE_RESOURCES)):
+    lang_code, extension = os.path.splitext(file_name)
+    if extension == ".json":
+        SUPPORTED_LANG_CODES[lang_code] = os.path.join(LANGUAGE_RESOURCES, file_name)
+# map literals to their index in catalogs
+LITERAL_INDEX = {literal: index for index, literal in enumerate(MessageLiterals)}
+
+# catalog of the language of the current task; None for the default language
+current_catalog = contextvars.ContextVar("current_catalog", default=None)
+
+
+class MessageCatalog:
+    """
+    Messages of one language, compiled once in flat arrays indexed by literal.
+    A message without argument is stored as its final text; others as the
+    bound `format` method of their template, with the number of expected arguments.
+    Messages missing from a language pack are taken from MessageLiterals.
+    """
+    __slots__ = ("lang_code", "messages", "nb_args")
+    instances = OrderedDict()   # map language code to its catalog, least recently used first
+    default = None              # catalog of the default language, always loaded
+
+    def __init__(self, lang_code, texts):
+        """
+        @param  texts   Map of literal name to text.
+        """
+        self.lang_code = lang_code
+        self.messages = [None] * len(MessageLiterals)
+        self.nb_args = [0] * len(MessageLiterals)
+        for literal in MessageLiterals:
+            text = texts.get(literal.name)
+            if text is None:
+                text = literal.value
+            index = LITERAL_INDEX[literal]
+            nb_args = MessageCatalog.count_args(text)
+            self.nb_args[index] = nb_args
+            self.messages[index] = text.format() if nb_args == 0 else text.format
+
+    @staticmethod
+    def get(lang_code):
+        """
+        Return the compiled catalog of the language, loaded on first use.
+        The default language is always loaded; others are dropped from the
+        cache above LANGUAGE_CACHE_SIZE, least recently used first.
+
+        @raise  AttributeError  on not supported lang_code.
+        """
+        if lang_code == DEFAULT_LANG_CODE:
+            return MessageCatalog.default
+        catalog = MessageCatalog.instances.get(lang_code)
+        if catalog is not None:
+            MessageCatalog.instances.move_to_end(lang_code)
+            return catalog
+        if lang_code not in SUPPORTED_LANG_CODES:
+            raise AttributeError(f"'{lang_code}' is not supported.")
+        catalog = MessageCatalog.instances[lang_code] = MessageCatalog(lang_code, MessageCatalog.read_pack(lang_code))
+        if len(MessageCatalog.instances) > Constant.LANGUAGE_CACHE_SIZE:
+            MessageCatalog.instances.popitem(last=False)
+        logger.debug("Language '%s' loaded.", lang_code)
+        return catalog
+
+    @staticmethod
+    def read_pack(lang_code):
+        """
+        Return the texts of a language pack, as a map of literal name to text.
+        """
+        with open(SUPPORTED_LANG_CODES[lang_code], encoding="utf-8") as file:
+            return json.load(file)
+
+    @staticmethod
+    def count_args(template):
+        """
+        Return the number of positional arguments used by the template.
+        """
+        nb_args = 0
+        auto_index = 0
+        for literal_text, field_name, format_spec, conversion in Formatter().parse(template):
+            if field_name is None:
+                continue
+            if field_name == "":
+                auto_index += 1
+                nb_args = max(nb_args, auto_index)
+            else:
+                nb_args = max(nb_args, int(field_name.split('.')[0].split('[')[0]) + 1)
+        return nb_args
 
-SUPPORTED_LANG_CODES = {
-        "en": MessageLiterals,
-        "fr": MessageLiterals_fr
-}
+
+MessageCatalog.default = MessageCatalog(DEFAULT_LANG_CODE, {})
 
 
 class MessageNLS:
     """
     This class allows to retrieve text messages in any supported language,
     based on tags.
-    The language is set once for the entire program.
+    The default language is set for the entire program, and can be changed
+    for the current task with `use_language`.
     To get a text, call:
     `MessageNLS.get_message(MessageLiterals.*TAG*)`
 
     Arguments can be given to method, if any:
     `MessageNLS.get_message(MessageLiterals.*TAG*, arg1)`
     """
-    message_literals = MessageLiterals
+    catalog = MessageCatalog.default # default language of the program
 
     def set_language(lang_code):
         """
-        Setup language for all follong calls in the current program.
+        Setup default language for all following calls in the current program.
         Class method.
 
         @param  lang_code   String of the code identifier of the language.
         @raise  AttributeError  on bad provided lang_code.
         """
-        if lang_code in SUPPORTED_LANG_CODES:
-            MessageNLS.message_literals = SUPPORTED_LANG_CODES[lang_code]
-        else:
-            raise AttributeError(f"'{lang_code}' is not supported.")
+        MessageNLS.catalog = MessageCatalog.get(lang_code)
+
+    def use_language(lang_code):
+        """
+        Setup language for the current task, and the tasks it creates.
+        Class method.
+
+        @param  lang_code   Code of the language; None for the default language.
+        @raise  AttributeError  on bad provided lang_code.
+        """
+        current_catalog.set(None if lang_code is None else MessageCatalog.get(lang_code))
+
+    def get_language():
+        """
+        Return the code of the language of the current task.
+        Class method.
+        """
+        return (current_catalog.get() or MessageNLS.catalog).lang_code
 
     def get_message(key, *args):
         """
@@ -56,10 +167,76 @@ class MessageNLS:
         In case of error, a default message is returned.
         """
         try:
-            return getattr(MessageNLS.message_literals, key.name).value.format(*args)
-        except IndexError:
-            logger.error("Missing parameters for message '%s'", key.name)
-            return MessageNLS.get_message(MessageLiterals.DEFAULT)
-        except AttributeError as e:
+            index = LITERAL_INDEX.get(key)
+        except TypeError: # not hashable
+            index = None
+        if index is None:
             logger.error("Cannot get requested message: '%s'", key)
             return MessageNLS.get_message(MessageLiterals.DEFAULT)
+        catalog = current_catalog.get() or MessageNLS.catalog
+        nb_args = catalog.nb_args[index]
+        if nb_args == 0:
+            return catalog.messages[index]
+        if len(args) < nb_args:
+            logger.error("Missing parameters for message '%s'", key.name)
+            return MessageNLS.get_message(MessageLiterals.DEFAULT)
+        return catalog.messages[index](*args)
+
+
+class LanguageSettings:
+    """
+    Language chosen for discord channels and guilds, saved in a file.
+    The language of a channel has priority on the one of its guild.
+    """
+    def __init__(self, path):
+        self.path = path
+        self.channels = dict()  # map channel id to language code
+        self.guilds = dict()    # map guild id to language code
+        self.load()
+
+    def resolve(self, channel_id, guild_id=None):
+        """
+        Return the language code for the channel; None for the default language.
+        """
+        lang_code = self.channels.get(channel_id)
+        if lang_code is None and guild_id is not None:
+            lang_code = self.guilds.get(guild_id)
+        return lang_code
+
+    def set_channel(self, channel_id, lang_code):
+        self.set(self.channels, channel_id, lang_code)
+
+    def set_guild(self, guild_id, lang_code):
+        self.set(self.guilds, guild_id, lang_code)
+
+    def set(self, settings, id, lang_code):
+        """
+        @param  lang_code   None to remove the setting.
+        @raise  AttributeError  on not supported lang_code.
+        """
+        if lang_code is None:
+            settings.pop(id, None)
+        elif lang_code not in SUPPORTED_LANG_CODES:
+            raise AttributeError(f"'{lang_code}' is not supported.")
+        else:
+            settings[id] = lang_code
+        self.save()
+
+    def load(self):
+        try:
+            with open(self.path, encoding="utf-8") as file:
+                data = json.load(file)
+        except FileNotFoundError:
+            return
+        except ValueError:
+            logger.exception("Cannot read language settings '%s'.", self.path)
+            return
+        self.channels = {int(id): lang_code for id, lang_code in data.get("channels", {}).items()}
+        self.guilds = {int(id): lang_code for id, lang_code in data.get("guilds", {}).items()}
+
+    def save(self):
+        try:
+            with open(self.path, "w", encoding="utf-8") as file:
+                json.dump({"channels": self.channels, "guilds": self.guilds}, file)
+        except OSError:
+            logger.exception("Cannot save language settings '%s'.", self.path)
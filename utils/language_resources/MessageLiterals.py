@@ -1,10 +1,23 @@
 from enum import Enum
 
 class MessageLiterals(Enum):
+    CONFIG_INVALID  = "Invalid configuration file: settings are not changed."
+    CONFIG_RELOADED = "Configuration reloaded. Changed settings: {0}"
     DEFAULT     = "Default"
     ERRORS      = "Errors"
+    GAME_RELOAD_FAILED  = "Cannot reload game {0}: {1}"
+    GAME_RELOADED   = "Game {0} reloaded. {1} running games finish on the previous version."
+    GAME_TIMEOUT    = "Game closed after a long time without playing."
+    GAME_UNKNOWN    = "Unknown game. Available: {0}"
     HELLO       = "Hello {0}"
     INVALID_ROLE    = "You do not have permissions for this command."
+    LANGUAGE_SET    = "Language set to {0}."
+    LANGUAGE_UNSUPPORTED    = "Unsupported language. Available: {0}"
     PENDU_ERRORS    = "{0} errors/{1}"
+    PENDU_INVALID_SETTINGS  = "No word matches these settings. Usage: pendu [easy|medium|hard] [min length] [max length]"
     PENDU_LOSE  = "Game Over... The correct word was {0}."
     PENDU_WIN   = "Winner !"
+    PUISSANCE4_AI_WIN   = "The bot wins!"
+    PUISSANCE4_DRAW     = "Draw, the board is full."
+    PUISSANCE4_TURN     = "{0} to play: send a column number."
+    PUISSANCE4_WIN      = "{0} wins!"
@@ -0,0 +1,146 @@
+"""
+Runtime metrics of the bot, exported in Prometheus text format.
+
+Metrics are registered in the class-level registry of `Metrics`, so that any
+module can count or time events without reference to the exporter.
+"""
+from utils import tools
+import logging
+logger = logging.getLogger(__name__)
+
+import bisect, os, resource
+from utils.tools import Constant
+
+
+class Histogram:
+    """
+    Cumulative histogram of observed values, with fixed buckets.
+    """
+    __slots__ = ("buckets", "counts", "sum", "count")
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.sum = 0.
+        self.count = 0
+
+    def observe(self, value):
+        index = bisect.bisect_left(self.buckets, value)
+        if index < len(self.counts):
+            self.counts[index] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative_counts(self):
+        total = 0
+        for count in self.counts:
+            total += count
+            yield total
+
+
+class Metrics:
+    """
+    Registry of counters, histograms and gauges.
+    Labels are given as a tuple of (name, value) pairs.
+    """
+    helps = dict()      # map metric name to (type, help)
+    counters = dict()   # map (name, labels) to value
+    histograms = dict() # map (name, labels) to Histogram
+    gauges = dict()     # map name to a function returning the current value
+
+    @staticmethod
+    def describe(name, metric_type, help):
+        Metrics.helps[name] = (metric_type, help)
+
+    @staticmethod
+    def inc(name, labels=(), value=1):
+        key = (name, labels)
+        Metrics.counters[key] = Metrics.counters.get(key, 0) + value
+
+    @staticmethod
+    def observe(name, value, labels=()):
+        """
+        Add a value, in seconds for latencies, to a histogram.
+        """
+        histogram = Metrics.histograms.get((name, labels))
+        if histogram is None:
+            histogram = Metrics.histograms[(name, labels)] = Histogram(Constant.METRICS_BUCKETS)
+        histogram.observe(value)
+
+    @staticmethod
+    def gauge(name, function, help=""):
+        """
+        Register a gauge, read when metrics are exported.
+        """
+        Metrics.describe(name, "gauge", help)
+        Metrics.gauges[name] = function
+
+    @staticmethod
+    def reset():
+        """
+        Clear counters and histograms. Gauges stay registered.
+        """
+        Metrics.counters.clear()
+        Metrics.histograms.clear()
+
+    # export
+
+    @staticmethod
+    def format_labels(labels, extra=()):
+        labels = labels + extra
+        if not labels:
+            return ""
+        return "{" + ",".join('{}="{}"'.format(key, str(value).replace('\\', '\\\\').replace('"', '\\"')) for key, value in labels) + "}"
+
+    @staticmethod
+    def render():
+        """
+        Return all metrics in Prometheus text format.
+        """
+        lines = []
+        described = set()
+        def header(name, default_type):
+            if name not in described:
+                described.add(name)
+                metric_type, help = Metrics.helps.get(name, (default_type, ""))
+                lines.append(f"# HELP {name} {help}")
+                lines.append(f"# TYPE {name} {metric_type}")
+
+        for (name, labels), value in sorted(Metrics.counters.items()):
+            header(name, "counter")
+            lines.append(f"{name}{Metrics.format_labels(labels)} {value}")
+        for (name, labels), histogram in sorted(Metrics.histograms.items(), key=lambda item: item[0]):
+            header(name, "histogram")
+            for bucket, count in zip(histogram.buckets, histogram.cumulative_counts()):
+                lines.append(f"{name}_bucket{Metrics.format_labels(labels, (('le', bucket),))} {count}")
+            lines.append(f"{name}_bucket{Metrics.format_labels(labels, (('le', '+Inf'),))} {histogram.count}")
+            lines.append(f"{name}_sum{Metrics.format_labels(labels)} {histogram.sum}")
+            lines.append(f"{name}_count{Metrics.format_labels(labels)} {histogram.count}")
+        for name, function in sorted(Metrics.gauges.items()):
+            try:
+                value = function()
+            except Exception:
+                logger.exception("Cannot read gauge %s.", name)
+                continue
+            header(name, "gauge")
+            lines.append(f"{name} {value}")
+        return "\n".join(lines) + "\n"
+
+
+def get_rss():
+    """
+    Return the resident memory of the process, in bytes.
+    Peak resident memory if the current one is not available.
+    """
+    try:
+        with open("/proc/self/statm") as file:
+            return int(file.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+Metrics.gauge("bot_process_resident_memory_bytes", get_rss, "Resident memory of the process.")
+Metrics.describe("bot_event_loop_lag_seconds", "histogram", "Delay of the event loop to wake up a sleeping task.")
+Metrics.describe("bot_handler_latency_seconds", "histogram", "Time spent in discord event handlers.")
+Metrics.describe("bot_send_latency_seconds", "histogram", "Duration of discord API calls sending messages.")
+Metrics.describe("bot_games_started_total", "counter", "Games started, by game type.")
+Metrics.describe("bot_games_finished_total", "counter", "Games finished, by game type.")
@@ -0,0 +1,50 @@
+"""
+Startup time of the bot, to track cold-start regressions.
+
+Phases are timed from the first import of this module, at the top of the
+main program, and reported once the bot is ready.
+Run python with `-X importtime` for the details of module imports.
+"""
+from utils import tools
+import logging
+logger = logging.getLogger(__name__)
+
+from time import perf_counter
+from utils.metrics import Metrics
+
+
+class Startup:
+    """
+    Class-level record of startup timings, in seconds.
+    """
+    start_time = perf_counter()
+    phases = dict()     # map phase name to its time since start, in order
+    imports = dict()    # map module name to its import duration
+
+    @staticmethod
+    def mark(phase):
+        """
+        Record that the phase is reached. Only the first time is kept.
+        """
+        if phase not in Startup.phases:
+            Startup.phases[phase] = perf_counter() - Startup.start_time
+
+    @staticmethod
+    def record_import(name, duration):
+        Startup.imports[name] = duration
+
+    @staticmethod
+    def report():
+        """
+        Return a one line summary of the startup timings.
+        """
+        phases = ", ".join(f"{phase} {seconds:.3f}" for phase, seconds in Startup.phases.items())
+        imports = ", ".join(f"{name} {seconds:.3f}" for name, seconds in Startup.imports.items())
+        return f"Startup (sec since start): {phases or 'none'}. Lazy imports (sec): {imports or 'none'}."
+
+    @staticmethod
+    def get_ready_time():
+        return Startup.phases.get("on_ready", 0.)
+
+
+Metrics.gauge("bot_startup_ready_seconds", Startup.get_ready_time, "Time from process start to the first on_ready.")
@@ -2,11 +2,12 @@ from utils import tools
 import logging
 logger = logging.getLogger(__name__)
 
+import asyncio, os, shutil, tempfile
 from test.archi import TestCase
-from enum import Enum
-from utils.language import MessageNLS, SUPPORTED_LANG_CODES
+from timeit import timeit
+from utils.language import MessageNLS, MessageCatalog, LanguageSettings, SUPPORTED_LANG_CODES
 from utils.language_resources.MessageLiterals import MessageLiterals
-from utils.language_resources.MessageLiterals_fr import MessageLiterals_fr
+from utils.tools import Constant
 
 
 class TestMessageNLS(TestCase):
@@ -15,16 +16,16 @@ class TestMessageNLS(TestCase):
         Test that language setting is shared to all instances.
         """
         a = MessageNLS()
-        self.assertEqual(MessageLiterals, a.message_literals)
+        self.assertEqual("en", MessageNLS.get_language())
         logger.debug(MessageNLS.get_message(MessageLiterals.DEFAULT))
         self.assertEqual("Default", MessageNLS.get_message(MessageLiterals.DEFAULT))
 
         b = MessageNLS()
         MessageNLS.set_language("fr")
-        self.assertEqual(MessageLiterals_fr, b.message_literals)
+        self.assertEqual("fr", MessageNLS.get_language())
 
         b = MessageNLS() # new instance
-        self.assertEqual(MessageLiterals_fr, b.message_literals)
+        self.assertEqual("fr", MessageNLS.get_language())
         logger.debug(MessageNLS.get_message(MessageLiterals.DEFAULT))
 
         # end
@@ -75,15 +76,107 @@ class TestMessageNLS(TestCase):
         logger.log(logging.ERROR + 1, "Starting NLS literals check.") # to make sure following logs start on a newline.
         error = 0
         en_keys = set(MessageLiterals._member_names_)
-        for lang_code, message_literals in SUPPORTED_LANG_CODES.items():
-            with self.subTest(literals=lang_code):
-                self.assertTrue(issubclass(message_literals, Enum))
-            lang_keys = set(message_literals._member_names_)
+        for lang_code in SUPPORTED_LANG_CODES:
+            if SUPPORTED_LANG_CODES[lang_code] is None:
+                continue # default language
+            lang_keys = set(MessageCatalog.read_pack(lang_code))
             for key in en_keys - lang_keys:
                 error += 1
-                logger.error("MessageLiterals_%s\t: Missing '%s' literal.", lang_code, key)
+                logger.error("Language pack %s\t: Missing '%s' literal.", lang_code, key)
             for key in lang_keys - en_keys:
                 error += 1
-                logger.error("MessageLiterals \t: Missing '%s' literal from MessageLiterals_%s.", key, lang_code)
+                logger.error("MessageLiterals \t: Missing '%s' literal from language pack %s.", key, lang_code)
         self.assertEqual(0, error,
                          f"There are {error} missing literals. See logs for details.")
+
+    def test_count_args(self):
+        self.assertEqual(0, MessageCatalog.count_args("Errors"))
+        self.assertEqual(0, MessageCatalog.count_args("{{0}}"))
+        self.assertEqual(2, MessageCatalog.count_args("{0} errors/{1}"))
+        self.assertEqual(2, MessageCatalog.count_args("{1}"))
+        self.assertEqual(2, MessageCatalog.count_args("{} and {:>3}"))
+
+    def test_catalog(self):
+        """
+        Messages without argument are compiled to their final text, in each language.
+        """
+        catalog = MessageCatalog.get("fr")
+        self.assertIs(catalog, MessageCatalog.get("fr"))
+        MessageNLS.set_language("fr")
+        try:
+            self.assertEqual("Erreurs", MessageNLS.get_message(MessageLiterals.ERRORS))
+            self.assertEqual("3 erreurs/11", MessageNLS.get_message(MessageLiterals.PENDU_ERRORS, 3, 11))
+        finally:
+            MessageNLS.set_language("en")
+
+    def test_lazy_loading(self):
+        """
+        Language packs are loaded on first use, and the cache is bounded.
+        """
+        cache_size = Constant.LANGUAGE_CACHE_SIZE
+        Constant.LANGUAGE_CACHE_SIZE = 1
+        MessageCatalog.instances.clear()
+        try:
+            self.assertEqual(0, len(MessageCatalog.instances))
+            MessageNLS.use_language("en")
+            self.assertEqual(0, len(MessageCatalog.instances))
+            MessageCatalog.get("fr")
+            self.assertEqual(["fr"], list(MessageCatalog.instances))
+            MessageCatalog.instances["xx"] = MessageCatalog.instances.pop("fr")
+            MessageCatalog.get("fr")
+            self.assertEqual(["fr"], list(MessageCatalog.instances))
+        finally:
+            Constant.LANGUAGE_CACHE_SIZE = cache_size
+            MessageNLS.use_language(None)
+
+    def test_task_language(self):
+        """
+        Each task has its own language, inherited by the tasks it creates.
+        """
+        async def play(lang_code):
+            MessageNLS.use_language(lang_code)
+            await asyncio.sleep(.01)
+            async def child():
+                await asyncio.sleep(.01)
+                return MessageNLS.get_message(MessageLiterals.PENDU_WIN)
+            return MessageNLS.get_message(MessageLiterals.PENDU_WIN), await asyncio.create_task(child())
+        async def main():
+            return await asyncio.gather(play("fr"), play(None), play("en"))
+        self.assertEqual([("Gagné !",) * 2, ("Winner !",) * 2, ("Winner !",) * 2], asyncio.run(main()))
+        self.assertEqual("en", MessageNLS.get_language())
+
+    def test_settings(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        path = os.path.join(directory, "languages.json")
+        settings = LanguageSettings(path)
+        settings.set_guild(1, "fr")
+        settings.set_channel(10, "en")
+        with self.assertRaises(AttributeError):
+            settings.set_channel(11, "xx")
+        settings = LanguageSettings(path) # saved
+        self.assertEqual("en", settings.resolve(10, 1))
+        self.assertEqual("fr", settings.resolve(11, 1))
+        self.assertIsNone(settings.resolve(11))
+        settings.set_channel(10, None)
+        self.assertEqual("fr", settings.resolve(10, 1))
+
+
+class TestBenchmark(TestCase):
+    def test_get_message(self):
+        """
+        Compare the cost of a call with the previous lookup in the Enum.
+        """
+        def legacy(key, *args):
+            try:
+                return getattr(MessageLiterals, key.name).value.format(*args)
+            except (IndexError, AttributeError):
+                return None
+        number = 100000
+        results = dict()
+        for name, function in (("legacy", legacy), ("catalog", MessageNLS.get_message)):
+            constant = timeit(lambda: function(MessageLiterals.ERRORS), number=number) / number
+            formatted = timeit(lambda: function(MessageLiterals.PENDU_ERRORS, 3, 11), number=number) / number
+            results[name] = (constant, formatted)
+            logger.info("get_message %s:\tconstant %.3f us,\tformatted %.3f us", name, constant * 1e6, formatted * 1e6)
+        self.assertLess(results["catalog"][0], results["legacy"][0])
@@ -0,0 +1,43 @@
+from utils import tools
+import logging
+logger = logging.getLogger(__name__)
+
+from test.archi import TestCase
+from utils.metrics import Metrics, Histogram, get_rss
+
+
+class TestMetrics(TestCase):
+    def setUp(self):
+        Metrics.reset()
+        self.addCleanup(Metrics.reset)
+
+    def test_histogram(self):
+        histogram = Histogram((.1, 1))
+        for value in (.05, .1, .5, 2):
+            histogram.observe(value)
+        self.assertEqual([2, 3], list(histogram.cumulative_counts()))
+        self.assertEqual(4, histogram.count)
+        self.assertAlmostEqual(2.65, histogram.sum)
+
+    def test_render(self):
+        Metrics.inc("bot_games_started_total", (("game", "pendu"),))
+        Metrics.inc("bot_games_started_total", (("game", "pendu"),))
+        Metrics.observe("bot_handler_latency_seconds", .002, (("event", "on_message"),))
+        text = Metrics.render()
+        logger.debug(text)
+        self.assertIn("# TYPE bot_games_started_total counter", text)
+        self.assertIn('bot_games_started_total{game="pendu"} 2', text)
+        self.assertIn("# TYPE bot_handler_latency_seconds histogram", text)
+        self.assertIn('bot_handler_latency_seconds_bucket{event="on_message",le="0.001"} 0', text)
+        self.assertIn('bot_handler_latency_seconds_bucket{event="on_message",le="0.005"} 1', text)
+        self.assertIn('bot_handler_latency_seconds_bucket{event="on_message",le="+Inf"} 1', text)
+        self.assertIn('bot_handler_latency_seconds_count{event="on_message"} 1', text)
+        self.assertIn("bot_process_resident_memory_bytes ", text)
+        self.assertEqual(1, text.count("# TYPE bot_handler_latency_seconds"))
+
+    def test_labels_escaped(self):
+        self.assertEqual('{name="a\\"b"}', Metrics.format_labels((("name", 'a"b'),)))
+        self.assertEqual("", Metrics.format_labels(()))
+
+    def test_rss(self):
+        self.assertGreater(get_rss(), 1024 * 1024)
@@ -0,0 +1,25 @@
+from utils import tools
+import logging
+logger = logging.getLogger(__name__)
+
+from utils.metrics import Metrics
+from utils.startup import Startup
+from test.archi import TestCase
+
+
+class TestStartup(TestCase):
+    def test_report(self):
+        phases = dict(Startup.phases)
+        self.addCleanup(lambda: (Startup.phases.clear(), Startup.phases.update(phases)))
+        Startup.phases.clear()
+        Startup.mark("setup_hook")
+        first = Startup.phases["setup_hook"]
+        Startup.mark("setup_hook")
+        self.assertEqual(first, Startup.phases["setup_hook"]) # first time only
+        Startup.mark("on_ready")
+        Startup.record_import("game.test", 0.25)
+        report = Startup.report()
+        self.assertIn("setup_hook", report)
+        self.assertIn("game.test 0.250", report)
+        self.assertIn(f"bot_startup_ready_seconds {Startup.phases['on_ready']}", Metrics.render())
+        Startup.imports.pop("game.test")
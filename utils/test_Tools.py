@@ -1,5 +1,7 @@
 from utils import tools
 
+import gzip, logging, os, shutil, tempfile
+from logging.handlers import QueueHandler
 from test.archi import TestCase, TimeChecker
 from time import sleep
 
@@ -32,3 +34,69 @@ class TestTools(TestCase):
         with self.assertRaises(AssertionError):
             with self.assertTime(2) as t:
                 sleep(1)
+
+class TestLogging(TestCase):
+    def setUp(self):
+        root_logger = logging.getLogger()
+        handlers, level = root_logger.handlers[:], root_logger.level
+        def restore():
+            tools.stop_logging()
+            for handler in root_logger.handlers[:]:
+                root_logger.removeHandler(handler)
+            for handler in handlers:
+                root_logger.addHandler(handler)
+            root_logger.setLevel(level)
+        self.addCleanup(restore)
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+
+    def get_config(self, content):
+        path = os.path.join(self.directory, "config.ini")
+        with open(path, "w") as file:
+            file.write(content.format(directory=self.directory))
+        return path
+
+    def test_queued_rotation(self):
+        """
+        Records are written by the listener thread, and rotated files are compressed.
+        """
+        tools.setup_logging(self.get_config("""
+[LOGGING]
+file = {directory}/bot.log
+max_bytes = 1000
+backup_count = 2
+
+[LOGGERS]
+test_logging = INFO
+"""), "0")
+        test_logger = logging.getLogger("test_logging")
+        self.assertIsInstance(logging.getLogger().handlers[0], QueueHandler)
+        self.assertEqual(logging.INFO, test_logger.level)
+        for index in range(50):
+            test_logger.info("Message %s", index)
+        test_logger.debug("Filtered")
+        tools.stop_logging()
+
+        path = os.path.join(self.directory, "bot-0.log")
+        with open(path) as file:
+            self.assertIn("Message 49", file.read())
+        self.assertTrue(os.path.exists(path + ".1.gz"))
+        self.assertTrue(os.path.exists(path + ".2.gz"))
+        self.assertFalse(os.path.exists(path + ".3.gz"))
+        with gzip.open(path + ".1.gz", "rt") as file:
+            content = file.read()
+        self.assertIn("Message", content)
+        self.assertNotIn("Filtered", content)
+
+    def test_non_blocking(self):
+        """
+        Logging does not wait for the slow output.
+        """
+        class SlowHandler(logging.Handler):
+            def emit(self, record):
+                sleep(.01)
+        tools.setup_logging(self.get_config(""))
+        tools.log_listener.handlers = (SlowHandler(),)
+        with self.assertTime(0):
+            for index in range(100):
+                logging.getLogger("test_logging").warning("Message %s", index)
@@ -5,22 +5,53 @@ To take benefit from this, all other modules must first import this one :
 `from utils import tools`
 """
 import logging
+import atexit, configparser, gzip, os, queue, shutil
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler, TimedRotatingFileHandler
 class Constant:
     """
     All CONSTANTS must be declared here.
     """
+    BOARD_MAX_SCROLL = 10       # messages after a board before sending a new one instead of editing
+    CHANNEL_NAMES_CACHE_SIZE = 10000    # channel labels kept for logs and reports
     CONFIG_PATH = "resources/config.ini"
+    CONFIG_WATCH_PERIOD = 5     # seconds between two checks of changes of the configuration file
+    ERROR_BREAKER_COOLDOWN = 5*60   # seconds without error report after repeated send failures
+    ERROR_BREAKER_THRESHOLD = 3     # consecutive send failures opening the breaker
+    ERROR_DIGEST_PERIOD = 60        # seconds between digests of repeated errors
+    ERROR_QUEUE_SIZE = 20           # error reports waiting to be sent
+    ERROR_SUMMARY_SIZE = 200        # characters of an error in digests
+    GAME_TTL = 30*60            # seconds without player message before a game is closed
+    LANGUAGE_CACHE_SIZE = 4     # language packs kept loaded, besides the default language
+    LANGUAGES_FILE = "resources/languages.json" # language of channels and guilds
+    LOG_BACKUP_COUNT = 5        # compressed log files kept after rotation
+    LOG_DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
+    LOG_FORMAT = "[%(asctime)s.%(msecs)03d] [ %(levelname)s\t] %(thread)d | %(process)d  | %(name)s:%(lineno)d:\t%(message)s" # NOTE: '\t' character is of lenght > 0
+    LOG_MAX_BYTES = 10*1024*1024    # size of the log file before rotation
+    MESSAGE_MAX_SIZE = 2000     # characters in a discord message
+    METRICS_BUCKETS = (.001, .005, .01, .05, .1, .5, 1, 5) # upper bounds of latency histograms, in seconds
+    METRICS_LAG_PERIOD = 1      # seconds between two measures of the event loop lag
     NO_INTERNET = False         # Set to True when internet connection is unavailable.
+    OUTBOX_BURST = 5            # messages sent on a channel...
+    OUTBOX_PERIOD = 5           # ...per period in seconds
     PENDU_DATABASE_FILE = "game/pendu/database.txt"
+    PENDU_DRAWING_CACHE_SIZE = 256
+    PENDU_MIN_WORD_LENGTH = 3
     PENDU_NB_MAX_ERRORS = 11
     PLAY_INTERACTIVE_TESTS = False
+    PUISSANCE4_AI_DEPTH = 6     # moves looked ahead by the bot
+    PUISSANCE4_AI_TABLE_SIZE = 500000   # positions kept in the transposition table of a worker
+    PUISSANCE4_AI_WORKERS = 2   # processes running the bot searches
+    SHARD_RESTART_DELAY = 5     # seconds before restarting a crashed worker process
+    SHUTDOWN_GRACE_PERIOD = 5   # seconds given to running games to finish their turn on close
     SKIP_VISUAL_TESTS = True
+    SNAPSHOT_FILE = "resources/snapshot.bin"
+    SNAPSHOT_PERIOD = 5*60      # seconds between checkpoints of active games
     VERBOSE = 5
     VISUAL_WARN_VERBOSE = logging.DEBUG + 1
 
 
 ## Logging setup
-logging.basicConfig(level=Constant.VERBOSE, format="[%(asctime)s.%(msecs)03d] [ %(levelname)s\t] %(thread)d | %(process)d  | %(name)s:%(lineno)d:\t%(message)s", datefmt="%Y-%m-%d %H:%M:%S") # NOTE: '\t' character is of lenght > 0
+logging.basicConfig(level=Constant.VERBOSE, format=Constant.LOG_FORMAT, datefmt=Constant.LOG_DATE_FORMAT)
 logging.addLevelName(Constant.VERBOSE, "VERBOSE") # level must be > 0
 logging.addLevelName(Constant.VISUAL_WARN_VERBOSE, "   /!\\")
 logging.getLogger("discord").setLevel(logging.WARNING)
@@ -40,3 +71,82 @@ def read_input():
         print("Usage:\t{} context".format(sys.argv[0]))
         exit(1)
     return sys.argv[1]
+
+
+## Production logging
+
+log_listener = None # thread writing queued log records
+
+def setup_logging(config_path, suffix=None):
+    """
+    Send all log records through a queue to a background thread, so that
+    logging never does I/O on the caller thread (the event loop).
+
+    Settings are read from the configuration file:
+    - [LOGGING] section: `file` (console if not set), `max_bytes` and
+      `backup_count` for size based rotation, or `when` for time based
+      rotation (e.g. midnight). Rotated files are compressed.
+    - [LOGGERS] section: level of each logger by name (`root` for root logger).
+
+    @param  suffix  Optional. Added to the log file name, for one file per process.
+    @return     The queue listener, stopped at exit.
+    """
+    global log_listener
+    config = configparser.ConfigParser(inline_comment_prefixes=('#'), allow_no_value=True)
+    config.read(config_path)
+    settings = config["LOGGING"] if config.has_section("LOGGING") else {}
+
+    path = settings.get("file") or None
+    if path is None:
+        handler = logging.StreamHandler()
+    else:
+        if suffix is not None:
+            root, extension = os.path.splitext(path)
+            path = "{}-{}{}".format(root, suffix, extension)
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        backup_count = int(settings.get("backup_count") or Constant.LOG_BACKUP_COUNT)
+        if settings.get("when"):
+            handler = TimedRotatingFileHandler(path, when=settings["when"], backupCount=backup_count, encoding="utf-8")
+        else:
+            handler = RotatingFileHandler(path, maxBytes=int(settings.get("max_bytes") or Constant.LOG_MAX_BYTES),
+                    backupCount=backup_count, encoding="utf-8")
+        handler.namer = lambda name: name + ".gz"
+        handler.rotator = compress_log
+    handler.setFormatter(logging.Formatter(Constant.LOG_FORMAT, Constant.LOG_DATE_FORMAT))
+
+    if config.has_section("LOGGERS"):
+        for name, level in config.items("LOGGERS", raw=True):
+            if name in config.defaults():
+                continue
+            logging.getLogger(None if name == "root" else name).setLevel(level.upper())
+
+    stop_logging()
+    log_queue = queue.SimpleQueue() # unbounded: never blocks the caller
+    root_logger = logging.getLogger()
+    for previous_handler in root_logger.handlers[:]:
+        root_logger.removeHandler(previous_handler)
+    root_logger.addHandler(QueueHandler(log_queue))
+    log_listener = QueueListener(log_queue, handler, respect_handler_level=True)
+    log_listener.start()
+    return log_listener
+
+def stop_logging():
+    """
+    Write pending log records and stop the background thread.
+    """
+    global log_listener
+    if log_listener is not None:
+        log_listener.stop()
+        for handler in log_listener.handlers:
+            handler.close()
+        log_listener = None
+
+atexit.register(stop_logging)
+
+def compress_log(source, destination):
+    """
+    Rotator of log files: the rotated file is gzip compressed.
+    """
+    with open(source, "rb") as source_file, gzip.open(destination, "wb") as destination_file:
+        shutil.copyfileobj(source_file, destination_file)
+    os.remove(source)